@@ -1,6 +1,7 @@
+import os
 from flask import Flask
 from flask_restx import Api
-from app.database import db
+from app.database import db, migrate
 from app.config import Config
 from app.controllers.usuario_controller import ns as usuario_ns
 from app.controllers.endereco_controller import ns as endereco_ns
@@ -8,10 +9,16 @@ from app.controllers.cartao_controller import ns as cartao_ns
 from app.controllers.produto_controller import ns as produto_ns
 from app.controllers.pedido_controller import ns as pedido_ns
 from app.controllers.matricula_controller import ns as matricula_ns
+from app.controllers.checkout_controller import ns as checkout_ns
+from app.controllers.saude_controller import ns as saude_ns
+from app.produtos import configurar_produtos
 
-def create_app():
+# Pasta de migrações (Flask-Migrate/Alembic) na raiz do projeto
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+def create_app(config_object=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_object)
 
     # Configuração do Swagger
     api = Api(
@@ -29,7 +36,12 @@ def create_app():
     api.add_namespace(produto_ns, path='/produto')
     api.add_namespace(pedido_ns, path='/pedido')
     api.add_namespace(matricula_ns, path='/api/matriculas')
+    api.add_namespace(checkout_ns, path='/checkout')
+    api.add_namespace(saude_ns, path='/healthz')
 
     db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
+
+    configurar_produtos(app.config)
 
     return app
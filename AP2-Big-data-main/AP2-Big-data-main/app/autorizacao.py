@@ -0,0 +1,98 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import update
+from app.database import db
+from app.models.usuario import Usuario
+from app.models.cartao import Cartao
+from app.models.transacao import Transacao
+
+
+def valor_monetario(valor):
+    """Converte o valor recebido para Decimal com 2 casas, a mesma precisão de
+    Transacao.valor e Cartao.saldo (Numeric(10, 2))"""
+    return Decimal(str(valor)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def validade_da_requisicao(dt_expiracao):
+    """Converte MM/AAAA no último dia do mês, como a validade é gravada no cartão"""
+    mes, ano = map(int, dt_expiracao.split("/"))
+    return datetime(ano, mes, 1) + relativedelta(day=31)
+
+
+def debitar_cartao(id_user, numero, cvv, dt_expiracao, valor):
+    """Tenta debitar `valor` do cartão na transação atual do banco, sem fazer commit.
+
+    Retorna o registro do livro de transações (AUTHORIZED ou NOT_AUTHORIZED) ainda não
+    adicionado à sessão. Na recusa a sessão sofre rollback, então quem chama deve
+    preparar o restante da transação só depois desta chamada.
+    """
+    validade_requisicao = validade_da_requisicao(dt_expiracao)
+
+    # Débito atômico: um único UPDATE condicional valida cartão, validade e saldo
+    # e debita o valor, sem ler o saldo para o Python nem segurar lock entre as etapas
+    resultado = db.session.execute(
+        update(Cartao)
+        .where(
+            Cartao.usuario_id == id_user,
+            Cartao.numero == numero,
+            Cartao.cvv == cvv,
+            Cartao.validade == validade_requisicao,
+            Cartao.validade >= datetime.utcnow(),
+            Cartao.saldo >= valor,
+        )
+        .values(saldo=Cartao.saldo - valor)
+        .execution_options(synchronize_session=False)
+    )
+
+    if resultado.rowcount == 0:
+        db.session.rollback()
+        mensagem, status_code, cartao_id = motivo_recusa(id_user, numero, cvv, validade_requisicao)
+        registro = Transacao(
+            status="NOT_AUTHORIZED",
+            mensagem=mensagem,
+            http_status=status_code,
+            cartao_id=cartao_id,
+        )
+    else:
+        cartao_id = cartao_da_requisicao(id_user, numero, cvv)
+        registro = Transacao(
+            status="AUTHORIZED",
+            codigo_autorizacao=str(uuid.uuid4()),
+            mensagem="Compra autorizada",
+            http_status=200,
+            cartao_id=cartao_id,
+        )
+
+    registro.usuario_id = id_user
+    registro.valor = valor
+    return registro
+
+
+def cartao_da_requisicao(id_user, numero, cvv):
+    """ID do cartão identificado pelos dados da requisição (None se não existir), pelo mesmo
+    critério usado ao gravar Transacao.cartao_id: repetições conferem o cartão com ele"""
+    return db.session.query(Cartao.id).filter_by(usuario_id=id_user, numero=numero, cvv=cvv).scalar()
+
+
+def motivo_recusa(id_user, numero, cvv, validade_requisicao):
+    """Descobre por que o débito não foi aplicado (consultado apenas quando a transação é recusada)
+
+    Retorna a mensagem, o status HTTP e o ID do cartão (quando encontrado).
+    """
+    usuario = Usuario.query.get(id_user)
+    if not usuario:
+        return "Usuário não encontrado", 404, None
+
+    cartao = Cartao.query.filter_by(usuario_id=id_user, numero=numero, cvv=cvv).first()
+    if not cartao:
+        return "Cartão não encontrado", 404, None
+
+    if cartao.validade < datetime.utcnow():
+        return "Cartão expirado", 400, cartao.id
+
+    if cartao.validade != validade_requisicao:
+        return "Validade incorreta", 400, cartao.id
+
+    return "Saldo insuficiente", 400, cartao.id
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+
+
+class CacheTTL:
+    """Cache LRU em memória, limitado por quantidade de itens e com expiração por tempo.
+
+    É local a cada processo (cada worker do gunicorn tem o seu), por isso o TTL
+    limita por quanto tempo um worker pode servir um dado alterado por outro.
+    """
+
+    def __init__(self, tamanho_maximo=1024, ttl_segundos=300):
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.configurar(tamanho_maximo, ttl_segundos)
+
+    def configurar(self, tamanho_maximo, ttl_segundos):
+        """Redefine tamanho e TTL (tamanho 0 desativa o cache)"""
+        with self._lock:
+            self.tamanho_maximo = tamanho_maximo
+            self.ttl_segundos = ttl_segundos
+            self._itens.clear()
+
+    def obter(self, chave):
+        """Retorna uma cópia do valor guardado ou None se não existir/estiver expirado"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+
+            valor, expira_em = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                self.falhas += 1
+                return None
+
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+        return deepcopy(valor)
+
+    def guardar(self, chave, valor):
+        if not self.tamanho_maximo:
+            return
+        with self._lock:
+            self._itens[chave] = (deepcopy(valor), time.monotonic() + self.ttl_segundos)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+
+    def remover(self, *chaves):
+        with self._lock:
+            for chave in chaves:
+                self._itens.pop(chave, None)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "tamanho_maximo": self.tamanho_maximo,
+                "ttl_segundos": self.ttl_segundos,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / total, 4) if total else 0.0,
+            }
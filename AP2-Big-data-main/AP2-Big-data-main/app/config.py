@@ -7,3 +7,22 @@ class Config:
     AZURE_COSMOS_URI = "https://banco-ibmec.documents.azure.com:443/"
     AZURE_COSMOS_KEY = "GOp8Yah6hONJFQ7exeCt6UBkQNNfb06Zot8lSH9JquDS2ee6uCCL0Lx9UF16QzdX5G36ogbawjDmACDbwrfmQQ=="
     AZURE_COSMOS_DATABASE = "ibmec-mall"
+
+    # Paginação por cursor (?after=<id>&limit=) e exportação em streaming
+    PAGINACAO_LIMITE_PADRAO = int(os.environ.get("PAGINACAO_LIMITE_PADRAO", 100))
+    PAGINACAO_LIMITE_MAXIMO = int(os.environ.get("PAGINACAO_LIMITE_MAXIMO", 1000))
+    EXPORTACAO_TAMANHO_LOTE = int(os.environ.get("EXPORTACAO_TAMANHO_LOTE", 500))
+
+    # Registros por transação em POST /api/matriculas/batch
+    MATRICULA_LOTE_TAMANHO = int(os.environ.get("MATRICULA_LOTE_TAMANHO", 500))
+
+    # Armazenamento dos produtos: "cosmos" (Azure) ou "sqlite" (local, arquivo ou :memory:)
+    PRODUTO_STORE = os.environ.get("PRODUTO_STORE", "cosmos")
+    PRODUTO_STORE_SQLITE = os.environ.get("PRODUTO_STORE_SQLITE", ":memory:")
+
+    # Cache em memória dos produtos (tamanho 0 desativa)
+    PRODUTO_CACHE_TAMANHO = int(os.environ.get("PRODUTO_CACHE_TAMANHO", 1024))
+    PRODUTO_CACHE_TTL = int(os.environ.get("PRODUTO_CACHE_TTL", 300))
+
+    # Máximo de IDs aceitos em POST /produto/batch
+    PRODUTO_LOTE_MAXIMO = int(os.environ.get("PRODUTO_LOTE_MAXIMO", 100))
@@ -1,12 +1,14 @@
 from flask import request
 from flask_restx import Resource, Namespace, fields
+from sqlalchemy.exc import IntegrityError
 from app.database import db
 from app.models.usuario import Usuario
 from app.models.cartao import Cartao
+from app.models.transacao import Transacao
+from app.autorizacao import debitar_cartao, valor_monetario, cartao_da_requisicao
 from app.request.transacao_request import TransacaoRequest
 from app.response.transacao_response import TransacaoResponse
 from datetime import datetime
-import uuid
 from decimal import Decimal
 from dateutil.relativedelta import relativedelta
 
@@ -40,6 +42,26 @@ transacao_response_model = ns.model('TransacaoResponse', {
     'message': fields.String(description='Mensagem de retorno')
 })
 
+CABECALHO_IDEMPOTENCIA = 'Idempotency-Key'
+
+def transacao_recusada(mensagem, status_code):
+    """Resposta padrão para transação não autorizada"""
+    return TransacaoResponse(
+        status="NOT_AUTHORIZED",
+        codigo_autorizacao=None,
+        dt_transacao=datetime.utcnow(),
+        message=mensagem
+    ), status_code
+
+def resposta_da_transacao(registro):
+    """Monta a resposta a partir do registro gravado no livro de transações"""
+    return TransacaoResponse(
+        status=registro.status,
+        codigo_autorizacao=registro.codigo_autorizacao,
+        dt_transacao=registro.dt_transacao,
+        message=registro.mensagem
+    ), registro.http_status
+
 @ns.route('/usuario/<int:id_user>')
 @ns.param('id_user', 'ID do usuário')
 class CartaoUsuarioList(Resource):
@@ -117,74 +139,63 @@ class CartaoUsuarioList(Resource):
 @ns.route('/authorize/usuario/<int:id_user>')
 @ns.param('id_user', 'ID do usuário')
 class CartaoAutorizacao(Resource):
-    @ns.doc('authorize_transaction')
+    @ns.doc('authorize_transaction', params={
+        CABECALHO_IDEMPOTENCIA: {
+            'in': 'header',
+            'description': 'Chave única da tentativa de compra; repetições devolvem o resultado original'
+        }
+    })
     @ns.expect(transacao_model)
     @ns.marshal_with(transacao_response_model)
     @ns.response(404, 'Usuário ou cartão não encontrado')
+    @ns.response(422, 'Idempotency-Key já usada em outra transação')
     def post(self, id_user):
         """Autoriza uma transação com cartão"""
         try:
             data = request.get_json()
             transacao = TransacaoRequest(**data)
+            # Arredondado antes de debitar e de comparar com uma tentativa já gravada
+            valor = valor_monetario(transacao.valor)
+            chave_idempotencia = request.headers.get(CABECALHO_IDEMPOTENCIA) or None
 
-            usuario = Usuario.query.get(id_user)
-            if not usuario:
-                return TransacaoResponse(
-                    status="NOT_AUTHORIZED",
-                    codigo_autorizacao=None,
-                    dt_transacao=datetime.utcnow(),
-                    message="Usuário não encontrado"
-                ), 404
-
-            cartao = Cartao.query.filter_by(usuario_id=id_user, numero=transacao.numero, cvv=transacao.cvv).first()
-            if not cartao:
-                return TransacaoResponse(
-                    status="NOT_AUTHORIZED",
-                    codigo_autorizacao=None,
-                    dt_transacao=datetime.utcnow(),
-                    message="Cartão não encontrado"
-                ), 404
-            
-            mes, ano = map(int, transacao.dt_expiracao.split("/"))
-            validade_requisicao = datetime(ano, mes, 1) + relativedelta(day=31)
-
-            if cartao.validade < datetime.utcnow():
-                return TransacaoResponse(
-                    status="NOT_AUTHORIZED",
-                    codigo_autorizacao=None,
-                    dt_transacao=datetime.utcnow(),
-                    message="Cartão expirado"
-                ), 400
-            
-            if cartao.validade != validade_requisicao:
-                return TransacaoResponse(
-                    status="NOT_AUTHORIZED",
-                    codigo_autorizacao=None,
-                    dt_transacao=datetime.utcnow(),
-                    message="Validade incorreta"
-                ), 400
-
-            if cartao.saldo < Decimal(str(transacao.valor)):
-                return TransacaoResponse(
-                    status="NOT_AUTHORIZED",
-                    codigo_autorizacao=None,
-                    dt_transacao=datetime.utcnow(),
-                    message="Saldo insuficiente"
-                ), 400
-
-            cartao.saldo -= Decimal(str(transacao.valor))
-            db.session.commit()
+            # Repetição de uma tentativa já processada: devolve o resultado gravado sem tocar no saldo
+            if chave_idempotencia:
+                registro = Transacao.query.filter_by(chave_idempotencia=chave_idempotencia).first()
+                if registro:
+                    return self._repetir(registro, id_user, transacao, valor)
+
+            registro = debitar_cartao(id_user, transacao.numero, transacao.cvv, transacao.dt_expiracao, valor)
+
+            # O registro no livro é gravado na mesma transação do débito
+            registro.chave_idempotencia = chave_idempotencia
+            db.session.add(registro)
+
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Outra requisição com a mesma chave gravou primeiro: o rollback desfaz este débito
+                db.session.rollback()
+                registro_original = Transacao.query.filter_by(chave_idempotencia=chave_idempotencia).first()
+                if not chave_idempotencia or not registro_original:
+                    raise
+                return self._repetir(registro_original, id_user, transacao, valor)
 
-            return TransacaoResponse(
-                status="AUTHORIZED",
-                codigo_autorizacao=uuid.uuid4(),
-                dt_transacao=datetime.utcnow(),
-                message="Compra autorizada"
-            ), 200
+            return resposta_da_transacao(registro)
 
         except Exception as e:
+            db.session.rollback()
             ns.abort(500, str(e))
 
+    def _repetir(self, registro, id_user, transacao, valor):
+        """Devolve o resultado de uma tentativa já registrada com a mesma Idempotency-Key.
+
+        Só é repetição se usuário, cartão e valor forem os mesmos; senão a chave foi reutilizada.
+        """
+        mesmo_cartao = registro.cartao_id == cartao_da_requisicao(id_user, transacao.numero, transacao.cvv)
+        if registro.usuario_id != id_user or registro.valor != valor or not mesmo_cartao:
+            return transacao_recusada("Idempotency-Key já utilizada em outra transação", 422)
+        return resposta_da_transacao(registro)
+
 @ns.route('/saldo/<int:id>')
 @ns.param('id', 'ID do cartão')
 class CartaoSaldo(Resource):
@@ -0,0 +1,143 @@
+from flask import request
+from flask_restx import Resource, Namespace, fields
+from pydantic import ValidationError
+from werkzeug.exceptions import HTTPException
+from sqlalchemy.exc import IntegrityError
+from app.database import db
+from app.models.usuario import Usuario
+from app.models.pedido import Pedido
+from app.models.transacao import Transacao
+from app.autorizacao import debitar_cartao, valor_monetario, cartao_da_requisicao
+from app.produtos import buscar_produto_por_id
+from app.request.checkout_request import CheckoutRequest
+from datetime import datetime
+
+# Criando namespace para o Swagger
+ns = Namespace('checkout', description='Compra em uma única chamada: autorização do cartão e registro do pedido')
+
+CABECALHO_IDEMPOTENCIA = 'Idempotency-Key'
+
+# Modelos para documentação do Swagger
+checkout_model = ns.model('Checkout', {
+    'id_usuario': fields.Integer(required=True, description='ID do usuário'),
+    'id_produto': fields.String(required=True, description='ID do produto'),
+    'numero': fields.String(required=True, description='Número do cartão'),
+    'cvv': fields.String(required=True, description='Código de segurança'),
+    'dt_expiracao': fields.String(required=True, description='Data de expiração (MM/AAAA)')
+})
+
+checkout_response_model = ns.model('CheckoutResponse', {
+    'status': fields.String(description='AUTHORIZED ou NOT_AUTHORIZED'),
+    'codigo_autorizacao': fields.String(description='Código de autorização'),
+    'dt_transacao': fields.DateTime(description='Data da transação'),
+    'message': fields.String(description='Mensagem de retorno'),
+    'id_pedido': fields.Integer(description='ID do pedido criado (quando autorizado)'),
+    'nome_produto': fields.String(description='Nome do produto'),
+    'valor_total': fields.Float(description='Valor debitado')
+})
+
+def resposta_checkout(registro, pedido=None, status_code=None):
+    """Monta a resposta a partir do registro no livro de transações e do pedido criado"""
+    return {
+        'status': registro.status,
+        'codigo_autorizacao': registro.codigo_autorizacao,
+        'dt_transacao': registro.dt_transacao,
+        'message': registro.mensagem,
+        'id_pedido': pedido.id_pedido if pedido else None,
+        'nome_produto': pedido.nome_produto if pedido else None,
+        'valor_total': float(registro.valor),
+    }, status_code or registro.http_status
+
+@ns.route('')
+class Checkout(Resource):
+    @ns.doc('checkout', params={
+        CABECALHO_IDEMPOTENCIA: {
+            'in': 'header',
+            'description': 'Chave única da tentativa de compra; repetições devolvem o resultado original'
+        }
+    })
+    @ns.expect(checkout_model)
+    @ns.marshal_with(checkout_response_model)
+    @ns.response(404, 'Usuário, cartão ou produto não encontrado')
+    @ns.response(422, 'Idempotency-Key já usada em outra transação')
+    def post(self):
+        """Valida o cartão, debita o valor do produto e registra o pedido numa única transação"""
+        try:
+            dados = CheckoutRequest(**(request.get_json() or {}))
+        except ValidationError as e:
+            ns.abort(400, str(e))
+
+        try:
+            chave_idempotencia = request.headers.get(CABECALHO_IDEMPOTENCIA) or None
+            if chave_idempotencia:
+                registro = Transacao.query.filter_by(chave_idempotencia=chave_idempotencia).first()
+                if registro:
+                    return self._repetir(registro, dados)
+
+            # Produto vem do cache/leitura pontual, fora da transação do banco
+            produto = buscar_produto_por_id(dados.id_produto)
+            if produto is None:
+                ns.abort(404, "Produto não encontrado")
+            valor = valor_monetario(produto["preco"])
+
+            registro = debitar_cartao(dados.id_usuario, dados.numero, dados.cvv, dados.dt_expiracao, valor)
+            registro.chave_idempotencia = chave_idempotencia
+            registro.id_produto = dados.id_produto
+
+            pedido = None
+            if registro.status == "AUTHORIZED":
+                # Débito, pedido e registro no livro são confirmados no mesmo commit
+                usuario = Usuario.query.get(dados.id_usuario)
+                pedido = Pedido(
+                    nome_cliente=usuario.nome,
+                    data_pedido=datetime.utcnow().date(),
+                    id_produto=dados.id_produto,
+                    nome_produto=produto["nome"],
+                    valor_total=float(valor),
+                    status="Confirmado",
+                    id_usuario=dados.id_usuario,
+                    id_cartao=registro.cartao_id
+                )
+                db.session.add(pedido)
+                db.session.flush()
+                registro.pedido_id = pedido.id_pedido
+            db.session.add(registro)
+
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Outra requisição com a mesma chave gravou primeiro: o rollback desfaz débito e pedido
+                db.session.rollback()
+                registro_original = Transacao.query.filter_by(chave_idempotencia=chave_idempotencia).first()
+                if not chave_idempotencia or not registro_original:
+                    raise
+                return self._repetir(registro_original, dados)
+
+            return resposta_checkout(registro, pedido)
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            db.session.rollback()
+            ns.abort(500, str(e))
+
+    def _repetir(self, registro, dados):
+        """Devolve o resultado de uma tentativa já registrada com a mesma Idempotency-Key.
+
+        Só é repetição se usuário, produto e cartão forem os mesmos; senão a chave foi reutilizada.
+        """
+        autorizada_sem_pedido = registro.status == "AUTHORIZED" and registro.pedido_id is None
+        mesma_compra = (
+            registro.usuario_id == dados.id_usuario
+            and registro.id_produto == dados.id_produto
+            and registro.cartao_id == cartao_da_requisicao(dados.id_usuario, dados.numero, dados.cvv)
+        )
+        if not mesma_compra or autorizada_sem_pedido:
+            recusa = Transacao(
+                status="NOT_AUTHORIZED",
+                mensagem="Idempotency-Key já utilizada em outra transação",
+                valor=registro.valor,
+                dt_transacao=datetime.utcnow()
+            )
+            return resposta_checkout(recusa, status_code=422)
+        return resposta_checkout(registro, Pedido.query.get(registro.pedido_id) if registro.pedido_id else None)
@@ -1,7 +1,12 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from flask_restx import Namespace, Resource, fields
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from app.database import db
 from app.models.matricula import Matricula
+from app.paginacao import (
+    parametros_paginacao, paginar_query, cabecalhos_paginacao, exportar_query, resposta_ndjson
+)
 import logging
 import json
 
@@ -27,6 +32,129 @@ matricula_response_model = ns.model('MatriculaResponse', {
     'message': fields.String(description='Mensagem de confirmação')
 })
 
+resultado_lote_model = ns.model('MatriculaLoteResultado', {
+    'linha': fields.Integer(description='Posição do registro no lote (a partir de 1)'),
+    'email': fields.String(description='Email do estudante'),
+    'status': fields.String(description='criada, duplicada, invalida ou erro'),
+    'mensagem': fields.String(description='Detalhe do resultado')
+})
+
+lote_response_model = ns.model('MatriculaLoteResponse', {
+    'total': fields.Integer(description='Registros recebidos'),
+    'criadas': fields.Integer(description='Matrículas criadas'),
+    'duplicadas': fields.Integer(description='Emails já cadastrados ou repetidos no lote'),
+    'invalidas': fields.Integer(description='Registros com dados inválidos'),
+    'erros': fields.Integer(description='Registros não gravados por erro no banco'),
+    'resultados': fields.List(fields.Nested(resultado_lote_model))
+})
+
+MIMETYPE_NDJSON = 'application/x-ndjson'
+
+
+def _ler_registros_lote():
+    """Lê o corpo como array JSON ou, em NDJSON, uma linha por vez sem carregar o arquivo inteiro"""
+    if request.mimetype == MIMETYPE_NDJSON:
+        return _linhas_ndjson(request.stream)
+
+    dados = request.get_json(force=True, silent=True)
+    if not isinstance(dados, list):
+        raise ValueError('Envie um array JSON ou NDJSON (application/x-ndjson)')
+    return dados
+
+
+def _linhas_ndjson(stream):
+    for linha in stream:
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            yield json.loads(linha)
+        except ValueError:
+            yield None
+
+
+def _normalizar_registro(registro):
+    """Retorna (dados, None) para um registro válido ou (None, mensagem de erro)"""
+    if not isinstance(registro, dict):
+        return None, 'Registro não é um objeto JSON válido'
+
+    dados = {campo: str(registro.get(campo) or '').strip() for campo in ('nome', 'email', 'curso')}
+    if not all(dados.values()):
+        return None, 'Nome, email e curso são obrigatórios'
+    return dados, None
+
+
+def _resultado(linha, email, status, mensagem):
+    return {'linha': linha, 'email': email, 'status': status, 'mensagem': mensagem}
+
+
+def _gravar_lote(lote, emails_vistos):
+    """Valida um pedaço do lote, detecta duplicados com uma única consulta IN e insere o restante
+    com executemany numa transação própria"""
+    resultados = []
+    candidatos = []
+    for linha, registro in lote:
+        dados, erro = _normalizar_registro(registro)
+        if erro:
+            email = registro.get('email') if isinstance(registro, dict) else None
+            resultados.append(_resultado(linha, email, 'invalida', erro))
+        elif dados['email'] in emails_vistos:
+            resultados.append(_resultado(linha, dados['email'], 'duplicada', 'Email repetido no próprio lote'))
+        else:
+            emails_vistos.add(dados['email'])
+            candidatos.append((linha, dados))
+
+    existentes = set()
+    if candidatos:
+        emails = [dados['email'] for _, dados in candidatos]
+        existentes = set(db.session.scalars(db.select(Matricula.email).where(Matricula.email.in_(emails))))
+
+    novos = []
+    for linha, dados in candidatos:
+        if dados['email'] in existentes:
+            resultados.append(_resultado(
+                linha, dados['email'], 'duplicada', 'Já existe uma matrícula cadastrada com este email'
+            ))
+        else:
+            novos.append((linha, dados))
+
+    if novos:
+        try:
+            db.session.execute(insert(Matricula), [dados for _, dados in novos])
+            db.session.commit()
+            resultados.extend(
+                _resultado(linha, dados['email'], 'criada', 'Matrícula realizada com sucesso!') for linha, dados in novos
+            )
+        except IntegrityError:
+            # Outro envio gravou algum desses emails entre a consulta e o INSERT
+            db.session.rollback()
+            resultados.extend(_gravar_individualmente(novos))
+        except Exception as e:
+            logger.error(f"Erro ao gravar lote de matrículas: {str(e)}")
+            db.session.rollback()
+            resultados.extend(
+                _resultado(linha, dados['email'], 'erro', 'Erro ao gravar o lote') for linha, dados in novos
+            )
+
+    resultados.sort(key=lambda resultado: resultado['linha'])
+    return resultados
+
+
+def _gravar_individualmente(novos):
+    """Insere linha a linha com savepoints, para que um conflito não descarte o pedaço inteiro"""
+    resultados = []
+    for linha, dados in novos:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Matricula), dados)
+            resultados.append(_resultado(linha, dados['email'], 'criada', 'Matrícula realizada com sucesso!'))
+        except IntegrityError:
+            resultados.append(_resultado(
+                linha, dados['email'], 'duplicada', 'Já existe uma matrícula cadastrada com este email'
+            ))
+    db.session.commit()
+    return resultados
+
 @ns.route('')
 class MatriculaResource(Resource):
     @ns.expect(matricula_model)
@@ -61,15 +189,14 @@ class MatriculaResource(Resource):
             if not all([nome, email, curso]):
                 return {'error': 'Nome, email e curso são obrigatórios'}, 400
             
-            # Verificar se já existe matrícula com mesmo email
-            matricula_existente = Matricula.query.filter_by(email=email).first()
-            if matricula_existente:
-                return {'error': 'Já existe uma matrícula cadastrada com este email'}, 409
-            
-            # Criar nova matrícula
+            # Criar nova matrícula; o índice único em email rejeita duplicados
             nova_matricula = Matricula(nome=nome, email=email, curso=curso)
             db.session.add(nova_matricula)
-            db.session.commit()
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                return {'error': 'Já existe uma matrícula cadastrada com este email'}, 409
             
             logger.info(f"Nova matrícula criada: {nome} - {email} - {curso}")
             
@@ -84,16 +211,69 @@ class MatriculaResource(Resource):
             return {'error': 'Erro interno do servidor'}, 500
     
     @ns.marshal_list_with(matricula_response_model)
-    @ns.doc('listar_matriculas')
+    @ns.doc('listar_matriculas', params={
+        'after': 'ID da última matrícula da página anterior',
+        'limit': 'Quantidade máxima de matrículas por página'
+    })
     def get(self):
-        """Listar todas as matrículas"""
+        """Listar matrículas com paginação por cursor"""
+        # Fora do try: um cursor inválido deve chegar ao cliente como 400, não como erro interno
+        after, limit = parametros_paginacao(int)
         try:
-            matriculas = Matricula.query.all()
-            return [matricula.to_dict() for matricula in matriculas], 200
+            matriculas, proximo_cursor = paginar_query(Matricula.query, Matricula.id, after, limit)
+            return [matricula.to_dict() for matricula in matriculas], 200, cabecalhos_paginacao(proximo_cursor)
         except Exception as e:
             logger.error(f"Erro ao listar matrículas: {str(e)}")
             return {'error': 'Erro interno do servidor'}, 500
 
+@ns.route('/batch')
+class MatriculaBatchResource(Resource):
+    @ns.expect([matricula_model])
+    @ns.marshal_with(lote_response_model)
+    @ns.doc('criar_matriculas_em_lote')
+    def post(self):
+        """Criar matrículas em lote (array JSON ou NDJSON), com relatório por linha"""
+        try:
+            registros = _ler_registros_lote()
+        except ValueError as e:
+            # abort em vez de retorno: o marshal_with descartaria a chave 'error'
+            ns.abort(400, str(e))
+
+        tamanho_lote = current_app.config['MATRICULA_LOTE_TAMANHO']
+        resultados = []
+        emails_vistos = set()
+        lote = []
+        for linha, registro in enumerate(registros, start=1):
+            lote.append((linha, registro))
+            if len(lote) >= tamanho_lote:
+                resultados.extend(_gravar_lote(lote, emails_vistos))
+                lote = []
+        if lote:
+            resultados.extend(_gravar_lote(lote, emails_vistos))
+
+        contagem = {status: 0 for status in ('criada', 'duplicada', 'invalida', 'erro')}
+        for resultado in resultados:
+            contagem[resultado['status']] += 1
+
+        logger.info(f"Lote de matrículas processado: {len(resultados)} registros, {contagem['criada']} criadas")
+        return {
+            'total': len(resultados),
+            'criadas': contagem['criada'],
+            'duplicadas': contagem['duplicada'],
+            'invalidas': contagem['invalida'],
+            'erros': contagem['erro'],
+            'resultados': resultados
+        }, 200
+
+@ns.route('/export')
+class MatriculaExportResource(Resource):
+    @ns.doc('exportar_matriculas')
+    @ns.produces(['application/x-ndjson'])
+    def get(self):
+        """Exportar todas as matrículas em streaming (NDJSON)"""
+        matriculas = (matricula.to_dict() for matricula in exportar_query(Matricula.query, Matricula.id))
+        return resposta_ndjson(matriculas, matricula_response_model)
+
 @ns.route('/<int:matricula_id>')
 class MatriculaByIdResource(Resource):
     @ns.marshal_with(matricula_response_model)
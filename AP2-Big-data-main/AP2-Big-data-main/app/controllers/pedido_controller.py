@@ -4,7 +4,10 @@ from app.database import db
 from app.models.pedido import Pedido
 from datetime import datetime
 from app.models.usuario import Usuario
-from app.cosmosdb import container
+from app.paginacao import (
+    parametros_paginacao, paginar_query, cabecalhos_paginacao, exportar_query, resposta_ndjson
+)
+from app.produtos import buscar_produto_por_id
 
 # Criando namespace para o Swagger
 ns = Namespace('pedido', description='Operações relacionadas a pedidos')
@@ -13,6 +16,7 @@ ns = Namespace('pedido', description='Operações relacionadas a pedidos')
 pedido_model = ns.model('Pedido', {
     'id_pedido': fields.Integer(readonly=True, description='ID do pedido'),
     'nome_cliente': fields.String(required=True, description='Nome do cliente'),
+    'id_produto': fields.String(description='ID do produto'),
     'nome_produto': fields.String(required=True, description='Nome do produto'),
     'data_pedido': fields.Date(required=True, description='Data do pedido'),
     'valor_total': fields.Float(required=True, description='Valor total do pedido'),
@@ -23,12 +27,16 @@ pedido_model = ns.model('Pedido', {
 
 @ns.route('')
 class PedidoList(Resource):
-    @ns.doc('list_pedidos')
+    @ns.doc('list_pedidos', params={
+        'after': 'ID do último pedido da página anterior',
+        'limit': 'Quantidade máxima de pedidos por página'
+    })
     @ns.marshal_list_with(pedido_model)
     def get(self):
-        """Lista todos os pedidos"""
-        pedidos = Pedido.query.all()
-        return pedidos
+        """Lista os pedidos com paginação por cursor"""
+        after, limit = parametros_paginacao(int)
+        pedidos, proximo_cursor = paginar_query(Pedido.query, Pedido.id_pedido, after, limit)
+        return pedidos, 200, cabecalhos_paginacao(proximo_cursor)
 
     @ns.doc('create_pedido')
     @ns.expect(pedido_model)
@@ -49,13 +57,13 @@ class PedidoList(Resource):
             ns.abort(404, "Usuário não encontrado")
 
         # Buscar nome do produto no CosmosDB
-        query = f"SELECT * FROM produtos p WHERE p.id = '{dados['id_produto']}'"
-        produtos = list(container.query_items(query=query, enable_cross_partition_query=True))
-        nome_produto = produtos[0]["nome"] if produtos else "Produto não encontrado"
+        produto = buscar_produto_por_id(dados['id_produto'])
+        nome_produto = produto["nome"] if produto else "Produto não encontrado"
 
         novo_pedido = Pedido(
             nome_cliente=usuario.nome,
             data_pedido=datetime.strptime(dados["data_pedido"], "%Y-%m-%d"),
+            id_produto=str(dados['id_produto']),
             nome_produto=nome_produto,
             valor_total=dados["valor_total"],
             status=dados.get("status", "Confirmado"),
@@ -67,6 +75,14 @@ class PedidoList(Resource):
         db.session.commit()
         return novo_pedido, 201
 
+@ns.route('/export')
+class PedidoExport(Resource):
+    @ns.doc('export_pedidos')
+    @ns.produces(['application/x-ndjson'])
+    def get(self):
+        """Exporta todos os pedidos em streaming (NDJSON)"""
+        return resposta_ndjson(exportar_query(Pedido.query, Pedido.id_pedido), pedido_model)
+
 @ns.route('/<int:id>')
 @ns.param('id', 'ID do pedido')
 @ns.response(404, 'Pedido não encontrado')
@@ -1,7 +1,11 @@
-from flask import request
+from flask import request, current_app
 from flask_restx import Resource, Namespace, fields
-from app.cosmosdb import container
 from app.models.produto import Produto
+from app.paginacao import parametros_paginacao, fatiar_pagina, cabecalhos_paginacao, resposta_ndjson
+from app.produtos import (
+    produto_cache, buscar_produto_por_id, buscar_produto_por_nome, buscar_produtos_por_ids,
+    listar_produtos, exportar_produtos, criar_produto, atualizar_produto, remover_produto
+)
 
 # Criando namespace para o Swagger
 ns = Namespace('produtos', description='Operações relacionadas a produtos')
@@ -18,13 +22,17 @@ produto_model = ns.model('Produto', {
 
 @ns.route('')
 class ProdutoList(Resource):
-    @ns.doc('list_produtos')
+    @ns.doc('list_produtos', params={
+        'after': 'ID do último produto da página anterior',
+        'limit': 'Quantidade máxima de produtos por página'
+    })
     @ns.marshal_list_with(produto_model)
     def get(self):
-        """Lista todos os produtos"""
-        query = "SELECT * FROM produtos"
-        produtos = list(container.query_items(query=query, enable_cross_partition_query=True))
-        return produtos
+        """Lista os produtos com paginação por cursor"""
+        after, limit = parametros_paginacao()
+        produtos = listar_produtos(after, limit + 1)
+        produtos, proximo_cursor = fatiar_pagina(produtos, limit, lambda produto: produto["id"])
+        return produtos, 200, cabecalhos_paginacao(proximo_cursor)
 
     @ns.doc('create_produto')
     @ns.expect(produto_model)
@@ -44,9 +52,63 @@ class ProdutoList(Resource):
             descricao=dados.get("descricao")
         )
 
-        container.create_item(novo_produto.to_dict())
+        criar_produto(novo_produto.to_dict())
         return novo_produto.to_dict(), 201
 
+lote_request_model = ns.model('ProdutoLoteRequest', {
+    'ids': fields.List(fields.String, required=True, description='IDs dos produtos')
+})
+
+lote_item_model = ns.model('ProdutoLoteItem', {
+    'id': fields.String(description='ID solicitado'),
+    'encontrado': fields.Boolean(description='Se o produto existe'),
+    'produto': fields.Nested(produto_model, allow_null=True, description='Produto (null quando não encontrado)')
+})
+
+@ns.route('/batch')
+class ProdutoBatch(Resource):
+    @ns.doc('batch_produtos')
+    @ns.expect(lote_request_model)
+    @ns.marshal_list_with(lote_item_model)
+    def post(self):
+        """Busca vários produtos de uma vez, na ordem dos IDs enviados"""
+        ids = (request.json or {}).get("ids")
+        if not isinstance(ids, list) or not all(isinstance(id, str) for id in ids):
+            ns.abort(400, "Informe 'ids' como uma lista de IDs")
+
+        maximo = current_app.config['PRODUTO_LOTE_MAXIMO']
+        if len(ids) > maximo:
+            ns.abort(400, f"Máximo de {maximo} IDs por requisição")
+
+        produtos = buscar_produtos_por_ids(ids)
+        return [{"id": id, "encontrado": id in produtos, "produto": produtos.get(id)} for id in ids]
+
+cache_model = ns.model('ProdutoCache', {
+    'itens': fields.Integer(description='Quantidade de entradas em cache'),
+    'tamanho_maximo': fields.Integer(description='Capacidade máxima do cache (0 = desativado)'),
+    'ttl_segundos': fields.Integer(description='Tempo de vida de cada entrada'),
+    'acertos': fields.Integer(description='Leituras atendidas pelo cache'),
+    'falhas': fields.Integer(description='Leituras que foram ao armazenamento'),
+    'taxa_acerto': fields.Float(description='acertos / (acertos + falhas)')
+})
+
+@ns.route('/cache')
+class ProdutoCacheResource(Resource):
+    @ns.doc('get_produto_cache')
+    @ns.marshal_with(cache_model)
+    def get(self):
+        """Estatísticas do cache de produtos"""
+        return produto_cache.estatisticas()
+
+@ns.route('/export')
+class ProdutoExport(Resource):
+    @ns.doc('export_produtos')
+    @ns.produces(['application/x-ndjson'])
+    def get(self):
+        """Exporta todos os produtos em streaming (NDJSON)"""
+        produtos = exportar_produtos(current_app.config['EXPORTACAO_TAMANHO_LOTE'])
+        return resposta_ndjson(produtos, produto_model)
+
 @ns.route('/<string:id>')
 @ns.param('id', 'ID do produto')
 @ns.response(404, 'Produto não encontrado')
@@ -55,26 +117,24 @@ class ProdutoResource(Resource):
     @ns.marshal_with(produto_model)
     def get(self, id):
         """Busca um produto específico"""
-        query = f"SELECT * FROM produtos p WHERE p.id = '{id}'"
-        produtos = list(container.query_items(query=query, enable_cross_partition_query=True))
+        produto = buscar_produto_por_id(id)
 
-        if not produtos:
+        if produto is None:
             ns.abort(404, "Produto não encontrado")
 
-        return produtos[0]
+        return produto
 
     @ns.doc('update_produto')
     @ns.expect(produto_model)
     @ns.marshal_with(produto_model)
     def put(self, id):
         """Atualiza um produto"""
-        query = f"SELECT * FROM produtos p WHERE p.id = '{id}'"
-        produtos = list(container.query_items(query=query, enable_cross_partition_query=True))
+        produto = buscar_produto_por_id(id)
 
-        if not produtos:
+        if produto is None:
             ns.abort(404, "Produto não encontrado")
 
-        produto = produtos[0]
+        anterior = dict(produto)
         dados = request.json
         produto.update({
             "produtoCategoria": dados.get("produtoCategoria", produto["produtoCategoria"]),
@@ -84,20 +144,19 @@ class ProdutoResource(Resource):
             "descricao": dados.get("descricao", produto["descricao"]),
         })
 
-        container.replace_item(item=produto["id"], body=produto)
+        atualizar_produto(produto, anterior)
         return produto
 
     @ns.doc('delete_produto')
     @ns.response(204, 'Produto deletado')
     def delete(self, id):
         """Deleta um produto"""
-        query = f"SELECT * FROM produtos p WHERE p.id = '{id}'"
-        produtos = list(container.query_items(query=query, enable_cross_partition_query=True))
+        produto = buscar_produto_por_id(id)
 
-        if not produtos:
+        if produto is None:
             ns.abort(404, "Produto não encontrado")
 
-        container.delete_item(item=produtos[0]["id"], partition_key=produtos[0]["produtoCategoria"])
+        remover_produto(produto)
         return '', 204
 
 @ns.route('/nome/<string:nome>')
@@ -108,10 +167,9 @@ class ProdutoNomeResource(Resource):
     @ns.marshal_with(produto_model)
     def get(self, nome):
         """Busca um produto pelo nome"""
-        query = f"SELECT * FROM produtos p WHERE p.nome = '{nome}'"
-        produtos = list(container.query_items(query=query, enable_cross_partition_query=True))
+        produto = buscar_produto_por_nome(nome)
 
-        if not produtos:
+        if produto is None:
             ns.abort(404, "Produto não encontrado")
 
-        return produtos[0]
+        return produto
@@ -0,0 +1,30 @@
+from flask_restx import Resource, Namespace, fields
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Namespace para documentação Swagger
+ns = Namespace('healthz', description='Verificação leve de disponibilidade (usada pelo monitor do bot)')
+
+saude_model = ns.model('Saude', {
+    'status': fields.String(description='ok ou indisponivel'),
+    'banco': fields.String(description='ok ou erro')
+})
+
+@ns.route('')
+class Saude(Resource):
+    @ns.doc('healthz')
+    @ns.marshal_with(saude_model)
+    @ns.response(503, 'Banco de dados indisponível')
+    def get(self):
+        """Responde se a API e o banco estão no ar, com um SELECT 1 e sem montar nenhuma página"""
+        try:
+            db.session.execute(text('SELECT 1'))
+        except SQLAlchemyError as e:
+            logger.warning(f"Healthcheck: banco indisponível: {str(e)}")
+            db.session.rollback()
+            return {'status': 'indisponivel', 'banco': 'erro'}, 503
+        return {'status': 'ok', 'banco': 'ok'}, 200
@@ -2,6 +2,9 @@ from flask import request
 from flask_restx import Resource, Namespace, fields
 from app.database import db
 from app.models.usuario import Usuario
+from app.paginacao import (
+    parametros_paginacao, paginar_query, cabecalhos_paginacao, exportar_query, resposta_ndjson
+)
 
 # Criando namespace para o Swagger
 ns = Namespace('usuarios', description='Operações relacionadas a usuários')
@@ -18,12 +21,16 @@ usuario_model = ns.model('Usuario', {
 
 @ns.route('')
 class UsuarioList(Resource):
-    @ns.doc('list_usuarios')
+    @ns.doc('list_usuarios', params={
+        'after': 'ID do último usuário da página anterior',
+        'limit': 'Quantidade máxima de usuários por página'
+    })
     @ns.marshal_list_with(usuario_model)
     def get(self):
-        """Lista todos os usuários"""
-        usuarios = Usuario.query.all()
-        return usuarios
+        """Lista os usuários com paginação por cursor"""
+        after, limit = parametros_paginacao(int)
+        usuarios, proximo_cursor = paginar_query(Usuario.query, Usuario.id, after, limit)
+        return usuarios, 200, cabecalhos_paginacao(proximo_cursor)
 
     @ns.doc('create_usuario')
     @ns.expect(usuario_model)
@@ -51,6 +58,14 @@ class UsuarioList(Resource):
             db.session.rollback()
             ns.abort(500, "Erro ao salvar usuário no banco de dados")
 
+@ns.route('/export')
+class UsuarioExport(Resource):
+    @ns.doc('export_usuarios')
+    @ns.produces(['application/x-ndjson'])
+    def get(self):
+        """Exporta todos os usuários em streaming (NDJSON)"""
+        return resposta_ndjson(exportar_query(Usuario.query, Usuario.id), usuario_model)
+
 @ns.route('/<int:id>')
 @ns.param('id', 'Identificador do usuário')
 @ns.response(404, 'Usuário não encontrado')
@@ -97,3 +112,16 @@ class UsuarioResource(Resource):
         db.session.delete(usuario)
         db.session.commit()
         return '', 204
+
+@ns.route('/cpf/<string:cpf>')
+@ns.param('cpf', 'CPF do usuário (com ou sem pontuação)')
+@ns.response(404, 'Usuário não encontrado')
+class UsuarioCpfResource(Resource):
+    @ns.doc('get_usuario_por_cpf')
+    @ns.marshal_with(usuario_model)
+    def get(self, cpf):
+        """Busca um usuário pelo CPF"""
+        usuario = Usuario.query.filter_by(cpf=Usuario.normalizar_cpf(cpf)).first()
+        if not usuario:
+            ns.abort(404, "Usuário não encontrado")
+        return usuario
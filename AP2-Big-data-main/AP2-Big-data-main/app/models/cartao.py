@@ -1,9 +1,14 @@
 from app.database import db
 
 class Cartao(db.Model):
+    __table_args__ = (
+        # Autorização de transação: filter_by(usuario_id, numero, cvv)
+        db.Index("ix_cartao_usuario_numero_cvv", "usuario_id", "numero", "cvv"),
+    )
+
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     usuario_id = db.Column(db.Integer, db.ForeignKey("usuario.id"), nullable=False)
-    numero = db.Column(db.String(16), nullable=False)
+    numero = db.Column(db.String(16), nullable=False, index=True)
     nome_impresso = db.Column(db.String(100), nullable=False)
     validade = db.Column(db.DateTime, nullable=False)
     cvv = db.Column(db.String(4), nullable=False)
@@ -2,7 +2,7 @@ from app.database import db
 
 class Endereco(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    usuario_id = db.Column(db.Integer, db.ForeignKey("usuario.id"), nullable=False)
+    usuario_id = db.Column(db.Integer, db.ForeignKey("usuario.id"), nullable=False, index=True)
     logradouro = db.Column(db.String(150), nullable=False)
     complemento = db.Column(db.String(100))
     bairro = db.Column(db.String(100), nullable=False)
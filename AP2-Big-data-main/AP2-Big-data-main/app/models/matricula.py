@@ -6,7 +6,7 @@ class Matricula(db.Model):
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     nome = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(100), nullable=False, unique=True, index=True)
     curso = db.Column(db.String(100), nullable=False)
     data_matricula = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -5,6 +5,8 @@ class Pedido(db.Model):
     nome_cliente = db.Column(db.String(50), nullable=False)
     data_pedido = db.Column(db.Date, nullable=False)
     nome_produto = db.Column(db.String(100), nullable=False)
+    # ID do produto no Cosmos DB (nulo em pedidos anteriores à migração 0006)
+    id_produto = db.Column(db.String(64), nullable=True)
     valor_total = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), nullable=False)
 
@@ -14,5 +16,5 @@ class Pedido(db.Model):
     id_usuario = db.Column(db.Integer, db.ForeignKey("usuario.id"), nullable=False)
     usuario = db.relationship("Usuario", back_populates="pedidos", lazy=True)
     
-    id_cartao = db.Column(db.Integer, db.ForeignKey("cartao.id"), nullable=False)
+    id_cartao = db.Column(db.Integer, db.ForeignKey("cartao.id"), nullable=False, index=True)
     cartao = db.relationship("Cartao", back_populates="pedidos", lazy=True)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from app.database import db
+from datetime import datetime
+
+class Transacao(db.Model):
+    """Registro append-only das autorizações de cartão (nunca é alterado depois de gravado)"""
+    __tablename__ = 'transacao'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    chave_idempotencia = db.Column(db.String(100), unique=True)  # Header Idempotency-Key do cliente
+    usuario_id = db.Column(db.Integer, nullable=False)
+    cartao_id = db.Column(db.Integer, index=True)  # Sem FK: o histórico sobrevive à exclusão do cartão
+    pedido_id = db.Column(db.Integer)  # Pedido criado no checkout, quando houver
+    id_produto = db.Column(db.String(64))  # Produto comprado no checkout (nulo em /cartao/authorize)
+    valor = db.Column(db.Numeric(10, 2), nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # "AUTHORIZED" ou "NOT_AUTHORIZED"
+    codigo_autorizacao = db.Column(db.String(36))
+    mensagem = db.Column(db.String(255), nullable=False)
+    http_status = db.Column(db.Integer, nullable=False)
+    dt_transacao = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,3 +1,5 @@
+import re
+from sqlalchemy.orm import validates
 from app.database import db
 
 class Usuario(db.Model):
@@ -5,9 +7,20 @@ class Usuario(db.Model):
     nome = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     dt_nascimento = db.Column(db.String(10))
-    cpf = db.Column(db.String(11), unique=True)
+    cpf = db.Column(db.String(11), unique=True)  # Apenas dígitos (ver normalizar_cpf)
     telefone = db.Column(db.String(20))
 
     enderecos = db.relationship("Endereco", back_populates="usuario", lazy=True)
     cartoes = db.relationship("Cartao", back_populates="usuario", lazy=True)
-    pedidos = db.relationship("Pedido", back_populates="usuario", lazy=True)
\ No newline at end of file
+    pedidos = db.relationship("Pedido", back_populates="usuario", lazy=True)
+
+    @staticmethod
+    def normalizar_cpf(cpf):
+        """Mantém apenas os dígitos do CPF (remove pontos, traços e espaços)."""
+        if cpf is None:
+            return None
+        return re.sub(r'[^\d]', '', cpf) or None
+
+    @validates("cpf")
+    def _normalizar_cpf(self, key, cpf):
+        return Usuario.normalizar_cpf(cpf)
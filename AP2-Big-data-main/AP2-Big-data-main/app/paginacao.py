@@ -0,0 +1,67 @@
+import json
+from flask import Response, current_app, request, stream_with_context
+from flask_restx import abort, marshal
+
+CABECALHO_PROXIMO_CURSOR = 'X-Next-Cursor'
+
+
+def parametros_paginacao(tipo_cursor=str):
+    """Lê ?after=<id>&limit= da query string, aplicando o limite padrão e o máximo.
+
+    Sem `after` é a primeira página; um `after` presente mas inválido responde 400, para que o
+    cliente não receba a primeira página de novo e fique preso num laço.
+    """
+    after = request.args.get('after')
+    if after is not None:
+        try:
+            if not after:
+                raise ValueError(after)
+            after = tipo_cursor(after)
+        except ValueError:
+            abort(400, f"Cursor 'after' inválido: {after!r}")
+    limit = request.args.get('limit', type=int) or current_app.config['PAGINACAO_LIMITE_PADRAO']
+    limit = max(1, min(limit, current_app.config['PAGINACAO_LIMITE_MAXIMO']))
+    return after, limit
+
+
+def paginar_query(query, coluna, after, limit):
+    """Aplica paginação por cursor (keyset) ordenada pela coluna informada.
+
+    Busca limit + 1 linhas para saber se existe próxima página sem precisar de COUNT.
+    Retorna a página e o cursor da próxima página (None quando for a última).
+    """
+    if after is not None:
+        query = query.filter(coluna > after)
+
+    itens = query.order_by(coluna).limit(limit + 1).all()
+    return fatiar_pagina(itens, limit, lambda item: getattr(item, coluna.key))
+
+
+def fatiar_pagina(itens, limit, cursor_de):
+    """Recebe até limit + 1 itens e separa a página do cursor da próxima página"""
+    if len(itens) <= limit:
+        return itens, None
+    itens = itens[:limit]
+    return itens, cursor_de(itens[-1])
+
+
+def cabecalhos_paginacao(proximo_cursor):
+    """Cabeçalhos HTTP com o cursor da próxima página"""
+    if proximo_cursor is None:
+        return {}
+    return {CABECALHO_PROXIMO_CURSOR: str(proximo_cursor)}
+
+
+def exportar_query(query, coluna):
+    """Percorre a tabela inteira em lotes com yield_per, sem carregar tudo em memória"""
+    lote = current_app.config['EXPORTACAO_TAMANHO_LOTE']
+    return query.order_by(coluna).yield_per(lote)
+
+
+def resposta_ndjson(linhas, modelo):
+    """Resposta em streaming no formato NDJSON (um objeto JSON por linha)"""
+    def gerar():
+        for linha in linhas:
+            yield json.dumps(marshal(linha, modelo), ensure_ascii=False, default=str) + '\n'
+
+    return Response(stream_with_context(gerar()), mimetype='application/x-ndjson')
@@ -0,0 +1,231 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+
+class ProdutoStore(ABC):
+    """Interface de armazenamento dos produtos.
+
+    Cobre as formas de consulta usadas pela API: página ordenada por id, exportação
+    completa em lotes, leitura pontual (id + categoria), busca por id/nome e gravação.
+    Uma implementação incompleta falha já ao ser instanciada.
+    """
+
+    @abstractmethod
+    def listar(self, after, limite):
+        """Até `limite` produtos com id > after, ordenados por id"""
+
+    @abstractmethod
+    def exportar(self, lote):
+        """Percorre todos os produtos, buscando `lote` por vez"""
+
+    @abstractmethod
+    def listar_particoes(self):
+        """Pares (id, produtoCategoria) de todos os produtos"""
+
+    @abstractmethod
+    def ler(self, id, categoria):
+        """Leitura pontual pela chave de partição; None se não existir"""
+
+    @abstractmethod
+    def buscar_por_id(self, id):
+        ...
+
+    @abstractmethod
+    def buscar_por_nome(self, nome):
+        ...
+
+    @abstractmethod
+    def buscar_varios(self, ids, categoria=None):
+        """Produtos com os IDs informados numa única consulta, restrita à partição quando informada"""
+
+    @abstractmethod
+    def criar(self, produto):
+        ...
+
+    @abstractmethod
+    def substituir(self, produto):
+        ...
+
+    @abstractmethod
+    def remover(self, id, categoria):
+        ...
+
+
+class CosmosProdutoStore(ProdutoStore):
+    """Produtos no container 'produtos' do Azure CosmosDB (conexão aberta no primeiro uso)"""
+
+    def __init__(self, uri, chave, database):
+        self._uri = uri
+        self._chave = chave
+        self._database = database
+        self._container = None
+        self._lock = threading.Lock()
+
+    @property
+    def container(self):
+        if self._container is None:
+            with self._lock:
+                if self._container is None:
+                    import urllib3
+                    from azure.cosmos import CosmosClient
+
+                    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+                    client = CosmosClient(self._uri, credential=self._chave)
+                    self._container = client.get_database_client(self._database).get_container_client("produtos")
+        return self._container
+
+    def _consultar(self, query, parametros=None):
+        return list(self.container.query_items(query=query, parameters=parametros, enable_cross_partition_query=True))
+
+    def listar(self, after, limite):
+        parametros = [{"name": "@limite", "value": limite}]
+        query = "SELECT TOP @limite * FROM produtos p"
+        if after is not None:
+            query += " WHERE p.id > @after"
+            parametros.append({"name": "@after", "value": after})
+        query += " ORDER BY p.id"
+        return self._consultar(query, parametros)
+
+    def exportar(self, lote):
+        # Cada página é buscada sob demanda via continuation token do Cosmos
+        paginas = self.container.query_items(
+            query="SELECT * FROM produtos p",
+            enable_cross_partition_query=True,
+            max_item_count=lote
+        ).by_page()
+        return (produto for pagina in paginas for produto in pagina)
+
+    def listar_particoes(self):
+        produtos = self._consultar("SELECT p.id, p.produtoCategoria FROM produtos p")
+        return [(produto["id"], produto["produtoCategoria"]) for produto in produtos]
+
+    def ler(self, id, categoria):
+        from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+        try:
+            return self.container.read_item(item=id, partition_key=categoria)
+        except CosmosResourceNotFoundError:
+            return None
+
+    def buscar_por_id(self, id):
+        produtos = self._consultar("SELECT * FROM produtos p WHERE p.id = @id", [{"name": "@id", "value": id}])
+        return produtos[0] if produtos else None
+
+    def buscar_por_nome(self, nome):
+        produtos = self._consultar("SELECT * FROM produtos p WHERE p.nome = @nome", [{"name": "@nome", "value": nome}])
+        return produtos[0] if produtos else None
+
+    def buscar_varios(self, ids, categoria=None):
+        query = "SELECT * FROM produtos p WHERE ARRAY_CONTAINS(@ids, p.id)"
+        parametros = [{"name": "@ids", "value": list(ids)}]
+        if categoria is None:
+            return self._consultar(query, parametros)
+        return list(self.container.query_items(query=query, parameters=parametros, partition_key=categoria))
+
+    def criar(self, produto):
+        self.container.create_item(produto)
+
+    def substituir(self, produto):
+        self.container.replace_item(item=produto["id"], body=produto)
+
+    def remover(self, id, categoria):
+        self.container.delete_item(item=id, partition_key=categoria)
+
+
+class SQLiteProdutoStore(ProdutoStore):
+    """Produtos em SQLite local (arquivo ou ':memory:'), para desenvolvimento, CI e testes de carga.
+
+    O documento completo é guardado como JSON; id, categoria e nome ficam em colunas
+    indexadas para reproduzir as consultas feitas no CosmosDB.
+    """
+
+    def __init__(self, caminho=":memory:"):
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS produtos ("
+                " id TEXT PRIMARY KEY,"
+                " produtoCategoria TEXT NOT NULL,"
+                " nome TEXT NOT NULL,"
+                " documento TEXT NOT NULL)"
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS ix_produtos_nome ON produtos (nome)")
+
+    def _consultar(self, sql, parametros=()):
+        with self._lock:
+            return self._conexao.execute(sql, parametros).fetchall()
+
+    def listar(self, after, limite):
+        if after is None:
+            linhas = self._consultar("SELECT documento FROM produtos ORDER BY id LIMIT ?", (limite,))
+        else:
+            linhas = self._consultar(
+                "SELECT documento FROM produtos WHERE id > ? ORDER BY id LIMIT ?", (after, limite)
+            )
+        return [json.loads(documento) for documento, in linhas]
+
+    def exportar(self, lote):
+        after = None
+        while True:
+            produtos = self.listar(after, lote)
+            yield from produtos
+            if len(produtos) < lote:
+                return
+            after = produtos[-1]["id"]
+
+    def listar_particoes(self):
+        return self._consultar("SELECT id, produtoCategoria FROM produtos")
+
+    def ler(self, id, categoria):
+        linhas = self._consultar(
+            "SELECT documento FROM produtos WHERE id = ? AND produtoCategoria = ?", (id, categoria)
+        )
+        return json.loads(linhas[0][0]) if linhas else None
+
+    def buscar_por_id(self, id):
+        linhas = self._consultar("SELECT documento FROM produtos WHERE id = ?", (id,))
+        return json.loads(linhas[0][0]) if linhas else None
+
+    def buscar_por_nome(self, nome):
+        linhas = self._consultar("SELECT documento FROM produtos WHERE nome = ? LIMIT 1", (nome,))
+        return json.loads(linhas[0][0]) if linhas else None
+
+    def buscar_varios(self, ids, categoria=None):
+        ids = list(ids)
+        marcadores = ", ".join("?" for _ in ids)
+        sql = f"SELECT documento FROM produtos WHERE id IN ({marcadores})"
+        parametros = ids
+        if categoria is not None:
+            sql += " AND produtoCategoria = ?"
+            parametros = ids + [categoria]
+        return [json.loads(documento) for documento, in self._consultar(sql, parametros)]
+
+    def _gravar(self, sql, produto):
+        documento = json.dumps(produto, ensure_ascii=False)
+        with self._lock, self._conexao:
+            self._conexao.execute(sql, (produto["id"], produto["produtoCategoria"], produto["nome"], documento))
+
+    def criar(self, produto):
+        self._gravar("INSERT INTO produtos (id, produtoCategoria, nome, documento) VALUES (?, ?, ?, ?)", produto)
+
+    def substituir(self, produto):
+        self._gravar("REPLACE INTO produtos (id, produtoCategoria, nome, documento) VALUES (?, ?, ?, ?)", produto)
+
+    def remover(self, id, categoria):
+        with self._lock, self._conexao:
+            self._conexao.execute("DELETE FROM produtos WHERE id = ? AND produtoCategoria = ?", (id, categoria))
+
+
+def criar_produto_store(config):
+    """Instancia o armazenamento escolhido em PRODUTO_STORE ('cosmos' ou 'sqlite')"""
+    tipo = config["PRODUTO_STORE"]
+    if tipo == "cosmos":
+        return CosmosProdutoStore(
+            config["AZURE_COSMOS_URI"], config["AZURE_COSMOS_KEY"], config["AZURE_COSMOS_DATABASE"]
+        )
+    if tipo == "sqlite":
+        return SQLiteProdutoStore(config["PRODUTO_STORE_SQLITE"])
+    raise ValueError(f"PRODUTO_STORE inválido: {tipo}")
@@ -0,0 +1,182 @@
+import threading
+from app.cache import CacheTTL
+from app.produto_store import criar_produto_store
+
+# Cache de leitura dos produtos, por ID e por nome
+produto_cache = CacheTTL()
+
+# Armazenamento dos produtos (CosmosDB ou SQLite local), definido em configurar_produtos()
+produto_store = None
+
+
+class IndiceParticao:
+    """Mapa id -> produtoCategoria (chave de partição) para leituras pontuais no CosmosDB.
+
+    Cada processo mantém o seu: um ID ausente ou desatualizado (produto criado ou
+    alterado por outro worker) cai na consulta entre partições e é corrigido nela.
+    """
+
+    def __init__(self):
+        self._particoes = {}
+        self._carregado = False
+        self._lock = threading.Lock()
+
+    def carregar(self):
+        """Lê apenas id e categoria de todos os produtos"""
+        particoes = dict(produto_store.listar_particoes())
+        with self._lock:
+            self._particoes = particoes
+            self._carregado = True
+        return len(particoes)
+
+    def limpar(self):
+        with self._lock:
+            self._particoes = {}
+            self._carregado = False
+
+    def obter(self, id):
+        if not self._carregado:
+            self.carregar()
+        return self._particoes.get(id)
+
+    def registrar(self, produto):
+        with self._lock:
+            self._particoes[produto["id"]] = produto["produtoCategoria"]
+
+    def remover(self, id):
+        with self._lock:
+            self._particoes.pop(id, None)
+
+
+indice_particao = IndiceParticao()
+
+
+def configurar_produtos(config):
+    """Cria o armazenamento de produtos e reinicia cache e índice de partições"""
+    global produto_store
+    produto_store = criar_produto_store(config)
+    produto_cache.configurar(config["PRODUTO_CACHE_TAMANHO"], config["PRODUTO_CACHE_TTL"])
+    indice_particao.limpar()
+
+
+def _chave_id(id):
+    return ("id", id)
+
+
+def _chave_nome(nome):
+    return ("nome", nome)
+
+
+def _ler_produto(id):
+    """Leitura pontual pela chave de partição; sem ela, consulta entre partições"""
+    particao = indice_particao.obter(id)
+    if particao is not None:
+        produto = produto_store.ler(id, particao)
+        if produto is not None:
+            return produto
+        indice_particao.remover(id)
+
+    produto = produto_store.buscar_por_id(id)
+    if produto is not None:
+        indice_particao.registrar(produto)
+    return produto
+
+
+def buscar_produto_por_id(id):
+    """Busca um produto pelo ID, indo ao armazenamento apenas em caso de falha no cache"""
+    produto = produto_cache.obter(_chave_id(id))
+    if produto is not None:
+        return produto
+
+    produto = _ler_produto(id)
+    if produto is None:
+        return None
+
+    produto_cache.guardar(_chave_id(id), produto)
+    return produto
+
+
+def buscar_produto_por_nome(nome):
+    """Busca um produto pelo nome, indo ao armazenamento apenas em caso de falha no cache"""
+    produto = produto_cache.obter(_chave_nome(nome))
+    if produto is not None:
+        return produto
+
+    produto = produto_store.buscar_por_nome(nome)
+    if produto is None:
+        return None
+
+    indice_particao.registrar(produto)
+    produto_cache.guardar(_chave_nome(nome), produto)
+    return produto
+
+
+def buscar_produtos_por_ids(ids):
+    """Resolve vários IDs de uma vez: cache, depois uma consulta por partição conhecida
+    e uma única consulta entre partições para o restante. Retorna {id: produto}."""
+    encontrados = {}
+    pendentes = []
+    for id in dict.fromkeys(ids):
+        produto = produto_cache.obter(_chave_id(id))
+        if produto is not None:
+            encontrados[id] = produto
+        else:
+            pendentes.append(id)
+
+    por_particao = {}
+    for id in pendentes:
+        particao = indice_particao.obter(id)
+        if particao is not None:
+            por_particao.setdefault(particao, []).append(id)
+
+    lidos = []
+    for particao, ids_particao in por_particao.items():
+        lidos.extend(produto_store.buscar_varios(ids_particao, particao))
+
+    # IDs sem partição conhecida ou com partição desatualizada
+    lidos_ids = {produto["id"] for produto in lidos}
+    restantes = [id for id in pendentes if id not in lidos_ids]
+    if restantes:
+        lidos.extend(produto_store.buscar_varios(restantes))
+
+    for produto in lidos:
+        indice_particao.registrar(produto)
+        produto_cache.guardar(_chave_id(produto["id"]), produto)
+        encontrados[produto["id"]] = produto
+    return encontrados
+
+
+def listar_produtos(after, limite):
+    return produto_store.listar(after, limite)
+
+
+def exportar_produtos(lote):
+    return produto_store.exportar(lote)
+
+
+def criar_produto(produto):
+    produto_store.criar(produto)
+    _produto_gravado(produto)
+
+
+def atualizar_produto(produto, anterior):
+    produto_store.substituir(produto)
+    _produto_gravado(produto, anterior)
+
+
+def remover_produto(produto):
+    produto_store.remover(produto["id"], produto["produtoCategoria"])
+    indice_particao.remover(produto["id"])
+    invalidar_produto(produto)
+
+
+def _produto_gravado(produto, *anteriores):
+    """Atualiza índice de partições e cache após criar ou alterar um produto"""
+    indice_particao.registrar(produto)
+    invalidar_produto(produto, *anteriores)
+
+
+def invalidar_produto(*produtos):
+    """Remove do cache as entradas (por ID e por nome) dos produtos informados"""
+    for produto in produtos:
+        produto_cache.remover(_chave_id(produto.get("id")), _chave_nome(produto.get("nome")))
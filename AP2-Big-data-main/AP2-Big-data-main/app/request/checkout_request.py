@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+class CheckoutRequest(BaseModel):
+    id_usuario: int  # Usuário dono do cartão
+    id_produto: str  # ID do produto no catálogo (o preço vem do catálogo, não do cliente)
+    numero: str  # Número do cartão (16 dígitos)
+    dt_expiracao: str  # Validade no formato MM/AAAA
+    cvv: str  # CVV pode ter 3 ou 4 dígitos
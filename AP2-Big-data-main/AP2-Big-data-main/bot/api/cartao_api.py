@@ -1,11 +1,15 @@
-import requests
-import json
+import logging
 from config import DefaultConfig
+from api.http_client import requisitar
+from helpers.rastreamento import rota
+from helpers.registro import Payload
 
 CONFIG = DefaultConfig()
 
+logger = logging.getLogger(__name__)
+
 class CartaoAPI():
-    def consultar_cartao_por_numero(self,card_number):
+    async def consultar_cartao_por_numero(self,card_number):
         try:
             url = f"{CONFIG.API_BASE_URL}/cartao/numero/{card_number}"
 
@@ -16,17 +20,18 @@ class CartaoAPI():
                 'Content-Type': 'application/json'
             }
 
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            # A URL contém o número do cartão: só a rota vai para o log
+            logger.debug("Status %s em %s", response.status_code, rota(url))
 
             if response.status_code == 200:
                 result = response.json()
-                print(f"Cartão encontrado...")
+                logger.debug("Cartão encontrado")
                 return result
             else:
-                print(f"Erro na API: {response.text}")
+                logger.warning("Erro na API (%s): %s", response.status_code, Payload(response.text))
                 return None
             
         except Exception as e:
-            print(f"Exceção ao consultar cartão pelo número: {e}")
+            logger.error("Exceção ao consultar cartão pelo número: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import aiohttp
+from config import DefaultConfig
+from helpers.rastreamento import rastreador, rota
+
+CONFIG = DefaultConfig()
+
+# Sessão HTTP única do bot: conexões keep-alive reaproveitadas por todas as classes de API
+_sessao = None
+
+# Funções chamadas após cada requisição com (url, ok, erro), ex.: o monitor de saúde
+_observadores = []
+
+
+class RespostaAPI:
+    """Resposta já lida do aiohttp, com a mesma interface usada antes com requests"""
+
+    def __init__(self, status_code, text, headers):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _criar_sessao():
+    conector = aiohttp.TCPConnector(
+        limit=CONFIG.API_POOL_CONEXOES,
+        limit_per_host=CONFIG.API_POOL_CONEXOES_POR_HOST,
+    )
+    return aiohttp.ClientSession(
+        connector=conector,
+        timeout=aiohttp.ClientTimeout(total=CONFIG.API_TIMEOUT_SEGUNDOS),
+    )
+
+
+async def iniciar_sessao(app=None):
+    """Cria a sessão compartilhada (registrado em on_startup da aplicação aiohttp)"""
+    global _sessao
+    if _sessao is None or _sessao.closed:
+        _sessao = _criar_sessao()
+
+
+async def encerrar_sessao(app=None):
+    """Fecha a sessão e o pool de conexões (registrado em on_cleanup)"""
+    global _sessao
+    if _sessao is not None:
+        await _sessao.close()
+        _sessao = None
+
+
+def adicionar_observador(observador):
+    _observadores.append(observador)
+
+
+def _notificar(url, ok, erro=None):
+    for observador in _observadores:
+        observador(url, ok, erro)
+
+
+async def requisitar(metodo, url, timeout=None, **kwargs):
+    """Faz a requisição pela sessão compartilhada e devolve uma RespostaAPI.
+
+    Timeouts geram asyncio.TimeoutError e falhas de conexão aiohttp.ClientConnectionError.
+    Cada chamada gera um span "http" com o método, a rota e o status da resposta, e o
+    resultado (status abaixo de 500 ou falha) é repassado aos observadores.
+    """
+    if _sessao is None or _sessao.closed:
+        # Uso fora do servidor (scripts, testes): cria a sessão sob demanda
+        await iniciar_sessao()
+
+    if timeout is not None:
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+    try:
+        async with rastreador.span(f"{metodo} {rota(url)}", "http") as span:
+            async with _sessao.request(metodo, url, **kwargs) as response:
+                texto = await response.text()
+                span["status"] = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        _notificar(url, False, type(e).__name__)
+        raise
+
+    _notificar(url, response.status < 500, None if response.status < 500 else f"HTTP {response.status}")
+    return RespostaAPI(response.status, texto, response.headers)
@@ -1,15 +1,20 @@
-import requests
-import json
+import asyncio
+import logging
+import aiohttp
 from datetime import datetime
 from config import DefaultConfig
+from api.http_client import requisitar
+from helpers.registro import Payload
 
 CONFIG = DefaultConfig()
 
+logger = logging.getLogger(__name__)
+
 class OrderAPI:
-    def consultar_pedidos(self, nome_cliente):
+    async def consultar_pedidos(self, nome_cliente):
         try:
             url = f"{CONFIG.API_BASE_URL}/pedido/nome/{nome_cliente}"
-            print(f"Consultando API: {url}")
+            logger.debug("Consultando API: %s", url)
             
             headers = {
                 'User-Agent': 'IBMEC-Bot/1.0',
@@ -17,49 +22,49 @@ class OrderAPI:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"Pedidos encontrados: {len(result)}")
+                logger.debug("Pedidos encontrados: %d", len(result))
                 return result
             else:
-                print(f"Erro na API: {response.text}")
+                logger.warning("Erro na API (%s): %s", response.status_code, Payload(response.text))
                 return []
         except Exception as e:
-            print(f"Exceção ao consultar pedidos: {e}")
+            logger.error("Exceção ao consultar pedidos: %s", e)
             return []
 
-    def consultar_pedidos_por_cartao(self, cartao_id):
+    async def consultar_pedidos_por_cartao(self, cartao_id):
         try:
             url = f"{CONFIG.API_BASE_URL}/pedido/cartao/{cartao_id}"
-            print(f"Consultando pedidos do cartão {cartao_id} na URL: {url}")
+            logger.debug("Consultando pedidos do cartão %s: %s", cartao_id, url)
             
             headers = {
                 'User-Agent': 'IBMEC-Bot/1.0',
                 'Accept': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code da consulta: {response.status_code}")
-            print(f"Resposta da API: {response.text}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
+            logger.debug("Resposta da API: %s", Payload(response.text))
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"Pedidos encontrados: {len(result)}")
+                logger.debug("Pedidos encontrados: %d", len(result))
                 return result
             else:
-                print(f"Erro ao consultar pedidos do cartão: {response.text}")
+                logger.warning("Erro ao consultar pedidos do cartão (%s): %s", response.status_code, Payload(response.text))
                 return []
         except Exception as e:
-            print(f"Exceção ao consultar pedidos do cartão: {e}")
+            logger.error("Exceção ao consultar pedidos do cartão: %s", e)
             return []
 
-    def consultar_pedidos_por_id(self, id_pedido):
+    async def consultar_pedidos_por_id(self, id_pedido):
         try:
             url = f"{CONFIG.API_BASE_URL}/pedido/{id_pedido}"
-            print(f"Consultando API: {url}")
+            logger.debug("Consultando API: %s", url)
             
             headers = {
                 'User-Agent': 'IBMEC-Bot/1.0',
@@ -67,21 +72,21 @@ class OrderAPI:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code consulta ID: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"Pedido encontrado por ID...")
+                logger.debug("Pedido %s encontrado", id_pedido)
                 return result
             else:
-                print(f"Erro ao consultar por ID: {response.text}")
+                logger.warning("Erro ao consultar pedido por ID (%s): %s", response.status_code, Payload(response.text))
                 return None
         except Exception as e:
-            print(f"Exceção ao consultar pedido por ID: {e}")
+            logger.error("Exceção ao consultar pedido por ID: %s", e)
             return None
 
-    def criar_pedido(self, id_produto, id_usuario, valor_total, id_cartao):
+    async def criar_pedido(self, id_produto, id_usuario, valor_total, id_cartao):
         try:
             url = f"{CONFIG.API_BASE_URL}/pedido"
             data = {
@@ -99,30 +104,24 @@ class OrderAPI:
                 'Content-Type': 'application/json'
             }
             
-            print(f"Criando pedido: {json.dumps(data, indent=2)}")
+            logger.debug("Criando pedido: %s", Payload(data))
             
-            response = requests.post(url, json=data, headers=headers, timeout=30)
-            print(f"Status code: {response.status_code}")
-            print(f"Response text: {response.text}")
+            response = await requisitar("POST", url, json=data, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
+            logger.debug("Resposta da API: %s", Payload(response.text))
             
             if response.status_code == 201:
                 result = response.json()
-                print(f"Pedido criado: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                logger.debug("Pedido criado: %s", Payload(result))
                 return result
             else:
-                print(f"Erro ao criar pedido: {response.text}")
-                # Tentar pegar detalhes do erro
-                try:
-                    error_detail = response.json()
-                    print(f"Detalhes do erro: {json.dumps(error_detail, indent=2, ensure_ascii=False)}")
-                except:
-                    pass
+                logger.warning("Erro ao criar pedido (%s): %s", response.status_code, Payload(response.text))
                 return None
         except Exception as e:
-            print(f"Exceção ao criar pedido: {e}")
+            logger.error("Exceção ao criar pedido: %s", e)
             return None
 
-    def autorizar_transacao(self, id_usuario, numero_cartao, data_expiracao, cvv, valor):
+    async def autorizar_transacao(self, id_usuario, numero_cartao, data_expiracao, cvv, valor, chave_idempotencia=None):
         try:
             url = f"{CONFIG.API_BASE_URL}/cartao/authorize/usuario/{id_usuario}"
             data = {
@@ -132,25 +131,74 @@ class OrderAPI:
                 "valor": valor
             }
             
-            headers = {
-                'User-Agent': 'IBMEC-Bot/1.0',
-                'Accept': 'application/json',
-                'Content-Type': 'application/json'
-            }
-            
-            print(f"Autorizando transação: {json.dumps(data, indent=2)}")
+            logger.debug("Autorizando transação: %s", Payload(data))
             
-            response = requests.post(url, json=data, headers=headers, timeout=30)
-            print(f"Status code: {response.status_code}")
+            response = await self._post_idempotente(url, data, chave_idempotencia)
+            logger.debug("Status %s em %s", response.status_code, url)
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"Transação autorizada: {json.dumps(result, indent=2, ensure_ascii=False)}")
+                logger.debug("Transação autorizada: %s", Payload(result))
                 return result
             else:
                 error_msg = response.json() if response.headers.get('content-type') == 'application/json' else response.text
-                print(f"Erro ao autorizar transação: {error_msg}")
+                logger.warning("Erro ao autorizar transação (%s): %s", response.status_code, Payload(error_msg))
                 return {"status": "NOT_AUTHORIZED", "message": error_msg}
         except Exception as e:
-            print(f"Exceção ao autorizar transação: {e}")
-            return {"status": "ERROR", "message": str(e)}
\ No newline at end of file
+            logger.error("Exceção ao autorizar transação: %s", e)
+            return {"status": "ERROR", "message": str(e)}
+
+    async def finalizar_compra(self, id_usuario, id_produto, numero_cartao, data_expiracao, cvv, chave_idempotencia=None):
+        """Checkout numa única chamada: o backend valida o cartão, debita o preço do produto
+        e registra o pedido na mesma transação"""
+        try:
+            url = f"{CONFIG.API_BASE_URL}/checkout"
+            data = {
+                "id_usuario": id_usuario,
+                "id_produto": id_produto,
+                "numero": numero_cartao,
+                "cvv": cvv,
+                "dt_expiracao": data_expiracao
+            }
+            
+            logger.info("Finalizando compra do produto %s para o usuário %s", id_produto, id_usuario)
+            
+            response = await self._post_idempotente(url, data, chave_idempotencia)
+            logger.debug("Status %s em %s", response.status_code, url)
+            
+            try:
+                result = response.json()
+            except ValueError:
+                result = {"status": "NOT_AUTHORIZED", "message": response.text}
+            
+            if response.status_code == 200:
+                logger.debug("Compra concluída: %s", Payload(result))
+            else:
+                logger.warning("Compra não concluída (%s): %s", response.status_code, Payload(result))
+                result.setdefault("status", "NOT_AUTHORIZED")
+            return result
+        except Exception as e:
+            logger.error("Exceção ao finalizar compra: %s", e)
+            return {"status": "ERROR", "message": str(e)}
+
+    async def _post_idempotente(self, url, data, chave_idempotencia):
+        """POST que, com Idempotency-Key, é repetido em timeouts e falhas de conexão"""
+        headers = {
+            'User-Agent': 'IBMEC-Bot/1.0',
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'
+        }
+        
+        # Com a Idempotency-Key o backend devolve o resultado original em vez de debitar de novo,
+        # então timeouts e falhas de conexão podem ser repetidos com segurança
+        if chave_idempotencia:
+            headers['Idempotency-Key'] = chave_idempotencia
+        tentativas = CONFIG.API_TENTATIVAS_AUTORIZACAO if chave_idempotencia else 1
+        
+        for tentativa in range(1, tentativas + 1):
+            try:
+                return await requisitar("POST", url, json=data, headers=headers)
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                if tentativa == tentativas:
+                    raise
+                logger.warning("Falha na tentativa %d (%r), repetindo...", tentativa, e)
@@ -1,17 +1,20 @@
-import requests
-import json
+import logging
 from urllib.parse import quote
 from config import DefaultConfig
+from api.http_client import requisitar
+from helpers.registro import Payload
 
 CONFIG = DefaultConfig()
 
+logger = logging.getLogger(__name__)
+
 class ProductAPI:
-    def consultar_produtos(self, product_name):
+    async def consultar_produtos(self, product_name):
         try:
             # Fazer URL encoding do nome do produto para tratar espaços e acentos
             encoded_name = quote(product_name, safe='')
             url = f"{CONFIG.API_BASE_URL}/produto/nome/{encoded_name}"
-            print(f"Consultando API: {url}")
+            logger.debug("Consultando API: %s", url)
             
             # Adicionar headers apropriados
             headers = {
@@ -20,24 +23,24 @@ class ProductAPI:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"Resposta da API: {json.dumps(result, indent=2)}")
+                logger.debug("Resposta da API: %s", Payload(result))
                 return result
             else:
-                print(f"Erro na API: {response.text}")
+                logger.warning("Erro na API (%s): %s", response.status_code, Payload(response.text))
                 return None
         except Exception as e:
-            print(f"Exceção ao consultar a API de Produtos: {e}")
+            logger.error("Exceção ao consultar a API de Produtos: %s", e)
             return None
 
-    def consultar_produto_por_id(self, product_id):
+    async def consultar_produto_por_id(self, product_id):
         try:
             url = f"{CONFIG.API_BASE_URL}/produto/{product_id}"
-            print(f"Consultando produto por ID: {url}")
+            logger.debug("Consultando produto por ID: %s", url)
             
             # Adicionar headers apropriados
             headers = {
@@ -46,16 +49,41 @@ class ProductAPI:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"Produto encontrado: {json.dumps(result, indent=2)}")
+                logger.debug("Produto encontrado: %s", Payload(result))
                 return result
             else:
-                print(f"Erro na API: {response.text}")
+                logger.warning("Erro na API (%s): %s", response.status_code, Payload(response.text))
                 return None
         except Exception as e:
-            print(f"Exceção ao consultar produto por ID: {e}")
+            logger.error("Exceção ao consultar produto por ID: %s", e)
             return None
+
+    async def consultar_produtos_por_ids(self, product_ids):
+        """Busca vários produtos numa única chamada (POST /produto/batch). Retorna {id: produto ou None}"""
+        try:
+            url = f"{CONFIG.API_BASE_URL}/produto/batch"
+            data = {"ids": list(product_ids)}
+            logger.debug("Consultando %d produtos em lote: %s", len(data['ids']), url)
+            
+            headers = {
+                'User-Agent': 'IBMEC-Bot/1.0',
+                'Accept': 'application/json',
+                'Content-Type': 'application/json'
+            }
+            
+            response = await requisitar("POST", url, json=data, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
+            
+            if response.status_code == 200:
+                return {item["id"]: item["produto"] for item in response.json()}
+            else:
+                logger.warning("Erro na API (%s): %s", response.status_code, Payload(response.text))
+                return {}
+        except Exception as e:
+            logger.error("Exceção ao consultar produtos em lote: %s", e)
+            return {}
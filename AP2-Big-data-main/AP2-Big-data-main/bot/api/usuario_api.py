@@ -1,20 +1,23 @@
-import requests
-import json
+import logging
 import re
 from config import DefaultConfig
+from api.http_client import requisitar
+from helpers.registro import Payload
 
 CONFIG = DefaultConfig()
 
+logger = logging.getLogger(__name__)
+
 class UsuarioAPI():
-    def buscar_usuario_por_cpf(self, cpf):
+    async def buscar_usuario_por_cpf(self, cpf):
         """
-        Busca usuário por CPF
+        Busca usuário por CPF (consulta indexada no backend)
         """
         try:
             # Limpar CPF (remover pontos, traços e espaços)
             cpf_limpo = re.sub(r'[^\d]', '', cpf)
             
-            url = f"{CONFIG.API_BASE_URL}/usuario"
+            url = f"{CONFIG.API_BASE_URL}/usuario/cpf/{cpf_limpo}"
             
             headers = {
                 'User-Agent': 'IBMEC-Bot/1.0',
@@ -22,33 +25,25 @@ class UsuarioAPI():
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code busca usuários: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s na busca de usuário por CPF", response.status_code)
             
             if response.status_code == 200:
-                usuarios = response.json()
-                
-                # Buscar usuário com CPF correspondente
-                for usuario in usuarios:
-                    usuario_cpf = usuario.get('cpf', '')
-                    if usuario_cpf:
-                        # Limpar CPF do usuário também
-                        usuario_cpf_limpo = re.sub(r'[^\d]', '', usuario_cpf)
-                        if usuario_cpf_limpo == cpf_limpo:
-                            print(f"Usuário encontrado por CPF: {usuario.get('nome')}")
-                            return usuario
-                
-                print(f"Nenhum usuário encontrado com CPF: {cpf}")
+                usuario = response.json()
+                logger.debug("Usuário encontrado por CPF: %s", usuario.get('id'))
+                return usuario
+            elif response.status_code == 404:
+                logger.info("Nenhum usuário encontrado com o CPF informado")
                 return None
             else:
-                print(f"Erro ao buscar usuários: {response.text}")
+                logger.warning("Erro ao buscar usuário por CPF (%s): %s", response.status_code, Payload(response.text))
                 return None
                 
         except Exception as e:
-            print(f"Exceção ao buscar usuário por CPF: {e}")
+            logger.error("Exceção ao buscar usuário por CPF: %s", e)
             return None
     
-    def buscar_usuario_por_id(self, usuario_id):
+    async def buscar_usuario_por_id(self, usuario_id):
         """
         Busca usuário por ID
         """
@@ -61,19 +56,19 @@ class UsuarioAPI():
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
-            print(f"Status code busca usuário por ID: {response.status_code}")
+            response = await requisitar("GET", url, headers=headers)
+            logger.debug("Status %s em %s", response.status_code, url)
             
             if response.status_code == 200:
                 usuario = response.json()
-                print(f"Usuário encontrado: {usuario.get('nome')}")
+                logger.debug("Usuário %s encontrado", usuario_id)
                 return usuario
             else:
-                print(f"Erro ao buscar usuário por ID: {response.text}")
+                logger.warning("Erro ao buscar usuário por ID (%s): %s", response.status_code, Payload(response.text))
                 return None
                 
         except Exception as e:
-            print(f"Exceção ao buscar usuário por ID: {e}")
+            logger.error("Exceção ao buscar usuário por ID: %s", e)
             return None
 
     def validar_cpf(self, cpf):
@@ -16,18 +16,49 @@ from botbuilder.core.integration import aiohttp_error_middleware
 from botbuilder.schema import Activity, ActivityTypes
 
 from config import DefaultConfig
+from api.http_client import iniciar_sessao, encerrar_sessao
+from helpers.rastreamento import rastreador
+from helpers.registro import configurar_logging, encerrar_logging
+from helpers.saude import monitor_saude
+from storage.sqlite_storage import SQLiteStorage
+from storage.expiracao import StorageComExpiracao
 from bots.dialog_bot import DialogBot
 from dialogs.main_dialog import MainDialog
 
 CONFIG = DefaultConfig()
 
+# Logs passam por uma fila; a escrita no stderr acontece numa thread separada
+configurar_logging(
+    CONFIG.LOG_NIVEL, CONFIG.LOG_FORMATO, CONFIG.LOG_PAYLOAD_MAX_CARACTERES, CONFIG.LOG_PAYLOAD_AMOSTRAGEM
+)
+rastreador.configurar(CONFIG.RASTREAMENTO_ARQUIVO, CONFIG.RASTREAMENTO_INTERVALO_EXPORTACAO)
+monitor_saude.configurar(
+    {"matricula": CONFIG.MATRICULA_API_BASE_URL, "api": CONFIG.API_BASE_URL},
+    intervalo=CONFIG.SAUDE_INTERVALO_SEGUNDOS,
+    intervalo_indisponivel=CONFIG.SAUDE_INTERVALO_INDISPONIVEL,
+    timeout=CONFIG.SAUDE_TIMEOUT_SEGUNDOS,
+    falhas_para_indisponivel=CONFIG.SAUDE_FALHAS_PARA_INDISPONIVEL,
+)
+
 # Create adapter.
 # See https://aka.ms/about-bot-adapter to learn more about how bots work.
 SETTINGS = BotFrameworkAdapterSettings(CONFIG.APP_ID, CONFIG.APP_PASSWORD)
 ADAPTER = BotFrameworkAdapter(SETTINGS)
 
-# Create MemoryStorage, UserState and ConversationState
-MEMORY = MemoryStorage()
+# Create Storage, UserState and ConversationState
+if CONFIG.BOT_STORAGE == "sqlite":
+    ARMAZENAMENTO = SQLiteStorage(CONFIG.BOT_STORAGE_SQLITE)
+else:
+    ARMAZENAMENTO = MemoryStorage()
+
+# Estados ociosos expiram e o total guardado é limitado (LRU)
+MEMORY = StorageComExpiracao(
+    ARMAZENAMENTO,
+    ttl_segundos=CONFIG.BOT_ESTADO_TTL_SEGUNDOS,
+    max_chaves=CONFIG.BOT_ESTADO_MAX_CHAVES,
+    max_bytes=CONFIG.BOT_ESTADO_MAX_BYTES,
+    intervalo_limpeza=CONFIG.BOT_ESTADO_INTERVALO_LIMPEZA,
+)
 CONVERSATION_STATE = ConversationState(MEMORY)
 USER_STATE = UserState(MEMORY)
 
@@ -82,8 +113,41 @@ async def messages(req: Request) -> Response:
     return Response(status=201)
 
 
+# Contadores do estado guardado (conversas ativas, remoções por TTL e por limite)
+async def estado(req: Request) -> Response:
+    return json_response(MEMORY.estatisticas())
+
+
+# Estado dos backends visto pelo monitor de saúde
+async def saude(req: Request) -> Response:
+    return json_response(monitor_saude.estado())
+
+
+# Histogramas de duração dos passos de diálogo e das chamadas HTTP (Prometheus; ?formato=json para resumo)
+async def metrics(req: Request) -> Response:
+    if req.query.get("formato") == "json":
+        return json_response(rastreador.histogramas())
+    return Response(text=rastreador.prometheus(), content_type="text/plain", charset="utf-8")
+
+
 APP = web.Application(middlewares=[aiohttp_error_middleware])
 APP.router.add_post("/api/messages", messages)
+APP.router.add_get("/api/estado", estado)
+APP.router.add_get("/api/saude", saude)
+APP.router.add_get("/metrics", metrics)
+APP.on_startup.append(iniciar_sessao)
+APP.on_startup.append(MEMORY.iniciar_limpeza)
+APP.on_startup.append(DIALOG.observador_faq.iniciar)
+APP.on_startup.append(rastreador.iniciar_exportacao)
+APP.on_startup.append(monitor_saude.iniciar)
+APP.on_cleanup.append(MEMORY.parar_limpeza)
+APP.on_cleanup.append(DIALOG.observador_faq.parar)
+APP.on_cleanup.append(rastreador.parar_exportacao)
+APP.on_cleanup.append(monitor_saude.parar)
+APP.on_cleanup.append(encerrar_sessao)
+if isinstance(ARMAZENAMENTO, SQLiteStorage):
+    APP.on_cleanup.append(ARMAZENAMENTO.fechar)
+APP.on_cleanup.append(encerrar_logging)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,110 @@
+"""Benchmark da busca no FAQ com uma base sintética grande.
+
+Compara o índice TF-IDF (helpers/faq.py) com a busca sequencial antiga (primeira pergunta
+com alguma palavra em comum) em tempo de montagem, latência por consulta e acerto.
+
+Uso (a partir da pasta bot):
+    python benchmark_faq.py [--entradas 10000] [--consultas 1000]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from helpers.faq import BaseFAQ
+from helpers.palavras_chave import normalizar
+
+RADICAIS = [
+    "matricula", "boleto", "mensalidade", "calendario", "horario", "secretaria", "biblioteca",
+    "estagio", "diploma", "historico", "transferencia", "bolsa", "desconto", "prova", "nota",
+    "frequencia", "disciplina", "professor", "coordenacao", "laboratorio", "vestibular", "curso",
+    "engenharia", "direito", "medicina", "administracao", "tecnologia", "campus", "estacionamento",
+    "carteirinha", "certificado", "declaracao", "rematricula", "trancamento", "cancelamento",
+    "monitoria", "intercambio", "extensao", "pesquisa", "formatura", "colacao", "atividade",
+    "complementar", "portal", "senha", "email", "wifi", "restaurante", "ouvidoria", "financeiro",
+]
+SUFIXOS = ["", "s", "al", "ario", "ica", "ista"]
+INICIOS = ["como", "qual", "onde", "quando", "quais", "posso", "preciso", "existe"]
+
+
+def gerar_faq(entradas, semente=42):
+    """FAQ sintética: cada pergunta combina 3 a 5 termos diferentes"""
+    aleatorio = random.Random(semente)
+    termos = [radical + sufixo for radical in RADICAIS for sufixo in SUFIXOS]
+    faq = {}
+    while len(faq) < entradas:
+        palavras = aleatorio.sample(termos, aleatorio.randint(3, 5))
+        pergunta = f"{aleatorio.choice(INICIOS)} {' '.join(palavras)}?"
+        faq.setdefault(pergunta, f"resposta {len(faq)}")
+    return faq
+
+
+def perturbar(pergunta, aleatorio):
+    """Consulta parecida com a pergunta: perde uma palavra, troca a ordem e tem um erro de digitação"""
+    palavras = normalizar(pergunta).split()[1:]
+    if len(palavras) > 2:
+        palavras.pop(aleatorio.randrange(len(palavras)))
+    aleatorio.shuffle(palavras)
+    alvo = aleatorio.randrange(len(palavras))
+    palavra = palavras[alvo]
+    if len(palavra) > 4:
+        posicao = aleatorio.randrange(1, len(palavra) - 1)
+        palavras[alvo] = palavra[:posicao] + palavra[posicao + 1:]
+    return " ".join(palavras)
+
+
+def busca_sequencial(faq, mensagem):
+    """Busca anterior: primeira pergunta (na ordem do arquivo) com alguma palavra na mensagem"""
+    for pergunta, resposta in faq.items():
+        palavras = [palavra for palavra in pergunta.lower().split()
+                    if len(palavra) > 3 and palavra not in ['qual', 'como', 'quais', 'onde', 'quando']]
+        if any(palavra in mensagem for palavra in palavras):
+            return resposta
+    return None
+
+
+def percentis(tempos):
+    tempos = sorted(tempos)
+    return {p: tempos[min(len(tempos) - 1, int(len(tempos) * p / 100))] * 1000 for p in (50, 95, 99)}
+
+
+def medir(nome, buscar, consultas):
+    tempos, acertos = [], 0
+    for consulta, esperada in consultas:
+        inicio = time.perf_counter()
+        resposta = buscar(consulta)
+        tempos.append(time.perf_counter() - inicio)
+        acertos += resposta == esperada
+    p = percentis(tempos)
+    print(f"{nome:<22} p50={p[50]:.3f}ms p95={p[95]:.3f}ms p99={p[99]:.3f}ms "
+          f"media={statistics.mean(tempos) * 1000:.3f}ms acerto={acertos / len(consultas):.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entradas", type=int, default=10000)
+    parser.add_argument("--consultas", type=int, default=1000)
+    args = parser.parse_args()
+
+    faq = gerar_faq(args.entradas)
+    aleatorio = random.Random(7)
+    perguntas = aleatorio.sample(list(faq), min(args.consultas, len(faq)))
+    consultas = [(perturbar(pergunta, aleatorio), faq[pergunta]) for pergunta in perguntas]
+
+    inicio = time.perf_counter()
+    base = BaseFAQ(faq)
+    montagem = time.perf_counter() - inicio
+    print(f"FAQ sintética: {len(faq)} perguntas, {len(base.indice.vocabulario)} n-gramas, "
+          f"índice montado em {montagem:.2f}s")
+
+    medir("TF-IDF (top-1)", lambda consulta: base.classificar(consulta)[1], consultas)
+    medir("sequencial (anterior)", lambda consulta: busca_sequencial(faq, consulta), consultas)
+
+    acertos_top3 = sum(
+        esperada in [resposta for resposta, _ in base.buscar(consulta, k=3)] for consulta, esperada in consultas
+    )
+    print(f"TF-IDF acerto no top-3: {acertos_top3 / len(consultas):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Micro-benchmark do custo de despacho de um turno (sem rede e sem backend).
+
+Mede o CPU por turno do caminho on_message_activity -> DialogHelper.run_dialog -> gravação do
+estado, com um TurnContext falso e MemoryStorage, comparando:
+  - por_turno: cria o acessor e o DialogSet a cada turno (comportamento anterior)
+  - reutilizado: acessor e DialogSet montados uma vez no DialogBot
+
+Uso (a partir da pasta bot):
+    python benchmark_turno.py [--turnos 5000] [--rodadas 9] [--dialogo trivial|main]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from botbuilder.core import BotAdapter, ConversationState, MemoryStorage, TurnContext, UserState
+from botbuilder.dialogs import Dialog, DialogTurnResult, DialogTurnStatus
+from botbuilder.schema import Activity, ActivityTypes, ChannelAccount, ConversationAccount, ResourceResponse
+
+from bots.dialog_bot import DialogBot
+from helpers.dialog_helper import DialogHelper
+
+
+class AdaptadorFalso(BotAdapter):
+    """Adaptador que descarta as respostas: isola o custo do despacho"""
+
+    async def send_activities(self, context, activities):
+        return [ResourceResponse(id="") for _ in activities]
+
+    async def update_activity(self, context, activity):
+        pass
+
+    async def delete_activity(self, context, reference):
+        pass
+
+
+class DialogoTrivial(Dialog):
+    """Encerra no mesmo turno: o custo medido é só o do despacho e do estado"""
+
+    def __init__(self):
+        super(DialogoTrivial, self).__init__(DialogoTrivial.__name__)
+
+    async def begin_dialog(self, dialog_context, options=None):
+        return DialogTurnResult(DialogTurnStatus.Complete)
+
+
+class DialogBotPorTurno(DialogBot):
+    """Como era antes: acessor e DialogSet recriados a cada mensagem"""
+
+    async def on_message_activity(self, turn_context: TurnContext):
+        await DialogHelper.run_dialog(
+            self.dialog,
+            turn_context,
+            self.conversation_state.create_property("DialogState"),
+        )
+
+
+def criar_atividade(numero, conversas):
+    conversa = f"conversa-{numero % conversas}"
+    return Activity(
+        type=ActivityTypes.message,
+        text="como emitir boleto?",
+        channel_id="benchmark",
+        conversation=ConversationAccount(id=conversa),
+        from_property=ChannelAccount(id=f"usuario-{conversa}"),
+        recipient=ChannelAccount(id="bot"),
+        service_url="http://localhost",
+    )
+
+
+async def preparar(classe_bot, criar_dialogo, conversas):
+    storage = MemoryStorage()
+    conversation_state, user_state = ConversationState(storage), UserState(storage)
+    bot = classe_bot(conversation_state, user_state, criar_dialogo(user_state))
+    adaptador = AdaptadorFalso()
+
+    # Aquecimento: primeiro turno de cada conversa cria o estado
+    for numero in range(conversas):
+        await bot.on_turn(TurnContext(adaptador, criar_atividade(numero, conversas)))
+    return bot, adaptador
+
+
+async def medir(bot, adaptador, turnos, conversas):
+    """CPU por turno (segundos) de uma rodada"""
+    inicio_cpu = time.process_time()
+    for numero in range(turnos):
+        await bot.on_turn(TurnContext(adaptador, criar_atividade(numero, conversas)))
+    return (time.process_time() - inicio_cpu) / turnos
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turnos", type=int, default=5000, help="turnos por rodada de cada variante")
+    parser.add_argument("--rodadas", type=int, default=9)
+    parser.add_argument("--conversas", type=int, default=100)
+    parser.add_argument("--dialogo", choices=["trivial", "main"], default="trivial")
+    args = parser.parse_args()
+
+    if args.dialogo == "main":
+        from dialogs.main_dialog import MainDialog
+        criar_dialogo = MainDialog
+    else:
+        criar_dialogo = lambda user_state: DialogoTrivial()
+
+    variantes = {
+        "por_turno": await preparar(DialogBotPorTurno, criar_dialogo, args.conversas),
+        "reutilizado": await preparar(DialogBot, criar_dialogo, args.conversas),
+    }
+    print(f"{args.rodadas} rodadas x {args.turnos} turnos por variante, {args.conversas} conversas, "
+          f"diálogo {args.dialogo}")
+
+    # As variantes se alternam (e a ordem se inverte a cada rodada) para que aquecimento,
+    # GC e ruído da máquina não favoreçam uma delas
+    tempos = {nome: [] for nome in variantes}
+    reducoes = []
+    for rodada in range(args.rodadas):
+        ordem = list(variantes) if rodada % 2 == 0 else list(reversed(list(variantes)))
+        resultado = {}
+        for nome in ordem:
+            resultado[nome] = await medir(*variantes[nome], args.turnos, args.conversas)
+            tempos[nome].append(resultado[nome])
+        reducoes.append(1 - resultado["reutilizado"] / resultado["por_turno"])
+
+    for nome, valores in tempos.items():
+        print(f"{nome:<12} mediana {statistics.median(valores) * 1e6:8.1f} µs de CPU/turno  "
+              f"(min {min(valores) * 1e6:.1f}, max {max(valores) * 1e6:.1f})")
+    print(f"redução (mediana das rodadas): {statistics.median(reducoes):.1%}  "
+          f"(min {min(reducoes):.1%}, max {max(reducoes):.1%})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 from botbuilder.core import ActivityHandler, ConversationState, TurnContext, UserState, MessageFactory
 from botbuilder.dialogs import Dialog
 from helpers.dialog_helper import DialogHelper
+from helpers.rastreamento import definir_conversa
 
 
 class DialogBot(ActivityHandler):
@@ -25,18 +26,43 @@ class DialogBot(ActivityHandler):
         self.user_state = user_state
         self.dialog = dialog
 
+        # Acessor e DialogSet montados uma vez e reutilizados em todos os turnos
+        self.dialog_state = self.conversation_state.create_property("DialogState")
+        self.dialog_set = DialogHelper.create_dialog_set(self.dialog, self.dialog_state)
+
     async def on_turn(self, turn_context: TurnContext):
+        # Spans dos passos e das chamadas HTTP deste turno levam o id da conversa
+        definir_conversa(turn_context.activity.conversation.id if turn_context.activity.conversation else None)
         await super().on_turn(turn_context)
 
         # Save any state changes that might have ocurred during the turn.
-        await self.conversation_state.save_changes(turn_context)
-        await self.user_state.save_changes(turn_context)
+        await self._salvar_estados(turn_context)
+
+    async def _salvar_estados(self, turn_context: TurnContext):
+        """Grava apenas os escopos que mudaram no turno, numa única chamada por storage"""
+        alteracoes_por_storage = {}
+        for estado in (self.conversation_state, self.user_state):
+            cache = estado.get_cached_state(turn_context)
+            # is_changed compara o hash do estado serializado com o de quando foi lido
+            if cache is None or not cache.is_changed:
+                continue
+            # BotState não expõe o storage; os dois escopos normalmente compartilham o mesmo
+            storage = estado._storage
+            alteracoes, caches = alteracoes_por_storage.setdefault(id(storage), (storage, ({}, [])))[1]
+            alteracoes[estado.get_storage_key(turn_context)] = cache.state
+            caches.append(cache)
+
+        for storage, (alteracoes, caches) in alteracoes_por_storage.values():
+            await storage.write(alteracoes)
+            for cache in caches:
+                cache.hash = cache.compute_hash(cache.state)
 
     async def on_message_activity(self, turn_context: TurnContext):
         await DialogHelper.run_dialog(
             self.dialog,
             turn_context,
-            self.conversation_state.create_property("DialogState"),
+            self.dialog_state,
+            self.dialog_set,
         )
 
     async def on_members_added_activity(self, members_added, turn_context: TurnContext):
@@ -49,5 +75,6 @@ class DialogBot(ActivityHandler):
                 await DialogHelper.run_dialog(
                     self.dialog,
                     turn_context,
-                    self.conversation_state.create_property("DialogState"),
+                    self.dialog_state,
+                    self.dialog_set,
                 )
\ No newline at end of file
@@ -8,4 +8,58 @@ class DefaultConfig:
     APP_PASSWORD = os.environ.get("MicrosoftAppPassword", "")
     
     # URL da API hospedada no Azure
-    API_BASE_URL = "https://ibmecmall-bmb0dne6d5ebbmg6.eastus-01.azurewebsites.net"
+    API_BASE_URL = os.environ.get("API_BASE_URL", "https://ibmecmall-bmb0dne6d5ebbmg6.eastus-01.azurewebsites.net")
+
+    # Backend Flask local que recebe as matrículas
+    MATRICULA_API_BASE_URL = os.environ.get("MATRICULA_API_BASE_URL", "http://localhost:8080")
+
+    # Sessão HTTP compartilhada (aiohttp) usada pelas classes de API
+    API_TIMEOUT_SEGUNDOS = int(os.environ.get("API_TIMEOUT_SEGUNDOS", 30))
+    API_POOL_CONEXOES = int(os.environ.get("API_POOL_CONEXOES", 100))
+    API_POOL_CONEXOES_POR_HOST = int(os.environ.get("API_POOL_CONEXOES_POR_HOST", 30))
+
+    # Extrato do cartão: consultas de produto em paralelo e cards por carrossel
+    EXTRATO_CONSULTAS_SIMULTANEAS = int(os.environ.get("EXTRATO_CONSULTAS_SIMULTANEAS", 8))
+    EXTRATO_CARDS_POR_CARROSSEL = int(os.environ.get("EXTRATO_CARDS_POR_CARROSSEL", 10))
+
+    # Máximo de IDs por chamada a POST /produto/batch (igual ao limite do backend)
+    PRODUTO_LOTE_MAXIMO = int(os.environ.get("PRODUTO_LOTE_MAXIMO", 100))
+
+    # Armazenamento do estado das conversas: "sqlite" (durável, compartilhado entre processos) ou "memory".
+    # O arquivo padrão fica em bot/data, ignorado pelo git (bot/.gitignore): contém dados dos usuários
+    BOT_STORAGE = os.environ.get("BOT_STORAGE", "sqlite")
+    BOT_STORAGE_SQLITE = os.environ.get(
+        "BOT_STORAGE_SQLITE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "estado_bot.db")
+    )
+
+    # Remoção de estados ociosos e limite do estado guardado (LRU)
+    BOT_ESTADO_TTL_SEGUNDOS = int(os.environ.get("BOT_ESTADO_TTL_SEGUNDOS", 30 * 60))
+    BOT_ESTADO_MAX_CHAVES = int(os.environ.get("BOT_ESTADO_MAX_CHAVES", 10000))
+    BOT_ESTADO_MAX_BYTES = int(os.environ.get("BOT_ESTADO_MAX_BYTES", 64 * 1024 * 1024))
+    BOT_ESTADO_INTERVALO_LIMPEZA = int(os.environ.get("BOT_ESTADO_INTERVALO_LIMPEZA", 60))
+
+    # Similaridade mínima (0 a 1) para responder com uma pergunta do FAQ; abaixo disso, mensagem padrão
+    FAQ_LIMIAR_SIMILARIDADE = float(os.environ.get("FAQ_LIMIAR_SIMILARIDADE", 0.4))
+    # Intervalo (segundos) entre verificações de alteração do faq.json; 0 desativa a recarga
+    FAQ_INTERVALO_RECARGA = float(os.environ.get("FAQ_INTERVALO_RECARGA", 5))
+
+    # Spans dos passos de diálogo e das chamadas HTTP: arquivo JSON Lines (vazio desativa a gravação)
+    RASTREAMENTO_ARQUIVO = os.environ.get("RASTREAMENTO_ARQUIVO", "")
+    RASTREAMENTO_INTERVALO_EXPORTACAO = int(os.environ.get("RASTREAMENTO_INTERVALO_EXPORTACAO", 5))
+
+    # Logs: nível, formato ("texto" ou "json"), tamanho máximo dos payloads e fração dos
+    # registros com payload que são gravados (1.0 grava todos)
+    LOG_NIVEL = os.environ.get("LOG_NIVEL", "INFO")
+    LOG_FORMATO = os.environ.get("LOG_FORMATO", "texto")
+    LOG_PAYLOAD_MAX_CARACTERES = int(os.environ.get("LOG_PAYLOAD_MAX_CARACTERES", 500))
+    LOG_PAYLOAD_AMOSTRAGEM = float(os.environ.get("LOG_PAYLOAD_AMOSTRAGEM", 0.1))
+
+    # Monitor de saúde dos backends: sondagem (GET /healthz) quando não houve chamada bem-sucedida
+    # no intervalo, intervalo menor enquanto indisponível e falhas seguidas para marcar indisponível
+    SAUDE_INTERVALO_SEGUNDOS = float(os.environ.get("SAUDE_INTERVALO_SEGUNDOS", 10))
+    SAUDE_INTERVALO_INDISPONIVEL = float(os.environ.get("SAUDE_INTERVALO_INDISPONIVEL", 2))
+    SAUDE_TIMEOUT_SEGUNDOS = float(os.environ.get("SAUDE_TIMEOUT_SEGUNDOS", 2))
+    SAUDE_FALHAS_PARA_INDISPONIVEL = int(os.environ.get("SAUDE_FALHAS_PARA_INDISPONIVEL", 2))
+
+    # Tentativas de autorização em caso de timeout/erro de conexão (mesma Idempotency-Key)
+    API_TENTATIVAS_AUTORIZACAO = int(os.environ.get("API_TENTATIVAS_AUTORIZACAO", 3))
@@ -1,4 +1,4 @@
-from botbuilder.dialogs import ComponentDialog, WaterfallDialog, WaterfallStepContext
+from botbuilder.dialogs import ComponentDialog, WaterfallStepContext
 from botbuilder.core import MessageFactory, UserState, CardFactory
 from botbuilder.dialogs.prompts import TextPrompt, PromptOptions
 from botbuilder.dialogs import DialogTurnResult
@@ -9,9 +9,10 @@ from botbuilder.schema import (
     CardImage,
 )
 import re
+import uuid
 from datetime import datetime, date
-from api.product_api import ProductAPI
 from api.order_api import OrderAPI
+from helpers.rastreamento import WaterfallRastreado
 from api.usuario_api import UsuarioAPI
 from api.cartao_api import CartaoAPI
 
@@ -26,7 +27,7 @@ class ComprarProdutoDialog(ComponentDialog):
         self.add_dialog(TextPrompt("cvvPrompt"))
 
         self.add_dialog(
-            WaterfallDialog(
+            WaterfallRastreado(
                 "comprarProdutoWaterfall",
                 [
                     self.cpf_cliente_step,
@@ -66,7 +67,7 @@ class ComprarProdutoDialog(ComponentDialog):
             return await step_context.replace_dialog("comprarProdutoWaterfall", step_context.options)
         
         # Buscar usuário pelo CPF
-        usuario = usuario_api.buscar_usuario_por_cpf(cpf_cliente)
+        usuario = await usuario_api.buscar_usuario_por_cpf(cpf_cliente)
         
         if not usuario:
             await step_context.context.send_activity(
@@ -128,7 +129,7 @@ class ComprarProdutoDialog(ComponentDialog):
         
         # Buscar o cartão para verificar se o nome impresso confere
         cartao_api = CartaoAPI()
-        cartao_cadastrado = cartao_api.consultar_cartao_por_numero(numero_cartao)
+        cartao_cadastrado = await cartao_api.consultar_cartao_por_numero(numero_cartao)
         
         if cartao_cadastrado:
             nome_cadastrado = cartao_cadastrado.get('nome_impresso', '').strip()
@@ -211,83 +212,26 @@ class ComprarProdutoDialog(ComponentDialog):
         )
         
         try:
-            # 1. Buscar dados do produto
-            produto_api = ProductAPI()
-            produto = produto_api.consultar_produto_por_id(product_id)
-            
-            if not produto:
-                await step_context.context.send_activity(
-                    MessageFactory.text("Erro: Produto não encontrado. Tente novamente.")
-                )
-                return await step_context.replace_dialog("WaterfallDialog")
-            
-            if isinstance(produto, dict):
-                valor_produto = produto["preco"]
-                nome_produto = produto["nome"]
-                produto_id = produto.get("id", product_id)  # ID obrigatório do produto
-            else:
-                await step_context.context.send_activity(
-                    MessageFactory.text("Erro: Não foi possível obter informações do produto.")
-                )
-                return await step_context.replace_dialog("WaterfallDialog")
-            
-            # 2. Buscar dados do cartão para obter o ID obrigatório
-            cartao_api = CartaoAPI()
-            cartao_dados = cartao_api.consultar_cartao_por_numero(numero_cartao)
-            
-            if not cartao_dados or not isinstance(cartao_dados, dict):
-                await step_context.context.send_activity(
-                    MessageFactory.text("Erro: Não foi possível obter dados do cartão. Tente novamente.")
-                )
-                return await step_context.replace_dialog("WaterfallDialog")
-            
-            cartao_id = cartao_dados.get("id")
-            if not cartao_id:
-                await step_context.context.send_activity(
-                    MessageFactory.text("Erro: ID do cartão não encontrado. Tente novamente.")
-                )
-                return await step_context.replace_dialog("WaterfallDialog")
-            
-            print(f"IDs obrigatórios - Produto: {produto_id}, Cartão: {cartao_id}")
-            
-            # 3. Autorizar transação usando o ID do usuário encontrado
+            # Uma única chamada: o backend valida o cartão, debita o preço do produto e registra
+            # o pedido na mesma transação. Uma chave por tentativa de compra evita débito duplicado.
             order_api = OrderAPI()
-            
-            resultado_transacao = order_api.autorizar_transacao(
-                usuario_id, numero_cartao, data_expiracao, cvv, valor_produto
+            chave_idempotencia = str(uuid.uuid4())
+            resultado = await order_api.finalizar_compra(
+                usuario_id, product_id, numero_cartao, data_expiracao, cvv, chave_idempotencia
             )
             
-            if not resultado_transacao or resultado_transacao.get("status") != "AUTHORIZED":
-                mensagem_erro = resultado_transacao.get("message", "Transação não autorizada") if resultado_transacao else "Erro na comunicação com o banco"
+            if not resultado or resultado.get("status") != "AUTHORIZED":
+                mensagem_erro = resultado.get("message", "Transação não autorizada") if resultado else "Erro na comunicação com o banco"
                 await step_context.context.send_activity(
                     MessageFactory.text(f"Pagamento não autorizado: {mensagem_erro}")
                 )
                 return await step_context.replace_dialog("WaterfallDialog")
             
-            # 4. Criar pedido com IDs obrigatórios do produto e cartão
-            print(f"Criando pedido com dados obrigatórios:")
-            print(f"- Cliente ID: {usuario_id}")
-            print(f"- Produto ID: {produto_id} ({nome_produto})")
-            print(f"- Cartão ID: {cartao_id}")
-            print(f"- Valor: {valor_produto}")
-            
-            resultado_pedido = order_api.criar_pedido(
-                id_produto=produto_id, 
-                id_usuario=usuario_id,  # Usa ID do usuário ao invés do nome
-                valor_total=valor_produto,
-                id_cartao=cartao_id
-            )
-            print(f"Resultado da criação do pedido: {resultado_pedido}")
-            
-            if not resultado_pedido:
-                await step_context.context.send_activity(
-                    MessageFactory.text("Erro ao registrar o pedido.")
-                )
-                return await step_context.replace_dialog("WaterfallDialog")
-            
-            # 5. Sucesso!
-            codigo_autorizacao = resultado_transacao.get("codigo_autorizacao", "N/A")
-            id_pedido = resultado_pedido.get("id_pedido", "N/A")
+            # Sucesso!
+            codigo_autorizacao = resultado.get("codigo_autorizacao", "N/A")
+            id_pedido = resultado.get("id_pedido", "N/A")
+            nome_produto = resultado.get("nome_produto", "N/A")
+            valor_produto = resultado.get("valor_total", 0)
             data_compra = datetime.now().strftime("%d/%m/%Y às %H:%M")
             
             
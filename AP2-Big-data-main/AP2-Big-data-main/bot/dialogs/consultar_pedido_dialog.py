@@ -1,8 +1,9 @@
-from botbuilder.dialogs import ComponentDialog, WaterfallDialog, WaterfallStepContext
+from botbuilder.dialogs import ComponentDialog, WaterfallStepContext
 from botbuilder.core import MessageFactory, CardFactory
 from botbuilder.dialogs.prompts import TextPrompt, PromptOptions
 from botbuilder.schema import HeroCard, CardImage, CardAction, ActionTypes
 from api.order_api import OrderAPI
+from helpers.rastreamento import WaterfallRastreado
 from api.product_api import ProductAPI
 
 
@@ -15,7 +16,7 @@ class ConsultarPedidoDialog(ComponentDialog):
         self.add_dialog(TextPrompt("namePrompt"))
 
         self.add_dialog(
-            WaterfallDialog(
+            WaterfallRastreado(
                 "consultarPedidoWaterfallDialog",
                 [
                     self.prompt_user_name_step,
@@ -34,7 +35,7 @@ class ConsultarPedidoDialog(ComponentDialog):
 
     async def show_orders_step(self, step_context: WaterfallStepContext):
         id_pedido = step_context.result
-        pedido_resultado = self.order_api.consultar_pedidos_por_id(id_pedido)
+        pedido_resultado = await self.order_api.consultar_pedidos_por_id(id_pedido)
 
         if pedido_resultado and isinstance(pedido_resultado, dict):
             pedido = pedido_resultado  # Já é um dict direto
@@ -45,7 +46,7 @@ class ConsultarPedidoDialog(ComponentDialog):
             
             if produto_id:
                 print(f"Buscando produto com ID: {produto_id}")
-                produto = self.product_api.consultar_produto_por_id(produto_id)
+                produto = await self.product_api.consultar_produto_por_id(produto_id)
                 
                 if produto and isinstance(produto, dict):
                     print(f"Produto encontrado: {produto.get('nome', 'N/A')}")
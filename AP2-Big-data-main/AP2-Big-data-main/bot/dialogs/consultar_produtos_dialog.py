@@ -1,9 +1,10 @@
-from botbuilder.dialogs import ComponentDialog, WaterfallDialog, WaterfallStepContext, ChoicePrompt, DialogTurnResult, DialogTurnStatus
+from botbuilder.dialogs import ComponentDialog, WaterfallStepContext, ChoicePrompt, DialogTurnResult, DialogTurnStatus
 from botbuilder.dialogs.choices import Choice
 from botbuilder.core import MessageFactory, CardFactory, UserState
 from botbuilder.dialogs.prompts import TextPrompt, PromptOptions
 from botbuilder.schema import HeroCard, CardImage, CardAction, ActionTypes
 from api.product_api import ProductAPI
+from helpers.rastreamento import WaterfallRastreado
 from dialogs.comprar_produto_dialog import ComprarProdutoDialog
 
 
@@ -19,7 +20,7 @@ class ConsultarProdutoDialog(ComponentDialog):
         self.add_dialog(ComprarProdutoDialog(user_state))
 
         self.add_dialog(
-            WaterfallDialog(
+            WaterfallRastreado(
                 "consultarProdutoWaterfallDialog",
                 [
                     self.product_name_step,
@@ -41,7 +42,7 @@ class ConsultarProdutoDialog(ComponentDialog):
         product_name = step_context.result
         step_context.values["produto_nome"] = product_name
 
-        produto = self.product_api.consultar_produtos(product_name)
+        produto = await self.product_api.consultar_produtos(product_name)
 
         if produto:
             # Salvar produto nos values para usar depois
@@ -1,13 +1,18 @@
-from botbuilder.dialogs import ComponentDialog, WaterfallDialog, WaterfallStepContext
+from botbuilder.dialogs import ComponentDialog, WaterfallStepContext
 from botbuilder.core import MessageFactory, CardFactory
 from botbuilder.dialogs.prompts import TextPrompt, PromptOptions
 from botbuilder.schema import HeroCard, CardImage
 from api.cartao_api import CartaoAPI
+from helpers.rastreamento import WaterfallRastreado
 from api.order_api import OrderAPI
 from api.product_api import ProductAPI
+from config import DefaultConfig
 from datetime import datetime, date
+import asyncio
 import re
 
+CONFIG = DefaultConfig()
+
 class ExtratoCompraDialog(ComponentDialog):
     def __init__(self):
         super(ExtratoCompraDialog, self).__init__("ExtratoCompraDialog")
@@ -22,7 +27,7 @@ class ExtratoCompraDialog(ComponentDialog):
         self.add_dialog(TextPrompt("cvvPrompt"))
         
         self.add_dialog(
-            WaterfallDialog(
+            WaterfallRastreado(
                 "ExtratoCompraWaterfallDialog",
                 [
                     self.numero_cartao_step,
@@ -57,7 +62,7 @@ class ExtratoCompraDialog(ComponentDialog):
             return await step_context.replace_dialog("ExtratoCompraWaterfallDialog")
         
         # Buscar o cartão no sistema
-        cartao_cadastrado = self.cartao_api.consultar_cartao_por_numero(numero_cartao)
+        cartao_cadastrado = await self.cartao_api.consultar_cartao_por_numero(numero_cartao)
         
         if not cartao_cadastrado:
             await step_context.context.send_activity(
@@ -144,7 +149,7 @@ class ExtratoCompraDialog(ComponentDialog):
             return await step_context.end_dialog()
         
         # Consultar pedidos diretamente pelo ID do cartão
-        pedidos = self.order_api.consultar_pedidos_por_cartao(cartao_id)
+        pedidos = await self.order_api.consultar_pedidos_por_cartao(cartao_id)
         
         if not pedidos:
             await step_context.context.send_activity(
@@ -169,19 +174,35 @@ class ExtratoCompraDialog(ComponentDialog):
             )
         )
         
-        await step_context.context.send_activity(MessageFactory.attachment(card_resumo))
+        produtos = await self.buscar_produtos_dos_pedidos(pedidos)
+        cards = [self.criar_card_pedido(pedido, produtos.get(str(pedido.get('id_produto')))) for pedido in pedidos]
         
-        for pedido in pedidos:
-            await self.exibir_card_pedido(step_context, pedido)
+        # Resumo e pedidos (em carrosséis) saem numa única chamada ao canal
+        tamanho = CONFIG.EXTRATO_CARDS_POR_CARROSSEL
+        atividades = [MessageFactory.attachment(card_resumo)]
+        atividades.extend(MessageFactory.carousel(cards[i:i + tamanho]) for i in range(0, len(cards), tamanho))
+        await step_context.context.send_activities(atividades)
+
+    async def buscar_produtos_dos_pedidos(self, pedidos):
+        """Consulta cada produto distinto uma única vez via POST /produto/batch, em lotes de até
+        PRODUTO_LOTE_MAXIMO IDs e com um limite de lotes simultâneos"""
+        ids = list(dict.fromkeys(str(pedido['id_produto']) for pedido in pedidos if pedido.get('id_produto')))
+        tamanho = CONFIG.PRODUTO_LOTE_MAXIMO
+        limite = asyncio.Semaphore(CONFIG.EXTRATO_CONSULTAS_SIMULTANEAS)
+        
+        async def buscar(lote):
+            async with limite:
+                return await self.product_api.consultar_produtos_por_ids(lote)
+        
+        produtos = {}
+        for resultado in await asyncio.gather(*(buscar(ids[i:i + tamanho]) for i in range(0, len(ids), tamanho))):
+            produtos.update(resultado)
+        return produtos
 
-    async def exibir_card_pedido(self, step_context, pedido):
-        produto_id = pedido.get('id_produto')
+    def criar_card_pedido(self, pedido, produto):
         imagem_url = ""
-        
-        if produto_id:
-            produto = self.product_api.consultar_produto_por_id(produto_id)
-            if produto and isinstance(produto, dict):
-                imagem_url = produto.get('urlImagem', '')
+        if produto and isinstance(produto, dict):
+            imagem_url = produto.get('urlImagem', '')
         
         # Criar card do pedido
         card = CardFactory.hero_card(
@@ -193,8 +214,7 @@ class ExtratoCompraDialog(ComponentDialog):
                 images=[CardImage(url=imagem_url)] if imagem_url else []
             )
         )
-        
-        await step_context.context.send_activity(MessageFactory.attachment(card))
+        return card
 
     def validar_numero_cartao(self, numero):
         """Valida se o número do cartão tem 16 dígitos"""
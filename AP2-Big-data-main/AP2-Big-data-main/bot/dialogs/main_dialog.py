@@ -9,31 +9,79 @@ from botbuilder.dialogs import (
 )
 from botbuilder.dialogs.prompts import TextPrompt
 from botbuilder.core import MessageFactory, UserState
+from config import DefaultConfig
 from dialogs.matricula_dialog import MatriculaDialog
+from dialogs.consultar_produtos_dialog import ConsultarProdutoDialog
+from helpers.faq import BaseFAQ, ObservadorFAQ
+from helpers.registro import Payload
+from helpers.rastreamento import WaterfallRastreado
 import json
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+CONFIG = DefaultConfig()
+
+FAQ_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'faq.json')
+
+INTENCAO_MATRICULA = "matricula"
+INTENCAO_PRODUTOS = "produtos"
+
+# Comparadas sem acento: "matricula" também reconhece "matrícula"
+PALAVRAS_MATRICULA = [
+    'quero me matricular',
+    'matricula',
+    'inscrever',
+    'inscrição',
+    'fazer matricula',
+    'realizar matricula',
+    'me matricular',
+    'nova matricula',
+    'iniciar matricula'
+]
+
+# Só frases de quem quer comprar: palavras soltas como "produto" ou "loja" aparecem em
+# perguntas que devem continuar indo para o FAQ
+PALAVRAS_PRODUTOS = [
+    'quero comprar',
+    'comprar produto',
+    'comprar um produto',
+    'buscar produto',
+    'consultar produto',
+    'procurar produto'
+]
+
+# Ordem define a prioridade quando a mensagem tem palavras de mais de uma intenção
+INTENCOES = {
+    INTENCAO_MATRICULA: PALAVRAS_MATRICULA,
+    INTENCAO_PRODUTOS: PALAVRAS_PRODUTOS,
+}
+
 class MainDialog(ComponentDialog):
     def __init__(self, user_state: UserState):
         super(MainDialog, self).__init__(MainDialog.__name__)
 
         self.user_state = user_state
         
-        # Carregar FAQ do arquivo JSON
-        self.faq_data = self._carregar_faq()
+        # Carregar FAQ do arquivo JSON e montar o automato e o índice TF-IDF; alterações
+        # no arquivo são recarregadas em segundo plano (iniciar em on_startup)
+        self.observador_faq = ObservadorFAQ(
+            FAQ_PATH, self._montar_faq, self._montar_faq(self._carregar_faq()), CONFIG.FAQ_INTERVALO_RECARGA
+        )
         
         # Adicionar diálogo de matrícula
         self.add_dialog(MatriculaDialog(user_state))
         
+        # Adicionar consulta de produtos (que inclui o diálogo de compra)
+        self.add_dialog(ConsultarProdutoDialog(user_state))
+        
         # Adicionar prompt de texto
         self.add_dialog(TextPrompt(TextPrompt.__name__))
         
         # Adicionar diálogo principal
         self.add_dialog(
-            WaterfallDialog(
+            WaterfallRastreado(
                 WaterfallDialog.__name__,
                 [
                     self.processar_mensagem_step,
@@ -43,14 +91,23 @@ class MainDialog(ComponentDialog):
 
         self.initial_dialog_id = WaterfallDialog.__name__
 
+    @property
+    def faq(self) -> BaseFAQ:
+        """Versão atual do FAQ (trocada inteira a cada recarga)"""
+        return self.observador_faq.atual
+
+    @property
+    def faq_data(self) -> dict:
+        return self.faq.faq_data
+
+    @staticmethod
+    def _montar_faq(faq_data: dict) -> BaseFAQ:
+        return BaseFAQ(faq_data, INTENCOES, limiar=CONFIG.FAQ_LIMIAR_SIMILARIDADE)
+
     def _carregar_faq(self) -> dict:
         """Carregar perguntas frequentes do arquivo JSON"""
         try:
-            # Caminho relativo ao arquivo atual
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            faq_path = os.path.join(current_dir, '..', 'data', 'faq.json')
-            
-            with open(faq_path, 'r', encoding='utf-8') as file:
+            with open(FAQ_PATH, 'r', encoding='utf-8') as file:
                 return json.load(file)
         except Exception as e:
             logger.error(f"Erro ao carregar FAQ: {str(e)}")
@@ -74,14 +131,15 @@ class MainDialog(ComponentDialog):
                 user_message = ""
             
             user_message = user_message.lower().strip()
-            logger.info(f"Mensagem recebida: {user_message}")
+            logger.debug("Mensagem recebida: %s", Payload(user_message))
             
-            # Verificar se é uma solicitação de matrícula
-            if self._is_matricula_request(user_message):
+            # Intenção (automato) ou pergunta do FAQ mais parecida (TF-IDF)
+            intencao, resposta_faq = self.faq.classificar(user_message)
+            if intencao == INTENCAO_MATRICULA:
                 return await step_context.begin_dialog(MatriculaDialog.__name__)
+            if intencao == INTENCAO_PRODUTOS:
+                return await step_context.begin_dialog("ConsultarProdutoDialog")
             
-            # Verificar se é uma pergunta do FAQ
-            resposta_faq = self._buscar_resposta_faq(user_message)
             if resposta_faq:
                 await step_context.context.send_activity(MessageFactory.text(resposta_faq))
             else:
@@ -97,49 +155,6 @@ class MainDialog(ComponentDialog):
             await step_context.context.send_activity(MessageFactory.text(erro_msg))
             return await step_context.end_dialog()
 
-    def _is_matricula_request(self, message: str) -> bool:
-        """Verificar se a mensagem é uma solicitação de matrícula"""
-        palavras_matricula = [
-            'quero me matricular',
-            'matricula',
-            'matrícula',
-            'inscrever',
-            'inscrição',
-            'fazer matricula',
-            'realizar matricula',
-            'me matricular',
-            'nova matricula',
-            'iniciar matricula'
-        ]
-        
-        return any(palavra in message for palavra in palavras_matricula)
-
-    def _buscar_resposta_faq(self, message: str) -> str:
-        """Buscar resposta no FAQ baseada na mensagem do usuário"""
-        if not self.faq_data:
-            return None
-        
-        # Busca exata primeiro
-        if message in self.faq_data:
-            return self.faq_data[message]
-        
-        # Busca por palavras-chave
-        for pergunta, resposta in self.faq_data.items():
-            if self._mensagem_contem_palavras_chave(message, pergunta):
-                return resposta
-        
-        return None
-
-    def _mensagem_contem_palavras_chave(self, message: str, pergunta: str) -> bool:
-        """Verificar se a mensagem contém palavras-chave da pergunta"""
-        # Extrair palavras-chave importantes da pergunta
-        palavras_pergunta = pergunta.lower().split()
-        palavras_importantes = [palavra for palavra in palavras_pergunta 
-                              if len(palavra) > 3 and palavra not in ['qual', 'como', 'quais', 'onde', 'quando']]
-        
-        # Verificar se pelo menos uma palavra importante está na mensagem
-        return any(palavra in message for palavra in palavras_importantes)
-
     def _obter_mensagem_padrao(self) -> str:
         """Obter mensagem padrão quando não há resposta específica"""
         return """🤖 Olá! Sou o assistente virtual da nossa instituição.
@@ -156,6 +171,9 @@ Posso te ajudar com:
 🎓 Matrícula:
 • Digite "quero me matricular" para iniciar o processo
 
+🛒 Loja:
+• Digite "comprar produto" para buscar um produto e comprar
+
 💡 Exemplos de perguntas:
 • "Qual o calendário acadêmico?"
 • "Como emitir boleto?"
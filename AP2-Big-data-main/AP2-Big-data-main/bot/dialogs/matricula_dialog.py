@@ -1,19 +1,26 @@
 from botbuilder.dialogs import (
     ComponentDialog,
-    WaterfallDialog,
     WaterfallStepContext,
     DialogTurnResult,
     PromptOptions,
 )
 from botbuilder.dialogs.prompts import TextPrompt, PromptValidatorContext
 from botbuilder.core import MessageFactory, UserState
-import requests
+from api.http_client import requisitar
+from helpers.registro import Payload
+from helpers.rastreamento import WaterfallRastreado
+from helpers.saude import monitor_saude
+from config import DefaultConfig
+import asyncio
+import aiohttp
 import json
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
+CONFIG = DefaultConfig()
+
 class MatriculaDialog(ComponentDialog):
     def __init__(self, user_state: UserState):
         super(MatriculaDialog, self).__init__(MatriculaDialog.__name__)
@@ -35,7 +42,7 @@ class MatriculaDialog(ComponentDialog):
         self.add_dialog(TextPrompt("curso_prompt", self._validar_curso))
         
         self.add_dialog(
-            WaterfallDialog(
+            WaterfallRastreado(
                 "matricula_waterfall",
                 [
                     self._step_nome,
@@ -157,7 +164,7 @@ Você pode tentar novamente digitando 'quero me matricular'.
     async def _enviar_matricula(self, nome: str, email: str, curso: str) -> bool:
         """Enviar dados da matrícula para o backend"""
         try:
-            url = "http://localhost:8080/api/matriculas"
+            url = f"{CONFIG.MATRICULA_API_BASE_URL}/api/matriculas"
             dados = {
                 "nome": nome,
                 "email": email,
@@ -168,44 +175,41 @@ Você pode tentar novamente digitando 'quero me matricular'.
                 'Content-Type': 'application/json'
             }
             
-            logger.info(f"Tentando enviar matrícula para: {url}")
-            logger.info(f"Dados: {dados}")
+            logger.info("Enviando matrícula para %s", url)
+            logger.debug("Dados: %s", Payload(dados))
             
-            # Primeiro, testar se o backend está acessível
-            try:
-                test_response = requests.get("http://localhost:8080/docs", timeout=5)
-                logger.info(f"Backend acessível. Status: {test_response.status_code}")
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Backend não está acessível: {str(e)}")
+            # Estado mantido em segundo plano pelo monitor de saúde: sem chamada extra aqui
+            if not monitor_saude.disponivel("matricula"):
+                logger.error("Backend de matrículas indisponível, matrícula não enviada")
                 return False
             
             # Enviar dados da matrícula
-            response = requests.post(url, json=dados, headers=headers, timeout=10)
+            response = await requisitar("POST", url, json=dados, headers=headers, timeout=10)
             
-            logger.info(f"Resposta do backend - Status: {response.status_code}")
-            logger.info(f"Resposta do backend - Text: {response.text}")
+            logger.debug("Resposta do backend - Status: %s", response.status_code)
+            logger.debug("Resposta do backend - Text: %s", Payload(response.text))
             
             if response.status_code == 201:
-                logger.info(f"Matrícula enviada com sucesso: {nome} - {email} - {curso}")
+                logger.info("Matrícula enviada com sucesso: curso %s", curso)
                 return True
             elif response.status_code == 409:
-                logger.warning(f"Email já cadastrado: {email}")
+                logger.warning("Email já cadastrado: %s", Payload(email))
                 return False
             else:
-                logger.error(f"Erro ao enviar matrícula. Status: {response.status_code}, Response: {response.text}")
+                logger.error("Erro ao enviar matrícula. Status: %s, Response: %s", response.status_code, Payload(response.text))
                 return False
                 
-        except requests.exceptions.ConnectionError as e:
-            logger.error(f"Erro de conexão ao enviar matrícula: {str(e)}")
+        except aiohttp.ClientConnectionError as e:
+            logger.error("Erro de conexão ao enviar matrícula: %s", e)
             return False
-        except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout ao enviar matrícula: {str(e)}")
+        except asyncio.TimeoutError as e:
+            logger.error("Timeout ao enviar matrícula: %s", e)
             return False
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erro de requisição ao enviar matrícula: {str(e)}")
+        except aiohttp.ClientError as e:
+            logger.error("Erro de requisição ao enviar matrícula: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Erro inesperado ao enviar matrícula: {str(e)}")
+            logger.error("Erro inesperado ao enviar matrícula: %s", e)
             return False
     
     async def _validar_nome(self, prompt_context: PromptValidatorContext) -> bool:
@@ -4,13 +4,23 @@ from botbuilder.dialogs import Dialog, DialogSet, DialogTurnStatus
 
 class DialogHelper:
     @staticmethod
-    async def run_dialog(
-        dialog: Dialog, turn_context: TurnContext, accessor: StatePropertyAccessor
-    ):
+    def create_dialog_set(dialog: Dialog, accessor: StatePropertyAccessor) -> DialogSet:
+        """DialogSet com o diálogo raiz; não guarda estado do turno, então pode ser montado uma vez e reutilizado"""
         dialog_set = DialogSet(accessor)
         dialog_set.add(dialog)
+        return dialog_set
+
+    @staticmethod
+    async def run_dialog(
+        dialog: Dialog,
+        turn_context: TurnContext,
+        accessor: StatePropertyAccessor,
+        dialog_set: DialogSet = None,
+    ):
+        if dialog_set is None:
+            dialog_set = DialogHelper.create_dialog_set(dialog, accessor)
 
         dialog_context = await dialog_set.create_context(turn_context)
         results = await dialog_context.continue_dialog()
         if results.status == DialogTurnStatus.Empty:
-            await dialog_context.begin_dialog(dialog.id)
\ No newline at end of file
+            await dialog_context.begin_dialog(dialog.id)
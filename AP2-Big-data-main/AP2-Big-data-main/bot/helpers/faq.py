@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import os
+from collections import Counter
+
+from helpers.palavras_chave import AutomatoPalavrasChave, normalizar
+from helpers.tfidf import IndiceTFIDF
+
+logger = logging.getLogger(__name__)
+
+
+class BaseFAQ:
+    """FAQ compilada: automato com as intenções, respostas exatas e índice TF-IDF das perguntas.
+
+    As intenções (ex.: matrícula) vêm antes de qualquer pergunta do FAQ. Sem pergunta idêntica,
+    a resposta é a da pergunta mais parecida, desde que a similaridade atinja o limiar.
+    """
+
+    def __init__(self, faq_data: dict, intencoes: dict = None, limiar: float = 0.0):
+        self.faq_data = faq_data
+        self.limiar = limiar
+
+        self._automato = AutomatoPalavrasChave()
+        intencoes = intencoes or {}
+        for prioridade, (intencao, palavras) in enumerate(intencoes.items()):
+            for palavra in palavras:
+                self._automato.adicionar(palavra, intencao, prioridade)
+        self._automato.compilar()
+
+        self._exatas = {}
+        for pergunta, resposta in faq_data.items():
+            self._exatas.setdefault(normalizar(pergunta), resposta)
+        self._respostas = list(faq_data.values())
+        # Máximo de perguntas com a mesma resposta: buscar k vezes isso garante k respostas distintas
+        self._repeticao_maxima = max(Counter(self._respostas).values(), default=1)
+        self.indice = IndiceTFIDF(faq_data.keys())
+
+    def buscar(self, mensagem: str, k: int = 3) -> list:
+        """Até k respostas distintas mais parecidas com a mensagem, como (resposta, pontuação)"""
+        documentos, pontuacoes = self.indice.pontuar(mensagem, k * self._repeticao_maxima)
+        resultado, vistas = [], set()
+        for documento, pontuacao in zip(documentos, pontuacoes):
+            resposta = self._respostas[documento]
+            # Várias perguntas podem ter a mesma resposta: fica só a de maior pontuação
+            if resposta in vistas:
+                continue
+            vistas.add(resposta)
+            resultado.append((resposta, float(pontuacao)))
+            if len(resultado) == k:
+                break
+        return resultado
+
+    def classificar(self, mensagem: str):
+        """Retorna (intencao, resposta): a intenção reconhecida ou a resposta do FAQ; (None, None) se nada casar"""
+        mensagem = normalizar(mensagem)
+        intencao = self._automato.melhor(mensagem, normalizado=True)
+        if intencao is not None:
+            return intencao, None
+
+        # Pergunta idêntica a uma do FAQ tem preferência sobre a busca por similaridade
+        if mensagem in self._exatas:
+            return None, self._exatas[mensagem]
+
+        candidatos = self.buscar(mensagem, k=1)
+        if candidatos and candidatos[0][1] >= self.limiar:
+            return None, candidatos[0][0]
+        return None, None
+
+
+class ObservadorFAQ:
+    """Recarrega o faq.json quando o arquivo muda, sem reiniciar o bot.
+
+    Verifica a data de modificação (e o tamanho) a cada `intervalo` segundos. A nova BaseFAQ é
+    lida e montada num executor, fora do event loop, e só então substitui `atual` com uma
+    única atribuição: turnos em andamento continuam com a versão que já tinham. Se o arquivo
+    estiver inválido, a versão atual é mantida até a próxima alteração.
+    """
+
+    def __init__(self, caminho: str, montar, atual: BaseFAQ, intervalo: float = 5):
+        self.caminho = caminho
+        self.montar = montar
+        self.atual = atual
+        self.intervalo = intervalo
+        self.recargas = 0
+        self._assinatura = self._ler_assinatura()
+        self._tarefa = None
+
+    def _ler_assinatura(self):
+        try:
+            estado = os.stat(self.caminho)
+        except OSError:
+            return None
+        return estado.st_mtime_ns, estado.st_size
+
+    def _ler_e_montar(self) -> BaseFAQ:
+        with open(self.caminho, "r", encoding="utf-8") as arquivo:
+            return self.montar(json.load(arquivo))
+
+    async def verificar(self) -> bool:
+        """Recarrega se o arquivo mudou desde a última leitura; retorna True se trocou a versão"""
+        assinatura = self._ler_assinatura()
+        if assinatura is None or assinatura == self._assinatura:
+            return False
+        self._assinatura = assinatura
+        try:
+            nova = await asyncio.get_running_loop().run_in_executor(None, self._ler_e_montar)
+        except Exception as e:
+            logger.error(f"Erro ao recarregar FAQ, mantendo a versão atual: {str(e)}")
+            return False
+        self.atual = nova
+        self.recargas += 1
+        logger.info(f"FAQ recarregado: {len(nova.faq_data)} perguntas")
+        return True
+
+    async def _observar(self):
+        while True:
+            await asyncio.sleep(self.intervalo)
+            await self.verificar()
+
+    async def iniciar(self, app=None):
+        """Inicia a verificação periódica (registrado em on_startup)"""
+        if self._tarefa is None and self.intervalo > 0:
+            self._tarefa = asyncio.create_task(self._observar())
+
+    async def parar(self, app=None):
+        """Interrompe a verificação periódica (registrado em on_cleanup)"""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
@@ -0,0 +1,98 @@
+import re
+import unicodedata
+from collections import deque
+
+_NAO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e sem pontuação, com espaços simples ("Matrícula?" -> "matricula")"""
+    # NFKD separa os acentos das letras; o que não é ASCII é descartado
+    texto = unicodedata.normalize("NFKD", (texto or "").lower()).encode("ascii", "ignore").decode("ascii")
+    return _NAO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+class AutomatoPalavrasChave:
+    """Automato de Aho–Corasick: encontra todas as palavras-chave de um texto numa única passada.
+
+    Cada palavra-chave tem um valor e uma prioridade (menor vence). O custo da busca depende só
+    do tamanho do texto e do número de ocorrências, não da quantidade de palavras cadastradas.
+    Palavras e textos são comparados já normalizados (sem acento, minúsculos).
+    """
+
+    def __init__(self):
+        self._transicoes = [{}]
+        self._falha = [0]
+        # Por estado: (prioridade, tamanho, valor) da palavra que termina nele, se houver
+        self._palavra = [None]
+        # Próximo estado na cadeia de falhas que também termina uma palavra
+        self._saida = [0]
+        self._compilado = False
+
+    def adicionar(self, palavra: str, valor, prioridade: int = 0):
+        """Cadastra uma palavra-chave; se repetida, fica a de menor prioridade"""
+        palavra = normalizar(palavra)
+        if not palavra:
+            return
+        estado = 0
+        for caractere in palavra:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][caractere] = proximo
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._palavra.append(None)
+                self._saida.append(0)
+            estado = proximo
+        atual = self._palavra[estado]
+        if atual is None or prioridade < atual[0]:
+            self._palavra[estado] = (prioridade, len(palavra), valor)
+        self._compilado = False
+
+    def compilar(self):
+        """Calcula as ligações de falha (busca em largura a partir da raiz)"""
+        fila = deque()
+        for estado in self._transicoes[0].values():
+            self._falha[estado] = 0
+            self._saida[estado] = 0
+            fila.append(estado)
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self._transicoes[estado].items():
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                falha = self._transicoes[falha].get(caractere, 0)
+                self._falha[proximo] = falha
+                self._saida[proximo] = falha if self._palavra[falha] is not None else self._saida[falha]
+                fila.append(proximo)
+        self._compilado = True
+        return self
+
+    def ocorrencias(self, texto: str, normalizado: bool = False):
+        """Gera (inicio, fim, valor, prioridade) de cada palavra encontrada no texto"""
+        if not self._compilado:
+            self.compilar()
+        if not normalizado:
+            texto = normalizar(texto)
+        transicoes, falhas, palavras, saidas = self._transicoes, self._falha, self._palavra, self._saida
+        estado = 0
+        for posicao, caractere in enumerate(texto):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            encontrado = estado if palavras[estado] is not None else saidas[estado]
+            while encontrado:
+                prioridade, tamanho, valor = palavras[encontrado]
+                yield posicao + 1 - tamanho, posicao + 1, valor, prioridade
+                encontrado = saidas[encontrado]
+
+    def melhor(self, texto: str, normalizado: bool = False):
+        """Valor da ocorrência de menor prioridade (empate: a que aparece primeiro e é mais longa)"""
+        melhor = None
+        for inicio, fim, valor, prioridade in self.ocorrencias(texto, normalizado):
+            chave = (prioridade, inicio, inicio - fim)
+            if melhor is None or chave < melhor[0]:
+                melhor = (chave, valor)
+        return melhor[1] if melhor else None
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from botbuilder.dialogs import WaterfallDialog, WaterfallStepContext, DialogTurnResult
+
+logger = logging.getLogger(__name__)
+
+# Limites (em segundos) dos buckets dos histogramas de duração
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Conversa do turno e span ativo, herdados pelas corrotinas chamadas durante o turno
+_conversa = ContextVar("conversa", default=None)
+_span_atual = ContextVar("span_atual", default=None)
+
+# Identificadores: números, UUIDs e outros tokens longos com dígitos (hex, hashes, códigos)
+_SEGMENTO_ID = re.compile(r"^(?:\d+|(?=[\w-]*\d)[\w-]{8,})$")
+
+
+def definir_conversa(conversa_id):
+    """Associa os spans seguintes (passos e chamadas HTTP) à conversa do turno"""
+    _conversa.set(conversa_id)
+
+
+def conversa_atual():
+    return _conversa.get()
+
+
+def rota(url: str) -> str:
+    """Caminho da URL sem valores variáveis, para não criar um histograma por ID/nome/CPF.
+
+    Identificadores viram ":id" em qualquer posição; a partir do terceiro segmento, qualquer
+    valor vira ":param" (ex.: /produto/nome/<nome>).
+    """
+    caminho = re.sub(r"^[a-z]+://[^/]+", "", url).split("?", 1)[0]
+    segmentos = []
+    for posicao, segmento in enumerate(caminho.strip("/").split("/")):
+        if _SEGMENTO_ID.match(segmento):
+            segmento = ":id"
+        elif posicao >= 2:
+            segmento = ":param"
+        segmentos.append(segmento)
+    return "/" + "/".join(segmentos)
+
+
+class Histograma:
+    def __init__(self):
+        self.contagens = [0] * (len(BUCKETS) + 1)
+        self.soma = 0.0
+        self.total = 0
+        self.erros = 0
+
+    def registrar(self, duracao, erro):
+        posicao = 0
+        while posicao < len(BUCKETS) and duracao > BUCKETS[posicao]:
+            posicao += 1
+        self.contagens[posicao] += 1
+        self.soma += duracao
+        self.total += 1
+        self.erros += erro
+
+    def percentil(self, q):
+        """Limite superior do bucket que contém o percentil q (estimativa)"""
+        alvo, acumulado = q * self.total, 0
+        for posicao, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if contagem and acumulado >= alvo:
+                return BUCKETS[posicao] if posicao < len(BUCKETS) else float("inf")
+        return 0.0
+
+
+class Rastreador:
+    """Spans com duração, status e conversa dos passos de diálogo e das chamadas HTTP.
+
+    Cada span alimenta um histograma por (tipo, nome), exposto em /metrics. Com um arquivo
+    configurado, os spans também são gravados em JSON Lines por uma tarefa periódica que
+    escreve num executor, fora do event loop.
+    """
+
+    def __init__(self, arquivo=None, intervalo_exportacao=5, max_pendentes=10000):
+        self._lock = threading.Lock()
+        self._histogramas = {}
+        self._tarefa_exportacao = None
+        self.configurar(arquivo, intervalo_exportacao, max_pendentes)
+
+    def configurar(self, arquivo=None, intervalo_exportacao=5, max_pendentes=10000):
+        self.arquivo = arquivo or None
+        self.intervalo_exportacao = intervalo_exportacao
+        # Acima do limite os spans mais antigos ainda não gravados são descartados
+        self._pendentes = deque(maxlen=max_pendentes)
+
+    @asynccontextmanager
+    async def span(self, nome, tipo, **atributos):
+        """Mede o bloco; o chamador pode preencher span["status"] (ex.: código HTTP)"""
+        registro = {
+            "id": uuid.uuid4().hex[:16],
+            "pai": _span_atual.get(),
+            "conversa": _conversa.get(),
+            "tipo": tipo,
+            "nome": nome,
+            "status": "ok",
+            **atributos,
+        }
+        token = _span_atual.set(registro["id"])
+        inicio_epoch, inicio = time.time(), time.perf_counter()
+        try:
+            yield registro
+        except BaseException as e:
+            registro["status"] = type(e).__name__
+            raise
+        finally:
+            _span_atual.reset(token)
+            duracao = time.perf_counter() - inicio
+            registro["inicio"] = inicio_epoch
+            registro["duracao_ms"] = round(duracao * 1000, 3)
+            self._registrar(registro, duracao)
+
+    def _registrar(self, registro, duracao):
+        status = registro["status"]
+        erro = status >= 500 if isinstance(status, int) else status != "ok"
+        with self._lock:
+            chave = (registro["tipo"], registro["nome"])
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = Histograma()
+            histograma.registrar(duracao, erro)
+        if self.arquivo:
+            self._pendentes.append(registro)
+
+    def histogramas(self):
+        """Resumo por (tipo, nome): contagem, erros, média e percentis estimados, em ms"""
+        with self._lock:
+            itens = sorted(self._histogramas.items())
+            return [
+                {
+                    "tipo": tipo,
+                    "nome": nome,
+                    "total": histograma.total,
+                    "erros": histograma.erros,
+                    "media_ms": round(histograma.soma / histograma.total * 1000, 3),
+                    "p50_ms": histograma.percentil(0.50) * 1000,
+                    "p95_ms": histograma.percentil(0.95) * 1000,
+                    "p99_ms": histograma.percentil(0.99) * 1000,
+                }
+                for (tipo, nome), histograma in itens
+            ]
+
+    def prometheus(self):
+        """Histogramas no formato texto do Prometheus"""
+        linhas = [
+            "# HELP bot_span_duracao_segundos Duração dos passos de diálogo e das chamadas HTTP",
+            "# TYPE bot_span_duracao_segundos histogram",
+        ]
+        erros = ["# HELP bot_span_erros_total Spans com erro", "# TYPE bot_span_erros_total counter"]
+        with self._lock:
+            for (tipo, nome), histograma in sorted(self._histogramas.items()):
+                rotulos = f'tipo="{tipo}",nome="{_escapar(nome)}"'
+                acumulado = 0
+                for limite, contagem in zip(BUCKETS + ("+Inf",), histograma.contagens):
+                    acumulado += contagem
+                    linhas.append(f'bot_span_duracao_segundos_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+                linhas.append(f"bot_span_duracao_segundos_sum{{{rotulos}}} {histograma.soma:.6f}")
+                linhas.append(f"bot_span_duracao_segundos_count{{{rotulos}}} {histograma.total}")
+                erros.append(f"bot_span_erros_total{{{rotulos}}} {histograma.erros}")
+        return "\n".join(linhas + erros) + "\n"
+
+    def _gravar(self, registros):
+        with open(self.arquivo, "a", encoding="utf-8") as arquivo:
+            arquivo.writelines(json.dumps(registro, ensure_ascii=False, default=str) + "\n" for registro in registros)
+
+    async def exportar(self):
+        """Grava os spans pendentes no arquivo (num executor)"""
+        if not self.arquivo or not self._pendentes:
+            return
+        registros = []
+        while self._pendentes:
+            registros.append(self._pendentes.popleft())
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._gravar, registros)
+        except OSError as e:
+            logger.error(f"Erro ao exportar spans: {str(e)}")
+
+    async def _exportar_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.intervalo_exportacao)
+            await self.exportar()
+
+    async def iniciar_exportacao(self, app=None):
+        """Inicia a gravação periódica dos spans (registrado em on_startup)"""
+        if self.arquivo and self._tarefa_exportacao is None:
+            self._tarefa_exportacao = asyncio.create_task(self._exportar_periodicamente())
+
+    async def parar_exportacao(self, app=None):
+        """Interrompe a gravação periódica e grava o que faltou (registrado em on_cleanup)"""
+        if self._tarefa_exportacao is not None:
+            self._tarefa_exportacao.cancel()
+            try:
+                await self._tarefa_exportacao
+            except asyncio.CancelledError:
+                pass
+            self._tarefa_exportacao = None
+        await self.exportar()
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"')
+
+
+rastreador = Rastreador()
+
+
+class WaterfallRastreado(WaterfallDialog):
+    """WaterfallDialog que registra um span por passo executado"""
+
+    async def on_step(self, step_context: WaterfallStepContext) -> DialogTurnResult:
+        async with rastreador.span(self.get_step_name(step_context.index), "passo", dialogo=self.id):
+            return await super().on_step(step_context)
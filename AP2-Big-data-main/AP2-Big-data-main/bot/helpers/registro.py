@@ -0,0 +1,139 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+
+from helpers.rastreamento import conversa_atual
+
+# Campos nunca gravados por inteiro nos logs
+CAMPOS_SENSIVEIS = {"cvv", "numero", "numero_cartao", "cpf"}
+
+# Sequências de 11 a 19 dígitos (com ou sem pontuação): CPFs e números de cartão em texto livre
+_DOCUMENTO = re.compile(r"(?<![\w.-])\d(?:[ .-]?\d){10,18}(?![\w-])")
+
+_listener = None
+
+
+class Payload:
+    """Corpo de requisição/resposta para logs, serializado só se o registro for de fato emitido.
+
+    Em `logger.debug("Resposta: %s", Payload(dados))` com DEBUG desligado nada é serializado.
+    Quando emitido, os campos sensíveis são mascarados (textos JSON são lidos antes), CPFs e
+    números de cartão soltos no texto são trocados por "***" e o resultado é limitado a `limite`
+    caracteres.
+    """
+
+    __slots__ = ("valor",)
+    limite = 500
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def __str__(self):
+        valor = self.valor
+        if isinstance(valor, (str, bytes)):
+            try:
+                valor = json.loads(valor)
+            except ValueError:
+                pass
+        if not isinstance(valor, str):
+            valor = json.dumps(_mascarar(valor), ensure_ascii=False, default=str)
+        valor = _DOCUMENTO.sub("***", valor)
+        if len(valor) > self.limite:
+            return f"{valor[:self.limite]}... (+{len(valor) - self.limite} caracteres)"
+        return valor
+
+
+def _mascarar(valor):
+    if isinstance(valor, dict):
+        return {
+            chave: "***" if chave in CAMPOS_SENSIVEIS and item else _mascarar(item)
+            for chave, item in valor.items()
+        }
+    if isinstance(valor, list):
+        return [_mascarar(item) for item in valor]
+    return valor
+
+
+class FiltroContexto(logging.Filter):
+    """Anota o registro com a conversa do turno e descarta parte dos registros DEBUG com Payload.
+
+    Avisos e erros passam sempre, mesmo quando trazem o corpo da resposta.
+
+    Roda no handler da fila, antes da formatação: registros descartados não custam serialização.
+    """
+
+    def __init__(self, amostragem_payload=1.0):
+        super(FiltroContexto, self).__init__()
+        self.amostragem_payload = amostragem_payload
+
+    def filter(self, record):
+        if (self.amostragem_payload < 1.0 and record.levelno <= logging.DEBUG
+                and isinstance(record.args, tuple)
+                and any(isinstance(arg, Payload) for arg in record.args)
+                and random.random() >= self.amostragem_payload):
+            return False
+        record.conversa = conversa_atual()
+        return True
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro: horário, nível, logger, conversa e mensagem"""
+
+    def format(self, record):
+        registro = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "conversa": getattr(record, "conversa", None),
+            # O QueueHandler já incluiu o traceback, se houver, na mensagem
+            "msg": record.getMessage(),
+        }
+        return json.dumps(registro, ensure_ascii=False)
+
+
+def configurar_logging(nivel="INFO", formato="texto", payload_max=500, amostragem_payload=1.0):
+    """Envia os logs por uma fila para uma thread que escreve no stderr.
+
+    No event loop só se monta a mensagem dos registros que passam do nível e da amostragem;
+    a formatação final e a escrita (bloqueante) ficam na thread do QueueListener.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    Payload.limite = payload_max
+
+    saida = logging.StreamHandler(sys.stderr)
+    if formato == "json":
+        saida.setFormatter(FormatadorJSON())
+    else:
+        saida.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(conversa)s] %(message)s"))
+
+    fila = queue.SimpleQueue()
+    handler_fila = logging.handlers.QueueHandler(fila)
+    handler_fila.addFilter(FiltroContexto(amostragem_payload))
+
+    raiz = logging.getLogger()
+    raiz.handlers = [handler_fila]
+    raiz.setLevel(nivel)
+
+    _listener = logging.handlers.QueueListener(fila, saida)
+    _listener.start()
+    atexit.register(encerrar_logging_sync)
+
+
+def encerrar_logging_sync():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+async def encerrar_logging(app=None):
+    """Esvazia a fila e para a thread de escrita (registrado em on_cleanup)"""
+    encerrar_logging_sync()
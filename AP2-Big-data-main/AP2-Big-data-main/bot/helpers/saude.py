@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from api.http_client import requisitar, adicionar_observador
+
+logger = logging.getLogger(__name__)
+
+
+class EstadoDependencia:
+    def __init__(self, nome, url_base):
+        self.nome = nome
+        self.url_base = url_base
+        self.disponivel = None  # None enquanto não houve nenhuma observação
+        self.falhas_consecutivas = 0
+        self.ultimo_erro = None
+        self.ultimo_sucesso = None  # time.monotonic()
+        self.ultima_sondagem = None
+        self.sondagens = 0
+
+    def resumo(self):
+        return {
+            "nome": self.nome,
+            "url": self.url_base,
+            "disponivel": self.disponivel,
+            "falhas_consecutivas": self.falhas_consecutivas,
+            "ultimo_erro": self.ultimo_erro,
+            "segundos_desde_ultimo_sucesso": (
+                round(time.monotonic() - self.ultimo_sucesso, 1) if self.ultimo_sucesso is not None else None
+            ),
+            "sondagens": self.sondagens,
+        }
+
+
+class MonitorSaude:
+    """Estado (em cache) dos backends usados pelo bot.
+
+    O estado é atualizado de duas formas: pelas próprias chamadas feitas com `requisitar`
+    (observação passiva) e por uma tarefa que faz GET em `caminho_sondagem` quando a
+    dependência ficou `intervalo` segundos sem nenhuma chamada bem-sucedida. Qualquer
+    resposta abaixo de 500 conta como sucesso; erros de conexão, timeouts e 5xx contam
+    como falha, e após `falhas_para_indisponivel` falhas seguidas a dependência é marcada
+    como indisponível. Indisponível, ela é sondada a cada `intervalo_indisponivel` segundos.
+
+    Os diálogos consultam `disponivel(nome)`, que só lê o cache.
+    """
+
+    def __init__(self, dependencias=None, intervalo=10, intervalo_indisponivel=2, timeout=2,
+                 falhas_para_indisponivel=2, caminho_sondagem="/healthz"):
+        self._dependencias = {}
+        self._tarefa = None
+        self.configurar(dependencias, intervalo, intervalo_indisponivel, timeout,
+                        falhas_para_indisponivel, caminho_sondagem)
+        adicionar_observador(self.observar)
+
+    def configurar(self, dependencias=None, intervalo=10, intervalo_indisponivel=2, timeout=2,
+                   falhas_para_indisponivel=2, caminho_sondagem="/healthz"):
+        """`dependencias`: nome -> URL base. Nomes com a mesma URL compartilham o estado."""
+        self.intervalo = intervalo
+        self.intervalo_indisponivel = intervalo_indisponivel
+        self.timeout = timeout
+        self.falhas_para_indisponivel = falhas_para_indisponivel
+        self.caminho_sondagem = caminho_sondagem
+
+        por_url = {}
+        self._dependencias = {}
+        for nome, url_base in (dependencias or {}).items():
+            url_base = url_base.rstrip("/")
+            if url_base not in por_url:
+                por_url[url_base] = EstadoDependencia(nome, url_base)
+            self._dependencias[nome] = por_url[url_base]
+        # Mais longas primeiro: a URL de uma chamada pertence à base mais específica
+        self._por_url = sorted(por_url.values(), key=lambda estado: len(estado.url_base), reverse=True)
+
+    def disponivel(self, nome) -> bool:
+        """False só quando a dependência foi marcada como indisponível; desconhecida conta como disponível"""
+        estado = self._dependencias.get(nome)
+        return estado is None or estado.disponivel is not False
+
+    def estado(self):
+        return [estado.resumo() for estado in self._por_url]
+
+    def observar(self, url, ok, erro=None):
+        """Registra o resultado de uma chamada (chamado pelo http_client após cada requisição)"""
+        for estado in self._por_url:
+            if url.startswith(estado.url_base):
+                self._atualizar(estado, ok, erro)
+                return
+
+    def _atualizar(self, estado, ok, erro):
+        if ok:
+            estado.falhas_consecutivas = 0
+            estado.ultimo_sucesso = time.monotonic()
+            if estado.disponivel is not True:
+                if estado.disponivel is False:
+                    logger.warning("Dependência %s disponível novamente", estado.nome)
+                estado.disponivel = True
+            return
+
+        estado.falhas_consecutivas += 1
+        estado.ultimo_erro = erro
+        if estado.disponivel is not False and (
+                estado.falhas_consecutivas >= self.falhas_para_indisponivel or estado.disponivel is None):
+            logger.warning("Dependência %s indisponível: %s", estado.nome, erro)
+            estado.disponivel = False
+
+    def _precisa_sondar(self, estado, agora):
+        if estado.disponivel is True:
+            # Chamadas reais recentes já confirmam o estado: a sondagem é dispensada
+            referencia = max(estado.ultimo_sucesso or 0, estado.ultima_sondagem or 0)
+            return agora - referencia >= self.intervalo
+        return estado.ultima_sondagem is None or agora - estado.ultima_sondagem >= self.intervalo_indisponivel
+
+    async def sondar(self, estado):
+        """GET leve na dependência; o resultado chega ao estado pela observação do http_client"""
+        estado.ultima_sondagem = time.monotonic()
+        estado.sondagens += 1
+        try:
+            await requisitar("GET", estado.url_base + self.caminho_sondagem, timeout=self.timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+
+    async def verificar(self):
+        """Sonda, em paralelo, as dependências sem confirmação recente"""
+        agora = time.monotonic()
+        pendentes = [estado for estado in self._por_url if self._precisa_sondar(estado, agora)]
+        if pendentes:
+            await asyncio.gather(*(self.sondar(estado) for estado in pendentes))
+
+    async def _monitorar(self):
+        while True:
+            await self.verificar()
+            await asyncio.sleep(min(self.intervalo, self.intervalo_indisponivel))
+
+    async def iniciar(self, app=None):
+        """Inicia as sondagens periódicas (registrado em on_startup)"""
+        if self._tarefa is None and self._por_url:
+            self._tarefa = asyncio.create_task(self._monitorar())
+
+    async def parar(self, app=None):
+        """Interrompe as sondagens (registrado em on_cleanup)"""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+
+monitor_saude = MonitorSaude()
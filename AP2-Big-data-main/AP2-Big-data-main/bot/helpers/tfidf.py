@@ -0,0 +1,85 @@
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from helpers.palavras_chave import normalizar
+
+
+def ngramas(texto: str, minimo: int = 2, maximo: int = 4, normalizado: bool = False):
+    """N-gramas de caracteres do texto, com repetição (cada palavra ganha um espaço nas bordas)"""
+    if not normalizado:
+        texto = normalizar(texto)
+    for palavra in texto.split():
+        palavra = f" {palavra} "
+        for n in range(minimo, maximo + 1):
+            for inicio in range(len(palavra) - n + 1):
+                yield palavra[inicio:inicio + n]
+
+
+class IndiceTFIDF:
+    """Matriz TF-IDF esparsa de n-gramas de caracteres, montada uma vez a partir dos documentos.
+
+    N-gramas de caracteres toleram erros de digitação, plural/singular e acentuação. A busca
+    vetoriza a consulta e calcula a similaridade de cosseno com todos os documentos num único
+    produto esparso, que só percorre os documentos que têm algum n-grama da consulta.
+    """
+
+    def __init__(self, documentos, minimo: int = 2, maximo: int = 4):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.vocabulario = {}
+
+        colunas, inicios = [], [0]
+        for documento in documentos:
+            colunas.extend(
+                self.vocabulario.setdefault(ngrama, len(self.vocabulario))
+                for ngrama in ngramas(documento, minimo, maximo)
+            )
+            inicios.append(len(colunas))
+        self.total_documentos = len(inicios) - 1
+
+        formato = (self.total_documentos, len(self.vocabulario))
+        matriz = sparse.csr_matrix((np.ones(len(colunas)), colunas, inicios), shape=formato)
+        matriz.sum_duplicates()
+        # tf sublinear: repetir um n-grama ajuda cada vez menos
+        matriz.data = 1.0 + np.log(matriz.data)
+
+        # idf suavizado: n-gramas presentes em muitos documentos pesam menos
+        frequencia = np.bincount(matriz.indices, minlength=formato[1])
+        self.idf = np.log((1.0 + self.total_documentos) / (1.0 + frequencia)) + 1.0
+        matriz.data *= self.idf[matriz.indices]
+
+        normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+        normas[normas == 0] = 1.0
+        matriz.data /= np.repeat(normas, np.diff(matriz.indptr))
+
+        # Uma linha por n-grama: a consulta seleciona só as linhas dos seus n-gramas
+        self.matriz_por_ngrama = matriz.T.tocsr()
+
+    def vetorizar(self, consulta: str):
+        """(colunas, pesos) do vetor TF-IDF normalizado da consulta; n-gramas fora do vocabulário são ignorados"""
+        contagem = Counter(
+            coluna for coluna in map(self.vocabulario.get, ngramas(consulta, self.minimo, self.maximo))
+            if coluna is not None
+        )
+        colunas = np.fromiter(contagem.keys(), dtype=np.int64, count=len(contagem))
+        pesos = (1.0 + np.log(np.fromiter(contagem.values(), dtype=np.float64, count=len(contagem)))) * self.idf[colunas]
+        norma = np.sqrt(pesos @ pesos)
+        return colunas, pesos / norma if norma else pesos
+
+    def pontuar(self, consulta: str, k: int):
+        """Até k (documentos, pontuações) com similaridade > 0, em ordem decrescente de pontuação"""
+        colunas, pesos = self.vetorizar(consulta)
+        if not len(colunas):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        pontuacoes = self.matriz_por_ngrama[colunas].T @ pesos
+        if k < len(pontuacoes):
+            candidatos = np.argpartition(-pontuacoes, k)[:k]
+        else:
+            candidatos = np.arange(len(pontuacoes))
+        candidatos = candidatos[pontuacoes[candidatos] > 0]
+        # Empate: o documento que aparece primeiro
+        ordem = np.lexsort((candidatos, -pontuacoes[candidatos]))
+        return candidatos[ordem], pontuacoes[candidatos[ordem]]
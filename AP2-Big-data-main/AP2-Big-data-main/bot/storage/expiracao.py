@@ -0,0 +1,190 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from botbuilder.core import Storage, StoreItem
+from jsonpickle import Pickler
+
+logger = logging.getLogger(__name__)
+
+
+class StorageComExpiracao(Storage):
+    """Envolve outro Storage removendo estados ociosos e limitando o total guardado.
+
+    - Registra o último acesso (leitura ou escrita) de cada chave.
+    - Chaves sem acesso há mais de `ttl_segundos` são removidas na leitura e pela
+      limpeza periódica (`iniciar_limpeza`).
+    - Acima de `max_chaves` ou `max_bytes`, remove as chaves usadas há mais tempo (LRU).
+    - Com SQLiteStorage compartilhado, cada limpeza marca como ativas no banco as chaves lidas
+      pelo processo; por isso `intervalo_limpeza` deve ser menor que `ttl_segundos`.
+    - `estatisticas()` expõe conversas/usuários ativos e contadores de remoções.
+    """
+
+    def __init__(self, storage: Storage, ttl_segundos: int, max_chaves: int, max_bytes: int,
+                 intervalo_limpeza: int = 60):
+        super(StorageComExpiracao, self).__init__()
+        self._storage = storage
+        self.ttl_segundos = ttl_segundos
+        self.max_chaves = max_chaves
+        self.max_bytes = max_bytes
+        self.intervalo_limpeza = intervalo_limpeza
+        self._acessos = OrderedDict()  # chave -> (último acesso, bytes), da menos para a mais recente
+        self._total_bytes = 0
+        self._tarefa_limpeza = None
+        self._ultimo_toque = time.monotonic()
+        self.expiradas = 0
+        self.removidas_por_limite = 0
+
+    async def read(self, keys: List[str]):
+        agora = time.monotonic()
+        expiradas = [chave for chave in keys if self._expirou(chave, agora)]
+        removidas = []
+        if expiradas:
+            removidas = await self._remover_expiradas(expiradas)
+            self.expiradas += len(removidas)
+
+        itens = await self._storage.read([chave for chave in keys if chave not in removidas])
+        for chave in itens:
+            self._registrar(chave, agora)
+        return itens
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        await self._storage.write(changes)
+        if not changes:
+            return
+
+        agora = time.monotonic()
+        for chave, item in changes.items():
+            self._registrar(chave, agora, _tamanho(item))
+        await self._aplicar_limites()
+
+    async def delete(self, keys: List[str]):
+        await self._remover(keys)
+
+    def _expirou(self, chave, agora):
+        acesso = self._acessos.get(chave)
+        return acesso is not None and agora - acesso[0] > self.ttl_segundos
+
+    def _registrar(self, chave, agora, tamanho=None):
+        anterior = self._acessos.pop(chave, None)
+        if tamanho is None:
+            tamanho = anterior[1] if anterior else 0
+        if anterior:
+            self._total_bytes -= anterior[1]
+        self._acessos[chave] = (agora, tamanho)
+        self._total_bytes += tamanho
+
+    def _esquecer(self, chaves):
+        for chave in chaves:
+            acesso = self._acessos.pop(chave, None)
+            if acesso:
+                self._total_bytes -= acesso[1]
+
+    async def _remover(self, chaves):
+        await self._storage.delete(list(chaves))
+        self._esquecer(chaves)
+
+    async def _remover_expiradas(self, chaves):
+        """Remove chaves ociosas neste processo. No SQLiteStorage a remoção é condicional:
+        itens gravados recentemente por outro processo são mantidos."""
+        if hasattr(self._storage, "remover_inativos"):
+            removidas = await self._storage.remover_inativos(self.ttl_segundos, chaves=chaves)
+        else:
+            await self._storage.delete(list(chaves))
+            removidas = list(chaves)
+        self._esquecer(chaves)
+        return removidas
+
+    async def _aplicar_limites(self):
+        excedentes = []
+        total_chaves, total_bytes = len(self._acessos), self._total_bytes
+        for chave, (_, tamanho) in self._acessos.items():
+            if total_chaves <= self.max_chaves and total_bytes <= self.max_bytes:
+                break
+            excedentes.append(chave)
+            total_chaves -= 1
+            total_bytes -= tamanho
+
+        if excedentes:
+            await self._remover(excedentes)
+            self.removidas_por_limite += len(excedentes)
+            logger.info("Estado: %d chaves removidas por limite de memória", len(excedentes))
+
+    async def remover_ociosos(self):
+        """Remove todas as chaves sem acesso há mais de ttl_segundos"""
+        limite = time.monotonic() - self.ttl_segundos
+        ociosas = []
+        for chave, (ultimo_acesso, _) in self._acessos.items():
+            if ultimo_acesso > limite:
+                break
+            ociosas.append(chave)
+        removidas = await self._remover_expiradas(ociosas) if ociosas else []
+
+        # Chaves gravadas antes de um reinício ou por outros processos (SQLiteStorage).
+        # Antes, as chaves que este processo acessou desde a última limpeza são marcadas como
+        # ativas no banco, para que a limpeza dos outros processos também as preserve
+        if hasattr(self._storage, "remover_inativos"):
+            await self._tocar_acessadas()
+            removidas.extend(await self._storage.remover_inativos(self.ttl_segundos, manter=list(self._acessos)))
+
+        self.expiradas += len(removidas)
+        return len(removidas)
+
+    async def _tocar_acessadas(self):
+        """Toca no storage as chaves acessadas desde o último toque (as mais recentes do LRU)"""
+        desde, self._ultimo_toque = self._ultimo_toque, time.monotonic()
+        acessadas = []
+        for chave in reversed(self._acessos):
+            if self._acessos[chave][0] < desde:
+                break
+            acessadas.append(chave)
+        await self._storage.tocar(acessadas)
+
+    async def _limpar_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.intervalo_limpeza)
+            try:
+                removidas = await self.remover_ociosos()
+                if removidas:
+                    logger.info("Estado: %d conversas ociosas removidas", removidas)
+            except Exception:
+                logger.exception("Erro na limpeza de estados ociosos")
+
+    async def iniciar_limpeza(self, app=None):
+        """Inicia a limpeza periódica (registrado em on_startup)"""
+        if self._tarefa_limpeza is None:
+            self._tarefa_limpeza = asyncio.create_task(self._limpar_periodicamente())
+
+    async def parar_limpeza(self, app=None):
+        """Interrompe a limpeza periódica (registrado em on_cleanup)"""
+        if self._tarefa_limpeza is not None:
+            self._tarefa_limpeza.cancel()
+            try:
+                await self._tarefa_limpeza
+            except asyncio.CancelledError:
+                pass
+            self._tarefa_limpeza = None
+
+    def estatisticas(self):
+        return {
+            "chaves": len(self._acessos),
+            "bytes": self._total_bytes,
+            "conversas_ativas": sum(1 for chave in self._acessos if "/conversations/" in chave),
+            "usuarios_ativos": sum(1 for chave in self._acessos if "/users/" in chave),
+            "expiradas": self.expiradas,
+            "removidas_por_limite": self.removidas_por_limite,
+            "ttl_segundos": self.ttl_segundos,
+            "max_chaves": self.max_chaves,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def _tamanho(item):
+    """Tamanho aproximado do item serializado, em bytes"""
+    try:
+        return len(json.dumps(Pickler().flatten(item)))
+    except (TypeError, ValueError):
+        return 0
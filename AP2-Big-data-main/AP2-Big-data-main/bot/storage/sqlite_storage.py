@@ -0,0 +1,209 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from botbuilder.core import Storage, StoreItem
+from jsonpickle import Pickler, Unpickler
+
+# Chaves por comando na remoção e no toque de itens (abaixo do limite de parâmetros do SQLite)
+TAMANHO_LOTE_REMOCAO = 500
+
+
+class SQLiteStorage(Storage):
+    """Storage do Bot Framework em SQLite (modo WAL), durável e compartilhável entre
+    vários processos do bot no mesmo host.
+
+    - Cada item é gravado com uma e_tag nova; uma escrita com e_tag diferente da gravada
+      (e diferente de "*") falha com KeyError, como no MemoryStorage.
+    - Todas as chaves de um write() vão numa única transação.
+    - O acesso ao SQLite roda num pool de threads (uma conexão por thread), fora do event loop.
+    """
+
+    def __init__(self, caminho: str, max_threads: int = 4, timeout: float = 5.0):
+        super(SQLiteStorage, self).__init__()
+        self._caminho = caminho
+        self._timeout = timeout
+        self._local = threading.local()
+        self._conexoes = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="sqlite-storage")
+
+        conexao = self._conexao()
+        conexao.execute(
+            "CREATE TABLE IF NOT EXISTS estado ("
+            " chave TEXT PRIMARY KEY,"
+            " e_tag TEXT NOT NULL,"
+            " dados TEXT NOT NULL,"
+            " atualizado_em REAL NOT NULL)"
+        )
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            # isolation_level=None: as transações são abertas explicitamente em _gravar
+            conexao = sqlite3.connect(
+                self._caminho, timeout=self._timeout, isolation_level=None, check_same_thread=False
+            )
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+            with self._lock:
+                self._conexoes.append(conexao)
+        return conexao
+
+    async def _executar(self, funcao, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, funcao, *args)
+
+    async def read(self, keys: List[str]):
+        if not keys:
+            return {}
+        return await self._executar(self._ler, list(keys))
+
+    async def write(self, changes: Dict[str, StoreItem]):
+        if changes is None:
+            raise Exception("Changes are required when writing")
+        if not changes:
+            return
+
+        # Serializa ainda no event loop, para gravar o estado exatamente como estava agora
+        registros = [(chave, _e_tag(item), _serializar(item)) for chave, item in changes.items()]
+        novas_e_tags = await self._executar(self._gravar, registros)
+
+        # Atualiza a e_tag dos objetos recebidos para que um novo write no mesmo turno não conflite
+        for chave, item in changes.items():
+            _definir_e_tag(item, novas_e_tags[chave])
+
+    async def delete(self, keys: List[str]):
+        if keys:
+            await self._executar(self._remover, list(keys))
+
+    def _ler(self, chaves):
+        marcadores = ", ".join("?" for _ in chaves)
+        linhas = self._conexao().execute(
+            f"SELECT chave, e_tag, dados FROM estado WHERE chave IN ({marcadores})", chaves
+        ).fetchall()
+
+        itens = {}
+        for chave, e_tag, dados in linhas:
+            item = Unpickler().restore(json.loads(dados))
+            _definir_e_tag(item, e_tag)
+            itens[chave] = item
+        return itens
+
+    def _gravar(self, registros):
+        conexao = self._conexao()
+        chaves = [chave for chave, _, _ in registros]
+        marcadores = ", ".join("?" for _ in chaves)
+
+        # BEGIN IMMEDIATE pega o lock de escrita já na leitura das e_tags: a verificação e a
+        # gravação são atômicas também entre processos
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            atuais = dict(conexao.execute(
+                f"SELECT chave, e_tag FROM estado WHERE chave IN ({marcadores})", chaves
+            ).fetchall())
+            for chave, e_tag, _ in registros:
+                if e_tag not in (None, "*") and chave in atuais and atuais[chave] != e_tag:
+                    raise KeyError(
+                        "Etag conflict.\nOriginal: %s\r\nCurrent: %s" % (e_tag, atuais[chave])
+                    )
+
+            agora = time.time()
+            novas_e_tags = {chave: uuid.uuid4().hex for chave in chaves}
+            conexao.executemany(
+                "INSERT INTO estado (chave, e_tag, dados, atualizado_em) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(chave) DO UPDATE SET "
+                "e_tag = excluded.e_tag, dados = excluded.dados, atualizado_em = excluded.atualizado_em",
+                [(chave, novas_e_tags[chave], dados, agora) for chave, _, dados in registros],
+            )
+            conexao.execute("COMMIT")
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        return novas_e_tags
+
+    def _remover(self, chaves):
+        marcadores = ", ".join("?" for _ in chaves)
+        self._conexao().execute(f"DELETE FROM estado WHERE chave IN ({marcadores})", chaves)
+
+    async def tocar(self, chaves: List[str]):
+        """Marca as chaves como ativas agora (atualizado_em), sem regravar os dados.
+
+        Leituras não mudam atualizado_em e o BotState não grava estado inalterado: sem o toque,
+        a limpeza de outro processo veria como inativa uma conversa que este processo lê a cada turno.
+        """
+        if chaves:
+            await self._executar(self._tocar, list(chaves), time.time())
+
+    def _tocar(self, chaves, agora):
+        conexao = self._conexao()
+        for inicio in range(0, len(chaves), TAMANHO_LOTE_REMOCAO):
+            lote = chaves[inicio:inicio + TAMANHO_LOTE_REMOCAO]
+            marcadores = ", ".join("?" for _ in lote)
+            conexao.execute(
+                f"UPDATE estado SET atualizado_em = ? WHERE atualizado_em < ? AND chave IN ({marcadores})",
+                [agora, agora] + lote,
+            )
+
+    async def remover_inativos(self, ttl_segundos: int, chaves: List[str] = None, manter=()):
+        """Remove itens não gravados há mais de ttl_segundos (só entre `chaves`, quando
+        informadas), exceto os de `manter`. Retorna as chaves removidas."""
+        return await self._executar(self._remover_inativos, time.time() - ttl_segundos, chaves, set(manter))
+
+    def _remover_inativos(self, limite, chaves, manter):
+        conexao = self._conexao()
+        if chaves is None:
+            chaves = [chave for chave, in conexao.execute("SELECT chave FROM estado WHERE atualizado_em < ?", (limite,))]
+        candidatas = [chave for chave in chaves if chave not in manter]
+
+        removidas = []
+        for inicio in range(0, len(candidatas), TAMANHO_LOTE_REMOCAO):
+            lote = candidatas[inicio:inicio + TAMANHO_LOTE_REMOCAO]
+            marcadores = ", ".join("?" for _ in lote)
+            condicao = f"atualizado_em < ? AND chave IN ({marcadores})"
+
+            # A condição é conferida de novo dentro da transação: outro processo pode ter gravado a chave
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                removidas.extend(
+                    chave for chave, in conexao.execute(f"SELECT chave FROM estado WHERE {condicao}", [limite] + lote)
+                )
+                conexao.execute(f"DELETE FROM estado WHERE {condicao}", [limite] + lote)
+                conexao.execute("COMMIT")
+            except BaseException:
+                conexao.execute("ROLLBACK")
+                raise
+        return removidas
+
+    async def fechar(self, app=None):
+        """Encerra o pool de threads e as conexões (registrado em on_cleanup)"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for conexao in self._conexoes:
+                conexao.close()
+            self._conexoes.clear()
+
+
+def _e_tag(item):
+    if isinstance(item, dict):
+        return item.get("e_tag")
+    return getattr(item, "e_tag", None)
+
+
+def _definir_e_tag(item, e_tag):
+    if isinstance(item, dict):
+        item["e_tag"] = e_tag
+    elif hasattr(item, "e_tag"):
+        item.e_tag = e_tag
+
+
+def _serializar(item):
+    # A e_tag fica na sua própria coluna
+    if isinstance(item, dict):
+        item = {chave: valor for chave, valor in item.items() if chave != "e_tag"}
+    return json.dumps(Pickler().flatten(item))
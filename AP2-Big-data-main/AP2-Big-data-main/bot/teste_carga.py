@@ -0,0 +1,342 @@
+"""Teste de carga do endpoint /api/messages com conversas completas.
+
+Sobe, em processos separados, o bot (app.py, sem autenticação e com estado em memória) e um
+backend substituto com latência configurável. Em seguida, N usuários simultâneos executam
+roteiros completos: perguntas do FAQ, a matrícula (MatriculaDialog) e uma compra
+(ConsultarProdutoDialog -> ComprarProdutoDialog).
+
+As atividades usam deliveryMode "expectReplies": as respostas do bot voltam no corpo do
+próprio POST, sem precisar de um serviço de canal para recebê-las. Cada turno confere se a
+resposta contém o trecho esperado.
+
+O relatório mostra turnos/s, latência p50/p95/p99 por turno, o atraso do event loop do bot e
+os passos/chamadas HTTP mais lentos segundo o /metrics do bot.
+
+Uso (a partir da pasta bot):
+    python teste_carga.py [--usuarios 50] [--repeticoes 2] [--latencia-backend 50]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+import uuid
+
+import aiohttp
+from aiohttp import web
+
+PRODUTO = {
+    "id": "produto-carga",
+    "nome": "Notebook",
+    "produtoCategoria": "informatica",
+    "preco": 3500.0,
+    "descricao": "Produto do teste de carga",
+    "urlImagem": "",
+}
+USUARIO = {"id": 1, "nome": "Fulano Silva"}
+CPF = "52998224725"
+CARTAO = {"numero": "4111111111111111", "nome_impresso": "FULANO SILVA", "usuario_id": USUARIO["id"]}
+
+
+def roteiro_faq(usuario, repeticao):
+    return "faq", [
+        ({"text": "qual o calendário acadêmico?"}, "calendário"),
+        ({"text": "como emitir boleto?"}, "Financeiro"),
+        ({"text": "quais os horários de aula?"}, "19h"),
+    ]
+
+
+def roteiro_matricula(usuario, repeticao):
+    return "matricula", [
+        ({"text": "quero me matricular"}, "nome completo"),
+        ({"text": "Fulano Silva"}, "email"),
+        ({"text": f"usuario{usuario}.{repeticao}@exemplo.com"}, "cursos"),
+        ({"text": "Engenharia"}, "Confirmação"),
+        ({"text": "sim"}, "Sucesso"),
+    ]
+
+
+def roteiro_compra(usuario, repeticao):
+    return "compra", [
+        ({"text": "quero comprar um produto"}, "nome do produto"),
+        ({"text": PRODUTO["nome"]}, "Comprar este produto"),
+        ({"value": {"acao": "comprar", "productId": PRODUTO["id"]}}, "CPF"),
+        ({"text": CPF}, "cartão de crédito"),
+        ({"text": CARTAO["numero"]}, "nome impresso"),
+        ({"text": CARTAO["nome_impresso"]}, "validade"),
+        ({"text": "12/2030"}, "CVV"),
+        ({"text": "123"}, "Compra Realizada"),
+    ]
+
+
+ROTEIROS = {"faq": roteiro_faq, "matricula": roteiro_matricula, "compra": roteiro_compra}
+
+
+# ---------------------------------------------------------------- backend substituto
+
+def criar_backend(latencia):
+    """Rotas do backend usadas pelos roteiros, cada uma respondendo após `latencia` segundos"""
+    pedidos = iter(range(1, 10 ** 9))
+
+    async def atrasar():
+        if latencia:
+            await asyncio.sleep(latencia)
+
+    async def produto_por_nome(req):
+        await atrasar()
+        return web.json_response(PRODUTO)
+
+    async def usuario_por_cpf(req):
+        await atrasar()
+        return web.json_response(USUARIO)
+
+    async def cartao_por_numero(req):
+        await atrasar()
+        return web.json_response(CARTAO)
+
+    async def checkout(req):
+        await atrasar()
+        return web.json_response({
+            "status": "AUTHORIZED",
+            "codigo_autorizacao": str(uuid.uuid4()),
+            "id_pedido": next(pedidos),
+            "nome_produto": PRODUTO["nome"],
+            "valor_total": PRODUTO["preco"],
+        })
+
+    async def healthz(req):
+        return web.json_response({"status": "ok"})
+
+    async def matriculas(req):
+        await atrasar()
+        dados = await req.json()
+        return web.json_response({"id": next(pedidos), **dados}, status=201)
+
+    app = web.Application()
+    app.router.add_get("/produto/nome/{nome}", produto_por_nome)
+    app.router.add_get("/usuario/cpf/{cpf}", usuario_por_cpf)
+    app.router.add_get("/cartao/numero/{numero}", cartao_por_numero)
+    app.router.add_post("/checkout", checkout)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_post("/api/matriculas", matriculas)
+    return app
+
+
+def executar_backend(porta, latencia):
+    web.run_app(criar_backend(latencia), host="127.0.0.1", port=porta, print=None, access_log=None)
+
+
+# ---------------------------------------------------------------- bot
+
+def executar_bot(porta, url_backend, intervalo_lag):
+    """Processo do bot: app.py com estado em memória, backend substituto e medição do event loop"""
+    os.environ.update({
+        "MicrosoftAppId": "",
+        "MicrosoftAppPassword": "",
+        "BOT_STORAGE": "memory",
+        "API_BASE_URL": url_backend,
+        "MATRICULA_API_BASE_URL": url_backend,
+        "FAQ_INTERVALO_RECARGA": "0",
+        "LOG_NIVEL": os.environ.get("LOG_NIVEL", "WARNING"),
+    })
+    # Alguns diálogos ainda imprimem no stdout; isso distorceria a medição
+    sys.stdout = open(os.devnull, "w")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app as bot_app
+
+    atrasos = []
+
+    async def medir_event_loop(app):
+        async def medir():
+            while True:
+                inicio = time.perf_counter()
+                await asyncio.sleep(intervalo_lag)
+                atrasos.append(time.perf_counter() - inicio - intervalo_lag)
+
+        app["medicao_lag"] = asyncio.create_task(medir())
+
+    async def lag(req):
+        # GET devolve os percentis; DELETE zera a amostra (ao fim do aquecimento)
+        if req.method == "DELETE":
+            atrasos.clear()
+            return web.Response(status=204)
+        return web.json_response({"amostras": len(atrasos), **percentis(atrasos)})
+
+    bot_app.APP.on_startup.append(medir_event_loop)
+    bot_app.APP.router.add_get("/carga/lag", lag)
+    bot_app.APP.router.add_delete("/carga/lag", lag)
+    web.run_app(bot_app.APP, host="127.0.0.1", port=porta, print=None, access_log=None)
+
+
+# ---------------------------------------------------------------- gerador de carga
+
+def percentis(valores):
+    if not valores:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    valores = sorted(valores)
+    def p(q):
+        return valores[min(len(valores) - 1, int(len(valores) * q))] * 1000
+    return {"p50": p(0.50), "p95": p(0.95), "p99": p(0.99), "max": valores[-1] * 1000}
+
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def aguardar(sessao, url, tempo_maximo=30):
+    limite = time.monotonic() + tempo_maximo
+    while True:
+        try:
+            async with sessao.get(url) as resposta:
+                if resposta.status < 500:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > limite:
+            raise RuntimeError(f"{url} não respondeu em {tempo_maximo}s")
+        await asyncio.sleep(0.2)
+
+
+class Resultados:
+    def __init__(self):
+        self.latencias = {}
+        self.erros = []
+
+    def registrar(self, roteiro, latencia):
+        self.latencias.setdefault(roteiro, []).append(latencia)
+
+    def todas(self):
+        return [latencia for latencias in self.latencias.values() for latencia in latencias]
+
+
+async def enviar_turno(sessao, url, conversa, usuario, conteudo):
+    atividade = {
+        "type": "message",
+        "id": str(uuid.uuid4()),
+        "channelId": "carga",
+        "serviceUrl": "http://localhost",
+        "deliveryMode": "expectReplies",
+        "conversation": {"id": conversa},
+        "from": {"id": usuario},
+        "recipient": {"id": "bot"},
+        **conteudo,
+    }
+    async with sessao.post(url, json=atividade) as resposta:
+        corpo = await resposta.text()
+        return resposta.status, corpo
+
+
+async def simular_usuario(numero, sessao, url, roteiros, repeticoes, pausa, resultados):
+    conversa, usuario = f"carga-{numero}-{uuid.uuid4()}", f"usuario-{numero}"
+    for repeticao in range(repeticoes):
+        for criar_roteiro in roteiros:
+            nome, passos = criar_roteiro(numero, repeticao)
+            for conteudo, esperado in passos:
+                if pausa:
+                    await asyncio.sleep(random.uniform(0, pausa))
+                inicio = time.perf_counter()
+                try:
+                    status, corpo = await enviar_turno(sessao, url, conversa, usuario, conteudo)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    resultados.erros.append(f"{nome}: {type(e).__name__}: {e}")
+                    return
+                resultados.registrar(nome, time.perf_counter() - inicio)
+                if status != 200:
+                    resultados.erros.append(f"{nome}: HTTP {status}")
+                    return
+                # Respostas vêm em {"activities": [...]}; confere o texto e os cards
+                respostas = json.dumps(json.loads(corpo or "{}"), ensure_ascii=False)
+                if esperado and esperado not in respostas:
+                    resultados.erros.append(f"{nome}: resposta sem '{esperado}' para {conteudo}")
+                    return
+
+
+async def gerar_carga(args, url_bot):
+    roteiros = [ROTEIROS[nome] for nome in args.roteiros.split(",")]
+    conector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=conector, timeout=timeout) as sessao:
+        await aguardar(sessao, f"{url_bot}/api/estado")
+
+        # Aquecimento: uma conversa completa antes de medir
+        aquecimento = Resultados()
+        await simular_usuario(-1, sessao, f"{url_bot}/api/messages", roteiros, 1, 0, aquecimento)
+        if aquecimento.erros:
+            raise RuntimeError(f"Falha no aquecimento: {aquecimento.erros[0]}")
+        await sessao.delete(f"{url_bot}/carga/lag")
+
+        resultados = Resultados()
+        inicio = time.perf_counter()
+        await asyncio.gather(*(
+            simular_usuario(numero, sessao, f"{url_bot}/api/messages", roteiros,
+                            args.repeticoes, args.pausa, resultados)
+            for numero in range(args.usuarios)
+        ))
+        duracao = time.perf_counter() - inicio
+
+        async with sessao.get(f"{url_bot}/carga/lag") as resposta:
+            lag = await resposta.json()
+        async with sessao.get(f"{url_bot}/metrics", params={"formato": "json"}) as resposta:
+            spans = await resposta.json()
+    return resultados, duracao, lag, spans
+
+
+def imprimir_relatorio(args, resultados, duracao, lag, spans):
+    todas = resultados.todas()
+    geral = percentis(todas)
+    print(f"\n{args.usuarios} usuários x {args.repeticoes} repetições, roteiros {args.roteiros}, "
+          f"latência do backend {args.latencia_backend}ms")
+    print(f"turnos: {len(todas)} em {duracao:.2f}s -> {len(todas) / duracao:.1f} turnos/s")
+    print(f"latência por turno (ms): p50={geral['p50']:.1f} p95={geral['p95']:.1f} "
+          f"p99={geral['p99']:.1f} max={geral['max']:.1f}")
+    for nome, latencias in resultados.latencias.items():
+        p = percentis(latencias)
+        print(f"  {nome:<10} {len(latencias):6d} turnos  p50={p['p50']:.1f} p95={p['p95']:.1f} p99={p['p99']:.1f}")
+    print(f"atraso do event loop do bot (ms): p50={lag['p50']:.1f} p95={lag['p95']:.1f} "
+          f"p99={lag['p99']:.1f} max={lag['max']:.1f} ({lag['amostras']} amostras)")
+    print("spans mais lentos (p95 estimado por bucket, ms; inclui o aquecimento):")
+    for span in sorted(spans, key=lambda span: (span["p95_ms"], span["media_ms"]), reverse=True)[:10]:
+        print(f"  {span['tipo']:<6} {span['nome']:<55} {span['total']:6d}x  media={span['media_ms']:.1f} "
+              f"p95<={span['p95_ms']:.0f} erros={span['erros']}")
+    print(f"conversas com erro: {len(resultados.erros)}")
+    for erro in resultados.erros[:10]:
+        print(f"  {erro}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--usuarios", type=int, default=50, help="conversas simultâneas")
+    parser.add_argument("--repeticoes", type=int, default=2, help="vezes que cada usuário repete os roteiros")
+    parser.add_argument("--roteiros", default="faq,matricula,compra")
+    parser.add_argument("--latencia-backend", type=float, default=50, help="latência do backend substituto (ms)")
+    parser.add_argument("--pausa", type=float, default=0, help="pausa aleatória máxima entre turnos (s)")
+    parser.add_argument("--timeout", type=float, default=60, help="timeout de cada turno (s)")
+    args = parser.parse_args()
+
+    porta_bot, porta_backend = porta_livre(), porta_livre()
+    url_backend = f"http://127.0.0.1:{porta_backend}"
+    contexto = multiprocessing.get_context("spawn")
+    processos = [
+        contexto.Process(target=executar_backend, args=(porta_backend, args.latencia_backend / 1000), daemon=True),
+        contexto.Process(target=executar_bot, args=(porta_bot, url_backend, 0.01), daemon=True),
+    ]
+    for processo in processos:
+        processo.start()
+    try:
+        resultados, duracao, lag, spans = asyncio.run(gerar_carga(args, f"http://127.0.0.1:{porta_bot}"))
+        imprimir_relatorio(args, resultados, duracao, lag, spans)
+    finally:
+        for processo in processos:
+            processo.terminate()
+            processo.join()
+    sys.exit(1 if resultados.erros else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Confere para onde o MainDialog manda cada mensagem (intenção ou FAQ), sem rede e sem backend.
+
+Uso (a partir da pasta bot):
+    python teste_roteamento.py
+"""
+import json
+
+from dialogs.main_dialog import FAQ_PATH, INTENCAO_MATRICULA, INTENCAO_PRODUTOS, MainDialog
+
+# (mensagem, intenção esperada ou None quando deve seguir para o FAQ / mensagem padrão)
+CASOS = [
+    ("quero me matricular", INTENCAO_MATRICULA),
+    ("Quero fazer minha matrícula", INTENCAO_MATRICULA),
+    ("quero comprar um produto", INTENCAO_PRODUTOS),
+    ("comprar produto", INTENCAO_PRODUTOS),
+    ("Quero comprar", INTENCAO_PRODUTOS),
+    ("buscar produto notebook", INTENCAO_PRODUTOS),
+    # Palavras soltas de loja não tiram a pergunta do FAQ
+    ("qual o horário da loja?", None),
+    ("o produto do curso inclui material?", None),
+    ("como emitir boleto?", None),
+    ("qual o calendário acadêmico?", None),
+]
+
+
+def main():
+    with open(FAQ_PATH, "r", encoding="utf-8") as arquivo:
+        faq = MainDialog._montar_faq(json.load(arquivo))
+
+    falhas = 0
+    for mensagem, esperada in CASOS:
+        intencao, resposta = faq.classificar(mensagem.lower().strip())
+        ok = intencao == esperada
+        falhas += not ok
+        destino = intencao or ("FAQ" if resposta else "mensagem padrão")
+        print(f"{'✅' if ok else '❌'} {mensagem!r} -> {destino}")
+
+    print(f"\n{len(CASOS) - falhas}/{len(CASOS)} casos corretos")
+    raise SystemExit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
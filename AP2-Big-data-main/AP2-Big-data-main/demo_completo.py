@@ -23,20 +23,23 @@ def demonstrar_backend():
     matriculas_existentes = response.json()
     print(f"   Matrículas cadastradas: {len(matriculas_existentes)}")
     
-    print("\n➕ 2. Criando novas matrículas...")
+    print("\n➕ 2. Criando novas matrículas (em lote)...")
     matriculas_criadas = 0
     
-    for estudante in estudantes:
-        print(f"   Criando matrícula para: {estudante['nome']}")
-        response = requests.post(url, json=estudante)
-        
-        if response.status_code == 201:
-            print(f"   ✅ Sucesso: {estudante['nome']} matriculado(a)")
-            matriculas_criadas += 1
-        elif response.status_code == 409:
-            print(f"   ⚠️  Já existe: {estudante['nome']} já estava matriculado(a)")
-        else:
-            print(f"   ❌ Erro: {response.status_code} - {response.text}")
+    response = requests.post(f"{url}/batch", json=estudantes)
+    if response.status_code == 200:
+        relatorio = response.json()
+        matriculas_criadas = relatorio['criadas']
+        for resultado in relatorio['resultados']:
+            estudante = estudantes[resultado['linha'] - 1]
+            if resultado['status'] == 'criada':
+                print(f"   ✅ Sucesso: {estudante['nome']} matriculado(a)")
+            elif resultado['status'] == 'duplicada':
+                print(f"   ⚠️  Já existe: {estudante['nome']} já estava matriculado(a)")
+            else:
+                print(f"   ❌ Erro: {estudante['nome']} - {resultado['mensagem']}")
+    else:
+        print(f"   ❌ Erro: {response.status_code} - {response.text}")
     
     print(f"\n📊 3. Resultado: {matriculas_criadas} novas matrículas criadas")
     
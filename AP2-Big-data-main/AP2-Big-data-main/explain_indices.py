@@ -0,0 +1,39 @@
+from sqlalchemy import select, text
+from app import create_app
+from app.database import db
+from app.models.cartao import Cartao
+from app.models.endereco import Endereco
+from app.models.matricula import Matricula
+from app.models.pedido import Pedido
+
+# Formato das consultas feitas pelos controllers nas colunas indexadas
+CONSULTAS = [
+    ("CartaoPorNumero", select(Cartao).where(Cartao.numero == "4111111111111111")),
+    ("CartaoAutorizacao", select(Cartao).where(
+        Cartao.usuario_id == 1, Cartao.numero == "4111111111111111", Cartao.cvv == "123"
+    )),
+    ("CartaoUsuarioList", select(Cartao).where(Cartao.usuario_id == 1)),
+    ("PedidoCartaoResource", select(Pedido).where(Pedido.id_cartao == 1)),
+    ("EnderecoUsuarioList", select(Endereco).where(Endereco.usuario_id == 1)),
+    ("MatriculaResource (email)", select(Matricula).where(Matricula.email == "aluno@teste.com")),
+]
+
+def mostrar_planos():
+    """Imprime o EXPLAIN de cada consulta no banco configurado"""
+    dialeto = db.engine.dialect.name
+    prefixo = "EXPLAIN QUERY PLAN" if dialeto == "sqlite" else "EXPLAIN"
+
+    for nome, consulta in CONSULTAS:
+        sql = str(consulta.compile(db.engine, compile_kwargs={"literal_binds": True}))
+        print(f"\n🔎 {nome}")
+        for linha in db.session.execute(text(f"{prefixo} {sql}")):
+            print(f"   {tuple(linha)}")
+
+if __name__ == "__main__":
+    print("📊 PLANOS DE EXECUÇÃO DAS CONSULTAS INDEXADAS")
+    print("Compare antes e depois de 'flask db upgrade' (ex.: 'flask db downgrade 0001')")
+    print("=" * 60)
+
+    app = create_app()
+    with app.app_context():
+        mostrar_planos()
@@ -0,0 +1,94 @@
+"""esquema inicial
+
+Tabelas como eram criadas por db.create_all() antes do controle de versão.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 10:40:06.570568
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('matriculas',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nome', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('curso', sa.String(length=100), nullable=False),
+    sa.Column('data_matricula', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('usuario',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nome', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('dt_nascimento', sa.String(length=10), nullable=True),
+    sa.Column('cpf', sa.String(length=11), nullable=True),
+    sa.Column('telefone', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cpf'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('cartao',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('numero', sa.String(length=16), nullable=False),
+    sa.Column('nome_impresso', sa.String(length=100), nullable=False),
+    sa.Column('validade', sa.DateTime(), nullable=False),
+    sa.Column('cvv', sa.String(length=4), nullable=False),
+    sa.Column('bandeira', sa.String(length=20), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=True),
+    sa.Column('saldo', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('endereco',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('logradouro', sa.String(length=150), nullable=False),
+    sa.Column('complemento', sa.String(length=100), nullable=True),
+    sa.Column('bairro', sa.String(length=100), nullable=False),
+    sa.Column('cidade', sa.String(length=100), nullable=False),
+    sa.Column('uf', sa.String(length=2), nullable=False),
+    sa.Column('cep', sa.String(length=8), nullable=False),
+    sa.Column('pais', sa.String(length=50), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pedido',
+    sa.Column('id_pedido', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nome_cliente', sa.String(length=50), nullable=False),
+    sa.Column('data_pedido', sa.Date(), nullable=False),
+    sa.Column('nome_produto', sa.String(length=100), nullable=False),
+    sa.Column('valor_total', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.Column('id_usuario', sa.Integer(), nullable=False),
+    sa.Column('id_cartao', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_cartao'], ['cartao.id'], ),
+    sa.ForeignKeyConstraint(['id_usuario'], ['usuario.id'], ),
+    sa.PrimaryKeyConstraint('id_pedido')
+    )
+
+
+def downgrade():
+    op.drop_table('pedido')
+    op.drop_table('endereco')
+    op.drop_table('cartao')
+    op.drop_table('usuario')
+    op.drop_table('matriculas')
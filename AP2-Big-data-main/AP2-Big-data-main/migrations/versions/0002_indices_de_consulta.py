@@ -0,0 +1,39 @@
+"""indices de consulta
+
+Índices para as colunas filtradas pelos controllers:
+- cartao.numero (CartaoPorNumero)
+- cartao(usuario_id, numero, cvv) (CartaoAutorizacao e CartaoUsuarioList)
+- endereco.usuario_id (EnderecoUsuarioList)
+- matriculas.email (verificação de email duplicado)
+- pedido.id_cartao (PedidoCartaoResource)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:40:18.920563
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_cartao_numero', 'cartao', ['numero'], unique=False)
+    op.create_index('ix_cartao_usuario_numero_cvv', 'cartao', ['usuario_id', 'numero', 'cvv'], unique=False)
+    op.create_index('ix_endereco_usuario_id', 'endereco', ['usuario_id'], unique=False)
+    op.create_index('ix_matriculas_email', 'matriculas', ['email'], unique=False)
+    op.create_index('ix_pedido_id_cartao', 'pedido', ['id_cartao'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_pedido_id_cartao', table_name='pedido')
+    op.drop_index('ix_matriculas_email', table_name='matriculas')
+    op.drop_index('ix_endereco_usuario_id', table_name='endereco')
+    op.drop_index('ix_cartao_usuario_numero_cvv', table_name='cartao')
+    op.drop_index('ix_cartao_numero', table_name='cartao')
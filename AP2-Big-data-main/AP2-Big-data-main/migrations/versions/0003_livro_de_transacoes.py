@@ -0,0 +1,42 @@
+"""livro de transacoes
+
+Tabela append-only com o resultado de cada autorização de cartão e a
+Idempotency-Key enviada pelo cliente (única).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:42:54.512900
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('transacao',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('chave_idempotencia', sa.String(length=100), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('cartao_id', sa.Integer(), nullable=True),
+    sa.Column('valor', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('codigo_autorizacao', sa.String(length=36), nullable=True),
+    sa.Column('mensagem', sa.String(length=255), nullable=False),
+    sa.Column('http_status', sa.Integer(), nullable=False),
+    sa.Column('dt_transacao', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('chave_idempotencia')
+    )
+    op.create_index('ix_transacao_cartao_id', 'transacao', ['cartao_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_transacao_cartao_id', table_name='transacao')
+    op.drop_table('transacao')
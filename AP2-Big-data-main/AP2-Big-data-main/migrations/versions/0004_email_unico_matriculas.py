@@ -0,0 +1,48 @@
+"""email unico em matriculas
+
+Troca o índice simples de matriculas.email por um índice único, para que o
+banco rejeite matrículas duplicadas mesmo com envios concorrentes.
+
+Se houver duplicados que escaparam da verificação antiga, a migração falha e
+lista os emails e IDs envolvidos: nenhuma matrícula é apagada automaticamente.
+Resolva os duplicados (manualmente ou pela secretaria) e rode a migração de novo.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:05:12.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    duplicados = op.get_bind().execute(sa.text(
+        "SELECT email, id FROM matriculas WHERE email IN ("
+        "SELECT email FROM matriculas GROUP BY email HAVING COUNT(*) > 1) "
+        "ORDER BY email, id"
+    )).fetchall()
+    if duplicados:
+        ids_por_email = {}
+        for email, id in duplicados:
+            ids_por_email.setdefault(email, []).append(str(id))
+        linhas = [f"  {email}: ids {', '.join(ids)}" for email, ids in ids_por_email.items()]
+        raise RuntimeError(
+            f"{len(ids_por_email)} email(s) com matrículas duplicadas; resolva antes de criar o índice único:\n"
+            + "\n".join(linhas)
+        )
+
+    op.drop_index('ix_matriculas_email', table_name='matriculas')
+    op.create_index('ix_matriculas_email', 'matriculas', ['email'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_matriculas_email', table_name='matriculas')
+    op.create_index('ix_matriculas_email', 'matriculas', ['email'], unique=False)
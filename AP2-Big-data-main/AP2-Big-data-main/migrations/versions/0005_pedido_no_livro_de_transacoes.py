@@ -0,0 +1,27 @@
+"""pedido no livro de transacoes
+
+Liga a autorização ao pedido criado no checkout (POST /checkout), para que
+repetições com a mesma Idempotency-Key devolvam o mesmo pedido.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:21:47.902155
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('transacao', sa.Column('pedido_id', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('transacao', 'pedido_id')
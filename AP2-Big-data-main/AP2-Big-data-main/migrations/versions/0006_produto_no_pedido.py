@@ -0,0 +1,28 @@
+"""produto no pedido
+
+Guarda o ID do produto (ID do Cosmos DB, string) em cada pedido, para que o
+extrato do cartão busque imagem e dados atuais do produto em lote.
+Pedidos antigos ficam com id_produto nulo.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:02:11.418203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('pedido', sa.Column('id_produto', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('pedido', 'id_produto')
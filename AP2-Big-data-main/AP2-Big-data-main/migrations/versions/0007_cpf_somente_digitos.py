@@ -0,0 +1,61 @@
+"""cpf somente digitos
+
+Reescreve usuario.cpf com apenas os dígitos, como o modelo passou a gravar
+(Usuario.normalizar_cpf) e como GET /usuario/cpf/<cpf> compara. Sem isso,
+usuários gravados como "123.456.789-00" não são mais encontrados.
+
+Se dois usuários ficarem com o mesmo CPF após a normalização, a migração falha
+e lista os IDs envolvidos, sem alterar nada: o índice único não permitiria a
+gravação e a escolha de qual cadastro manter cabe a um operador.
+
+O downgrade não restaura a pontuação original (a informação não é guardada).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:40:26.905113
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def _digitos(cpf):
+    return re.sub(r'[^\d]', '', cpf) or None
+
+
+def upgrade():
+    conexao = op.get_bind()
+    usuarios = conexao.execute(sa.text("SELECT id, cpf FROM usuario WHERE cpf IS NOT NULL")).fetchall()
+
+    ids_por_cpf = {}
+    for id, cpf in usuarios:
+        normalizado = _digitos(cpf)
+        if normalizado:
+            ids_por_cpf.setdefault(normalizado, []).append(id)
+
+    colisoes = {cpf: ids for cpf, ids in ids_por_cpf.items() if len(ids) > 1}
+    if colisoes:
+        linhas = [f"  {cpf}: usuarios {', '.join(map(str, ids))}" for cpf, ids in sorted(colisoes.items())]
+        raise RuntimeError(
+            f"{len(colisoes)} CPF(s) repetido(s) após remover a pontuação; resolva antes de migrar:\n"
+            + "\n".join(linhas)
+        )
+
+    alterados = [
+        {"id": id, "cpf": _digitos(cpf)} for id, cpf in usuarios if _digitos(cpf) != cpf
+    ]
+    if alterados:
+        conexao.execute(sa.text("UPDATE usuario SET cpf = :cpf WHERE id = :id"), alterados)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,28 @@
+"""produto no livro de transacoes
+
+Guarda o produto de cada checkout no registro da autorização, para que uma
+Idempotency-Key reutilizada com outro produto seja recusada em vez de devolver
+o pedido anterior. Registros antigos e os de /cartao/authorize ficam nulos.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:12:53.227041
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('transacao', sa.Column('id_produto', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('transacao', 'id_produto')
@@ -1,5 +1,8 @@
 from app import create_app
 from app.database import db
+from app.produtos import indice_particao
+from flask_migrate import upgrade, stamp
+from sqlalchemy import inspect
 import logging
 
 # Configuração do logging
@@ -8,18 +11,36 @@ logger = logging.getLogger(__name__)
 
 app = create_app()
 
+# Revisão que corresponde às tabelas criadas antigamente por db.create_all()
+REVISAO_ESQUEMA_INICIAL = '0001'
+
 def init_db():
     try:
         with app.app_context():
-            logger.info("Criando tabelas do banco de dados...")
-            db.create_all()
-            logger.info("Tabelas criadas com sucesso!")
+            tabelas = inspect(db.engine).get_table_names()
+            if tabelas and 'alembic_version' not in tabelas:
+                # Banco criado antes das migrações: marca o esquema inicial e aplica o restante
+                logger.info("Banco sem controle de versão, marcando esquema inicial...")
+                stamp(revision=REVISAO_ESQUEMA_INICIAL)
+
+            logger.info("Aplicando migrações do banco de dados...")
+            upgrade()
+            logger.info("Banco de dados atualizado com sucesso!")
     except Exception as e:
-        logger.error(f"Erro ao criar tabelas: {str(e)}")
+        logger.error(f"Erro ao aplicar migrações: {str(e)}")
         raise
 
+def carregar_indice_produtos():
+    """Monta o mapa id -> categoria dos produtos; se falhar, ele é montado na primeira leitura"""
+    try:
+        total = indice_particao.carregar()
+        logger.info(f"Índice de partições carregado com {total} produtos")
+    except Exception as e:
+        logger.warning(f"Não foi possível carregar o índice de partições: {str(e)}")
+
 if __name__ == '__main__':
     init_db()
+    carregar_indice_produtos()
     logger.info("Iniciando servidor Flask na porta 8080...")
     logger.info("Backend disponível em: http://localhost:8080")
     logger.info("Documentação Swagger em: http://localhost:8080/docs")
@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+from flask_migrate import upgrade
+from app import create_app
+from app.config import Config
+from app.database import db
+from app.models.usuario import Usuario
+from app.models.cartao import Cartao
+
+SALDO_INICIAL = Decimal("100.00")
+VALOR_COMPRA = 1.00
+NUM_THREADS = 20
+COMPRAS_POR_THREAD = 10
+
+def criar_config(database_url):
+    """Configuração apontando para um banco local (SQLite temporário por padrão)"""
+    class ConfigTeste(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ENGINE_OPTIONS = (
+            {"connect_args": {"timeout": 30}} if database_url.startswith("sqlite") else {}
+        )
+    return ConfigTeste
+
+def preparar_cartao(app):
+    """Cria o esquema e um cartão com saldo conhecido"""
+    with app.app_context():
+        upgrade()
+        validade = datetime(datetime.utcnow().year + 2, 12, 1) + relativedelta(day=31)
+
+        usuario = Usuario(nome="Teste Concorrencia", email=f"concorrencia.{os.getpid()}@teste.com")
+        db.session.add(usuario)
+        db.session.flush()
+
+        cartao = Cartao(
+            usuario_id=usuario.id,
+            numero="4111111111111111",
+            nome_impresso="TESTE CONCORRENCIA",
+            validade=validade,
+            cvv="123",
+            bandeira="VISA",
+            saldo=SALDO_INICIAL,
+        )
+        db.session.add(cartao)
+        db.session.commit()
+        return usuario.id, cartao.id, validade.strftime("%m/%Y")
+
+def martelar_cartao(app, id_usuario, dt_expiracao):
+    """Dispara compras simultâneas no mesmo cartão a partir de várias threads"""
+    resultados = {"AUTHORIZED": 0, "NOT_AUTHORIZED": 0, "ERRO": 0}
+    lock = threading.Lock()
+    largada = threading.Barrier(NUM_THREADS)
+
+    def comprar():
+        client = app.test_client()
+        largada.wait()
+        for _ in range(COMPRAS_POR_THREAD):
+            response = client.post(f"/cartao/authorize/usuario/{id_usuario}", json={
+                "numero": "4111111111111111",
+                "cvv": "123",
+                "dt_expiracao": dt_expiracao,
+                "valor": VALOR_COMPRA,
+            })
+            status = response.get_json().get("status", "ERRO") if response.status_code in (200, 400) else "ERRO"
+            with lock:
+                resultados[status] += 1
+
+    threads = [threading.Thread(target=comprar) for _ in range(NUM_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+def testar_concorrencia(database_url):
+    app = create_app(criar_config(database_url))
+    id_usuario, id_cartao, dt_expiracao = preparar_cartao(app)
+
+    total = NUM_THREADS * COMPRAS_POR_THREAD
+    print(f"🔨 {NUM_THREADS} threads x {COMPRAS_POR_THREAD} compras de R$ {VALOR_COMPRA:.2f} "
+          f"em um cartão com saldo R$ {SALDO_INICIAL}")
+
+    resultados = martelar_cartao(app, id_usuario, dt_expiracao)
+
+    with app.app_context():
+        saldo_final = db.session.get(Cartao, id_cartao).saldo
+
+    autorizadas_esperadas = int(SALDO_INICIAL / Decimal(str(VALOR_COMPRA)))
+    saldo_esperado = SALDO_INICIAL - resultados["AUTHORIZED"] * Decimal(str(VALOR_COMPRA))
+
+    print(f"📊 Autorizadas: {resultados['AUTHORIZED']} | Recusadas: {resultados['NOT_AUTHORIZED']} "
+          f"| Erros: {resultados['ERRO']} | Total: {total}")
+    print(f"💰 Saldo final: R$ {saldo_final} (esperado R$ {saldo_esperado})")
+
+    ok = (
+        resultados["ERRO"] == 0
+        and resultados["AUTHORIZED"] == autorizadas_esperadas
+        and saldo_final == saldo_esperado
+        and saldo_final >= 0
+    )
+    if ok:
+        print("✅ Nenhuma atualização perdida e nenhum saldo negativo!")
+    else:
+        print("❌ Inconsistência no débito concorrente!")
+    return ok
+
+if __name__ == "__main__":
+    print("🧪 TESTE DE CONCORRÊNCIA NA AUTORIZAÇÃO DE CARTÃO")
+    print("=" * 50)
+
+    # Uso: python teste_concorrencia_cartao.py [DATABASE_URL]
+    # Sem argumento usa um SQLite temporário; para MySQL local passe a URL do banco de testes.
+    if len(sys.argv) > 1:
+        url = sys.argv[1]
+    else:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "concorrencia.db")
+
+    sys.exit(0 if testar_concorrencia(url) else 1)